@@ -0,0 +1,46 @@
+from typing import Tuple
+
+# Actions are small ints so that move lists are cheap to build, hash and store:
+#
+#   bits 0-1   kind: END, PLAY or ATTACK
+#   bits 2-11  hand index (PLAY) or attacker's field index (ATTACK)
+#   bits 12-15 target seat (ATTACK)
+#   bits 16-25 blocker's field index + 1, 0 for a direct attack (ATTACK)
+#
+# END is 0, so `if action:` distinguishes "do something" from "end the phase".
+# Indexes that don't fit their field raise ValueError rather than aliasing
+# another action.
+
+END, PLAY, ATTACK = 0, 1, 2
+NO_BLOCKER = -1
+MAX_INDEX = 1022  # Largest hand/field index (the blocker field also holds index + 1)
+MAX_SEAT = 15
+
+def _check(name: str, value: int, low: int, high: int) -> None:
+    if not low <= value <= high:
+        raise ValueError(f"{name} {value} is outside {low}..{high}")
+
+def play(hand_index: int) -> int:
+    """Play the card at `hand_index` in the current player's hand."""
+    _check("Hand index", hand_index, 0, MAX_INDEX)
+    return PLAY | (hand_index << 2)
+
+def attack(field_index: int, target_seat: int, blocker_index: int = NO_BLOCKER) -> int:
+    """Attack seat `target_seat` with a creature, optionally into one of its creatures."""
+    _check("Attacker index", field_index, 0, MAX_INDEX)
+    _check("Target seat", target_seat, 0, MAX_SEAT)
+    _check("Blocker index", blocker_index, NO_BLOCKER, MAX_INDEX)
+    return ATTACK | (field_index << 2) | (target_seat << 12) | ((blocker_index + 1) << 16)
+
+def decode(action: int) -> Tuple[int, int, int, int]:
+    """Split an action into (kind, index, target_seat, blocker_index)."""
+    return action & 3, (action >> 2) & 1023, (action >> 12) & 15, ((action >> 16) & 1023) - 1
+
+def describe(action: int) -> str:
+    """Human-readable form, matching the "play 2" / "attack 0 1 -1" command syntax."""
+    kind, index, target_seat, blocker_index = decode(action)
+    if kind == PLAY:
+        return f"play {index}"
+    if kind == ATTACK:
+        return f"attack {index} {target_seat + 1} {blocker_index}"
+    return "end"
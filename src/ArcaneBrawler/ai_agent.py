@@ -1,9 +1,31 @@
+import json
 import re
 from typing import List, Optional, Tuple
 from player import Player, Archetype
-from card import Card, Suit
-from game_state import GameState, Phase
-from card_lookup import format_hand_display, format_field_display
+from game_state import GameState
+from prompt_builder import PromptBuilder
+from search_agent import SearchAgent
+import actions
+
+_PLAY_RE = re.compile(r"play\s+(\d+)")
+_ATTACK_RE = re.compile(r"attack\s+(\d+)\s+(\d+)\s+(-?\d+)")
+_END_RE = re.compile(r"end\b")
+
+def _parse_json_action(text: str) -> Optional[Tuple[str, List[int]]]:
+    """Parse {"action": "play", "card": i} / {"action": "attack", "attacker": i,
+    "target": seat, "blocker": j} / {"action": "end"}; None if malformed."""
+    try:
+        data = json.loads(text)
+        name = str(data["action"]).lower()
+        if name == "play":
+            return ("play", [int(data["card"])])
+        if name == "attack":
+            return ("attack", [int(data["attacker"]), int(data["target"]), int(data.get("blocker", -1))])
+        if name == "end":
+            return ("end", [])
+    except (ValueError, TypeError, KeyError, AttributeError):
+        pass
+    return None
 
 class AIAgent:
     def __init__(self, game_state: GameState):
@@ -11,88 +33,102 @@ class AIAgent:
         self.ai_player = None
         self.health_multiplier = 1.5  # AI has 50% more health
         self.power_multiplier = 1.2   # AI deals 20% more damage
+        self.search_agent: Optional[SearchAgent] = None  # Offline policy, no LLM round-trip
+        self.prompt_builder: Optional[PromptBuilder] = None
         
     def initialize_ai_player(self, archetype: Archetype) -> Player:
         """Initialize the AI player with scaled stats."""
         self.ai_player = Player("AI Opponent", archetype)
         self.ai_player.max_health = int(self.ai_player.max_health * self.health_multiplier)
         self.ai_player.health = self.ai_player.max_health
+        self.search_agent = SearchAgent(self.ai_player,
+                                        health_multiplier=self.health_multiplier,
+                                        power_multiplier=self.power_multiplier)
         return self.ai_player
     
     def get_ai_prompt(self) -> str:
-        """Generate the prompt for the AI's turn."""
-        current_phase = self.game_state.phase
-        player1, player2 = self.game_state.players
-        
-        prompt = f"""You are playing Arcane Shuffle as the {self.ai_player.archetype.value} archetype.
-Your health: {self.ai_player.health}/{self.ai_player.max_health}
-Your mana: {self.ai_player.mana}/{self.ai_player.max_mana}
-
-Opponents:
-1. {player1.name} ({player1.archetype.value}) - Health: {player1.health}/{player1.max_health}
-2. {player2.name} ({player2.archetype.value}) - Health: {player2.health}/{player2.max_health}
-
-Your hand:
-{chr(10).join(format_hand_display(self.ai_player.hand, self.ai_player.archetype))}
-
-Your field:
-{chr(10).join(format_field_display(self.ai_player.field, self.ai_player.archetype))}
-
-Current phase: {current_phase.value}
-
-Available actions:
-"""
-        
-        if current_phase == Phase.MAIN1 or current_phase == Phase.MAIN2:
-            prompt += """- Play a card: "play [card_index]"
-- End phase: "end"
-"""
-        elif current_phase == Phase.COMBAT:
-            prompt += """- Attack: "attack [attacker_index] [target_player_index] [blocker_index]"
-   (target_player_index: 1 or 2, blocker_index: -1 for no blocker)
-- End combat: "end"
-"""
-        
-        prompt += """
-Example response: "play 2" or "attack 0 1 -1"
-
-What action do you take?"""
-        
-        return prompt
+        """Generate the prompt for the AI's turn (unchanged sections are reused)."""
+        if self.prompt_builder is None or self.prompt_builder.player is not self.ai_player:
+            self.prompt_builder = PromptBuilder(self.game_state, self.ai_player)
+        return self.prompt_builder.build()
     
     def parse_ai_response(self, response: str) -> Optional[Tuple[str, List[int]]]:
-        """Parse the AI's response into an action and parameters."""
+        """Parse the AI's response into an action and parameters.
+        
+        Accepts the text commands ("play 2", "attack 0 1 -1", "end") or a JSON
+        object such as {"action": "attack", "attacker": 0, "target": 1, "blocker": -1}.
+        """
+        text = response.strip()
+        if "{" in text and "}" in text:
+            # JSON, possibly wrapped in prose or a code fence
+            parsed = _parse_json_action(text[text.index("{"):text.rindex("}") + 1])
+            if parsed:
+                return parsed
+        text = text.lower()
+        
         # Try to match play card action
-        play_match = re.match(r"play\s+(\d+)", response.lower())
+        play_match = _PLAY_RE.match(text)
         if play_match:
             return ("play", [int(play_match.group(1))])
             
         # Try to match attack action
-        attack_match = re.match(r"attack\s+(\d+)\s+(\d+)\s+(-?\d+)", response.lower())
+        attack_match = _ATTACK_RE.match(text)
         if attack_match:
             return ("attack", [int(x) for x in attack_match.groups()])
             
         # Try to match end action
-        if "end" in response.lower():
+        if _END_RE.match(text):
             return ("end", [])
             
         return None
     
+    def validate_response(self, response: str) -> Optional[int]:
+        """The legal action a response asks for, or None if it is unparseable or
+        illegal now; nothing is applied to the game."""
+        parsed = self.parse_ai_response(response)
+        if parsed is None:
+            return None
+        return self.to_action(*parsed)
+    
     def get_ai_action(self, response: str) -> Tuple[str, List[int]]:
-        """Get the AI's action, with fallback to random action if parsing fails."""
+        """Get the AI's action, falling back to the first legal action if parsing fails."""
         parsed = self.parse_ai_response(response)
         if parsed:
             return parsed
             
-        # Fallback to random action
-        if self.game_state.phase in [Phase.MAIN1, Phase.MAIN2]:
-            if self.ai_player.hand:
-                return ("play", [0])  # Play first card
-            return ("end", [])
-        elif self.game_state.phase == Phase.COMBAT:
-            attacking_creatures = [i for i, card in enumerate(self.ai_player.field) 
-                                 if not card.tapped and card.is_creature]
-            if attacking_creatures:
-                return ("attack", [attacking_creatures[0], 1, -1])  # Attack first player
+        # Fallback to the first legal action (END only when nothing else is legal)
+        legal = self.game_state.legal_actions()
+        if not legal:
             return ("end", [])
-        return ("end", []) 
\ No newline at end of file
+        kind, index, target_seat, blocker_index = actions.decode(legal[0])
+        if kind == actions.PLAY:
+            return ("play", [index])
+        elif kind == actions.ATTACK:
+            return ("attack", [index, target_seat + 1, blocker_index])
+        return ("end", [])
+    
+    def to_action(self, name: str, params: List[int]) -> Optional[int]:
+        """Encode a parsed ("play", [i]) / ("attack", [i, target, blocker]) / ("end", [])
+        command, or None if it is malformed or not legal right now."""
+        if name == "play" and len(params) == 1:
+            if not 0 <= params[0] <= actions.MAX_INDEX:
+                return None
+            action = actions.play(params[0])
+        elif name == "attack" and len(params) == 3:
+            attacker_index, target_index, blocker_index = params
+            if not (0 <= attacker_index <= actions.MAX_INDEX and 1 <= target_index <= actions.MAX_SEAT + 1
+                    and actions.NO_BLOCKER <= blocker_index <= actions.MAX_INDEX):
+                return None
+            action = actions.attack(attacker_index, target_index - 1, blocker_index)
+        elif name == "end":
+            action = actions.END
+        else:
+            return None
+        return action if action in self.game_state.legal_actions() else None
+    
+    def choose_action(self, response: str) -> int:
+        """The legal action for a response, falling back to `get_ai_action`'s default."""
+        action = self.validate_response(response)
+        if action is None:
+            action = self.to_action(*self.get_ai_action(""))
+        return action
@@ -0,0 +1,295 @@
+"""Micro-benchmarks for the Arcane Brawler engine.
+
+Run from this directory: python benchmarks.py
+"""
+import copy
+import random
+import time
+import timeit
+import tracemalloc
+
+from ai_agent import AIAgent
+from card import Card, Suit
+from card_lookup import _render_description, format_field_display, format_hand_display
+from game_state import MAX_PLAYERS, GameState, Phase
+from lethal import find_lethal
+from poker_hand import ComboTracker
+from prompt_builder import PromptBuilder
+from search_agent import SearchAgent
+from simulator import new_game, play_game, random_policy
+from tokens import TokenArmy
+from turn_optimizer import TurnContext, solve
+from player import Player, Archetype
+from zones import CardZone
+from test_game import legacy_check_poker_hand
+
+
+def make_midgame_state(seed: int = 0) -> GameState:
+    """A two-player game a few turns in, with cards spread across every zone."""
+    random.seed(seed)
+    game_state = GameState()
+    game_state.add_player(Player("Bench1", Archetype.BERSERKER))
+    game_state.add_player(Player("Bench2", Archetype.COMMANDER))
+    game_state.start_game()
+    for player in game_state.players:
+        player.draw_cards(5)
+        for card in player.hand[:4]:
+            player.hand.remove(card)
+            player.field.append(card)
+        for _ in range(6):
+            player.discard.append(Card.unpack(player.deck.pop()))
+        player.tokens.create(3)
+    for card in game_state.players[0].field[:2]:
+        game_state.record_played_card(card)
+    return game_state
+
+
+def bench_clone(number: int = 2000) -> None:
+    """Compare GameState.clone() against copy.deepcopy."""
+    game_state = make_midgame_state()
+    deep = timeit.timeit(lambda: copy.deepcopy(game_state), number=number) / number
+    fast = timeit.timeit(game_state.clone, number=number) / number
+    snap = timeit.timeit(game_state.snapshot, number=number) / number
+    print(f"clone: deepcopy {deep * 1e6:.1f} us | snapshot+restore {fast * 1e6:.1f} us "
+          f"(snapshot alone {snap * 1e6:.1f} us) | {deep / fast:.1f}x faster")
+
+
+def bench_poker_hand(turns: int = 2000, spells_per_turn: int = 8) -> None:
+    """Per-spell combo evaluation: full re-scan (legacy) vs incremental tracker."""
+    random.seed(1)
+    deck = Card.create_standard_deck()
+    turns_played = [random.sample(deck, spells_per_turn) for _ in range(turns)]
+
+    def legacy() -> None:
+        for played in turns_played:
+            for i in range(1, len(played) + 1):
+                legacy_check_poker_hand(played[:i])
+
+    def incremental() -> None:
+        tracker = ComboTracker()
+        for played in turns_played:
+            tracker.reset()
+            for card in played:
+                tracker.add(card)
+
+    spells = turns * spells_per_turn
+    old = timeit.timeit(legacy, number=1) / spells
+    new = timeit.timeit(incremental, number=1) / spells
+    print(f"combo per spell: legacy {old * 1e6:.2f} us | incremental {new * 1e6:.2f} us "
+          f"| {old / new:.1f}x faster")
+
+
+def bench_display(number: int = 5000) -> None:
+    """Hand + field rendering with cached strings vs rendering every description."""
+    game_state = make_midgame_state()
+    player = game_state.players[0]
+
+    def uncached() -> None:
+        [f"[{idx}] {card} - {_render_description(card, player.archetype)}"
+         for idx, card in enumerate(player.hand)]
+        [f"{card} - {_render_description(card, player.archetype)} (Tapped: {card.tapped})"
+         for card in player.field]
+
+    def cached() -> None:
+        format_hand_display(player.hand, player.archetype)
+        format_field_display(player.field, player.archetype)
+
+    old = timeit.timeit(uncached, number=number) / number
+    new = timeit.timeit(cached, number=number) / number
+    print(f"hand+field display: uncached {old * 1e6:.1f} us | cached {new * 1e6:.1f} us "
+          f"| {old / new:.1f}x faster")
+
+
+def bench_zones(number: int = 5000, size: int = 20) -> None:
+    """Action enumeration plus a remove/re-add on a list vs a CardZone field."""
+    random.seed(2)
+    cards = random.sample(Card.create_standard_deck(), size)
+    for card in cards[::3]:
+        card.tapped = True
+    as_list, zone = list(cards), CardZone(cards, track_tapped=True)
+    last = cards[-1]
+
+    def scan() -> None:
+        [card for card in as_list if card.mana_cost <= 6]
+        [card for card in as_list if not card.tapped and card.is_creature]
+        if last in as_list:
+            as_list.remove(last)
+            as_list.append(last)
+
+    def indexed() -> None:
+        zone.affordable(6)
+        zone.untapped_creatures()
+        if last in zone:
+            zone.remove(last)
+            zone.append(last)
+
+    old = timeit.timeit(scan, number=number) / number
+    new = timeit.timeit(indexed, number=number) / number
+    print(f"{size}-card zone views: list scan {old * 1e6:.1f} us | CardZone {new * 1e6:.1f} us "
+          f"| {old / new:.1f}x faster")
+
+
+def bench_legal_actions(number: int = 5000) -> None:
+    """Move generation in a main phase and in combat."""
+    game_state = make_midgame_state()
+    timings = []
+    for phase in (Phase.MAIN1, Phase.COMBAT):
+        game_state.phase = phase
+        timings.append(timeit.timeit(game_state.legal_actions, number=number) / number)
+    print(f"legal_actions: main phase {timings[0] * 1e6:.2f} us | combat {timings[1] * 1e6:.2f} us")
+
+
+def bench_search_agent(games: int = 10) -> None:
+    """Average and worst AI turn time for the search agent against a random opponent."""
+    random.seed(3)
+    turn_times = []
+
+    def timed_policy(game_state: GameState) -> int:
+        start = time.perf_counter()
+        action = agent.choose_action(game_state)
+        if turn_times and game_state.turn_number == turn_times[-1][0]:
+            turn_times[-1][1] += time.perf_counter() - start
+        else:
+            turn_times.append([game_state.turn_number, time.perf_counter() - start])
+        return action
+
+    for _ in range(games):
+        game_state = new_game([Archetype.BERSERKER, Archetype.COMMANDER])
+        agent = SearchAgent(game_state.players[0])
+        play_game(game_state, [timed_policy, random_policy])
+    seconds = [elapsed for _, elapsed in turn_times]
+    print(f"search agent: {sum(seconds) / len(seconds) * 1e3:.1f} ms per AI turn "
+          f"(worst {max(seconds) * 1e3:.1f} ms over {len(seconds)} turns)")
+
+
+def bench_turn_optimizer(hands: int = 100) -> None:
+    """Planning time for random 7- and 10-card hands with 10 mana."""
+    random.seed(4)
+    deck = Card.create_standard_deck()
+    context = TurnContext(opponent_mana=4, tokens=2)
+    for size in (7, 10):
+        samples = [(random.sample(deck, size), random.choice(list(Archetype))) for _ in range(hands)]
+        seconds = [timeit.timeit(lambda: solve(hand, 10, archetype, context), number=1)
+                   for hand, archetype in samples]
+        print(f"turn optimizer, {size}-card hands: {sum(seconds) / hands * 1e3:.2f} ms "
+              f"(worst {max(seconds) * 1e3:.2f} ms)")
+
+
+def bench_lethal(positions: int = 300) -> None:
+    """Lethal checks on random first-main-phase positions."""
+    random.seed(5)
+    states = []
+    for _ in range(positions):
+        game_state = new_game(random.sample(list(Archetype), 2))
+        game_state.phase = Phase.MAIN1
+        player = game_state.get_current_player()
+        player.mana, player.rage_counters = random.randint(0, 10), random.randint(0, 3)
+        game_state.get_opponent().health = random.randint(1, 20)
+        for card in player.hand[:2]:
+            player.hand.remove(card)
+            player.field.append(card)
+        states.append(game_state)
+    seconds = [timeit.timeit(lambda: find_lethal(game_state), number=1) for game_state in states]
+    found = sum(1 for game_state in states if find_lethal(game_state))
+    print(f"lethal check: {sum(seconds) / positions * 1e6:.0f} us (worst {max(seconds) * 1e6:.0f} us), "
+          f"lethal in {found}/{positions} positions")
+
+
+def bench_token_army(size: int = 100_000) -> None:
+    """Army-wide buff and memory for a very large Commander army vs a list of Cards."""
+    tracemalloc.start()
+    army = TokenArmy()
+    army.create(size)
+    army_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    tracemalloc.start()
+    cards = [Card(Suit.HEARTS, "2") for _ in range(size)]
+    card_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    def buff_each() -> None:
+        for card in cards:
+            card.health += 1
+
+    old = timeit.timeit(buff_each, number=5) / 5
+    new = timeit.timeit(lambda: army.add_buff(1), number=1000) / 1000
+    print(f"{size} tokens: buff all per-card {old * 1e3:.1f} ms | offset {new * 1e6:.2f} us; "
+          f"memory {card_bytes / size:.0f} vs {army_bytes / size:.0f} bytes per token")
+
+
+def bench_prompt(number: int = 2000) -> None:
+    """AI prompt rebuilds within a phase: full re-render vs cached sections."""
+    game_state = make_midgame_state()
+    game_state.phase = Phase.MAIN1
+    agent = AIAgent(game_state)
+    agent.ai_player = game_state.players[0]
+
+    def full() -> None:
+        PromptBuilder(game_state, agent.ai_player).build()
+
+    old = timeit.timeit(full, number=number) / number
+    new = timeit.timeit(agent.get_ai_prompt, number=number) / number
+    responses = ["play 2", '{"action": "attack", "attacker": 0, "target": 2, "blocker": -1}', "end", "???"]
+    parse = timeit.timeit(lambda: [agent.parse_ai_response(r) for r in responses], number=number) / number / 4
+    print(f"AI prompt: full render {old * 1e6:.1f} us | cached {new * 1e6:.1f} us "
+          f"| {old / new:.1f}x faster; parse {parse * 1e6:.2f} us per response")
+
+
+def bench_spawn(games: int = 1000) -> None:
+    """Allocation time and memory for many concurrent two-player games."""
+    def spawn() -> list:
+        tables = []
+        for i in range(games):
+            game_state = GameState()
+            game_state.add_player(Player(f"A{i}", Archetype.MYSTIC))
+            game_state.add_player(Player(f"B{i}", Archetype.TRICKSTER))
+            game_state.start_game()
+            tables.append(game_state)
+        return tables
+
+    seconds = timeit.timeit(spawn, number=1)
+    tracemalloc.start()
+    tables = spawn()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"spawn {len(tables)} games: {seconds / games * 1e6:.1f} us and "
+          f"{current / games / 1024:.1f} KiB per game")
+
+
+def bench_table(number: int = 20000) -> None:
+    """Opponent lookup and turn rotation on a full eight-seat free-for-all."""
+    game_state = GameState()
+    for seat in range(MAX_PLAYERS):
+        game_state.add_player(Player(f"Seat{seat}", list(Archetype)[seat % len(Archetype)]))
+    game_state.start_game()
+
+    def rotate() -> None:
+        game_state.get_opponent()
+        game_state.current_player_index = game_state._next_seat[game_state.current_player_index]
+
+    def scan() -> None:
+        # What a per-call search for the next live opponent costs
+        current = game_state.current_player_index
+        seats = len(game_state.players)
+        next(game_state.players[(current + step) % seats] for step in range(1, seats)
+             if game_state.players[(current + step) % seats].health > 0)
+        game_state.current_player_index = (current + 1) % seats
+
+    old = timeit.timeit(scan, number=number) / number
+    new = timeit.timeit(rotate, number=number) / number
+    print(f"table of {MAX_PLAYERS}: opponent scan {old * 1e9:.0f} ns | table {new * 1e9:.0f} ns "
+          f"| {old / new:.1f}x faster")
+
+if __name__ == "__main__":
+    bench_clone()
+    bench_poker_hand()
+    bench_display()
+    bench_zones()
+    bench_legal_actions()
+    bench_search_agent()
+    bench_turn_optimizer()
+    bench_lethal()
+    bench_token_army()
+    bench_prompt()
+    bench_spawn()
+    bench_table()
@@ -1,5 +1,7 @@
+from array import array
 from enum import Enum
-from typing import Optional
+from itertools import count
+from typing import List, NamedTuple, Optional
 
 class Suit(Enum):
     HEARTS = "Hearts"
@@ -7,42 +9,127 @@ class Suit(Enum):
     CLUBS = "Clubs"
     SPADES = "Spades"
 
+VALUES = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+SUITS = list(Suit)
+
+class CardDefinition(NamedTuple):
+    """Immutable data for one of the 52 cards, shared by every copy of it."""
+    suit: Suit
+    value: str
+    card_id: int      # 0..51, suit-major
+    suit_index: int
+    face: int         # face_value(): 2..10, J/Q/K = 10, A = 11
+    mana_cost: int
+    is_creature: bool
+    label: str        # str(card), e.g. "10H"
+
+def _define(suit: Suit, value: str) -> CardDefinition:
+    if value == 'A':
+        face, mana_cost = 11, 0  # Ace has variable cost
+    elif value in ['J', 'Q', 'K']:
+        face, mana_cost = 10, 10
+    else:
+        face = mana_cost = int(value)
+    suit_index = SUITS.index(suit)
+    return CardDefinition(suit, value, suit_index * len(VALUES) + VALUES.index(value), suit_index,
+                          face, mana_cost,
+                          suit in [Suit.SPADES, Suit.HEARTS],  # Only Spades and Hearts are creatures
+                          f"{value}{suit.value[0]}")
+
+# The flyweights: DEFINITIONS[card_id], and (suit, value) -> definition.
+DEFINITIONS: List[CardDefinition] = [_define(suit, value) for suit in SUITS for value in VALUES]
+_DEFINITION_BY_KEY = {(d.suit, d.value): d for d in DEFINITIONS}
+
+# Stable per-copy ids, used by zones for O(1) membership and removal.
+_next_uid = count().__next__
+
 class Card:
+    """A physical card: a shared CardDefinition plus this copy's mutable state.
+
+    `zone` is the CardZone tracking this card's tapped state (its field), if any.
+    """
+    __slots__ = ('definition', '_tapped', 'health', 'uid', 'zone')
+
     def __init__(self, suit: Suit, value: str):
-        self.suit = suit
-        self.value = value
-        self.tapped = False
-        self.mana_cost = self._get_mana_cost()
-        self.health = self.face_value()  # Creatures have health equal to their face value
-        self.is_creature = suit in [Suit.SPADES, Suit.HEARTS]  # Only Spades and Hearts are creatures
-        
-    def _get_mana_cost(self) -> int:
-        """Convert card value to mana cost."""
-        if self.value in ['J', 'Q', 'K']:
-            return 10
-        elif self.value == 'A':
-            return 0  # Ace has variable cost
-        return int(self.value)
-    
+        self.definition = _DEFINITION_BY_KEY[(suit, value)]
+        self._tapped = False
+        self.health = self.definition.face  # Creatures have health equal to their face value
+        self.uid = _next_uid()
+        self.zone = None
+
+    @staticmethod
+    def from_definition(definition: CardDefinition) -> 'Card':
+        """Fast constructor used for decks and restores."""
+        card = Card.__new__(Card)
+        card.definition = definition
+        card._tapped = False
+        card.health = definition.face
+        card.uid = _next_uid()
+        card.zone = None
+        return card
+
+    @property
+    def tapped(self) -> bool:
+        return self._tapped
+
+    @tapped.setter
+    def tapped(self, tapped: bool) -> None:
+        self._tapped = tapped
+        if self.zone is not None:
+            self.zone.on_tapped(self)
+
+    @property
+    def suit(self) -> Suit:
+        return self.definition.suit
+
+    @property
+    def value(self) -> str:
+        return self.definition.value
+
+    @property
+    def mana_cost(self) -> int:
+        return self.definition.mana_cost
+
+    @property
+    def is_creature(self) -> bool:
+        return self.definition.is_creature
+
+    @property
+    def card_id(self) -> int:
+        """Stable id in 0..51 (suit-major), shared by every copy of the same card."""
+        return self.definition.card_id
+
     def face_value(self) -> int:
         """Get the numeric value of the card."""
-        if self.value == 'A':
-            return 11
-        elif self.value in ['J', 'Q', 'K']:
-            return 10
-        return int(self.value)
-    
+        return self.definition.face
+
+    def pack(self) -> int:
+        """Encode id, tapped flag and current health into a single int."""
+        return (self.health << 7) | (self._tapped << 6) | self.definition.card_id
+
+    @staticmethod
+    def unpack(code: int) -> 'Card':
+        """Rebuild a card from `pack()` output."""
+        card = Card.__new__(Card)
+        card.definition = DEFINITIONS[code & 63]
+        card._tapped = bool(code & 64)
+        card.health = code >> 7
+        card.uid = _next_uid()
+        card.zone = None
+        return card
+
     def __str__(self) -> str:
-        return f"{self.value}{self.suit.value[0]}"
-    
+        return self.definition.label
+
     def __repr__(self) -> str:
         return self.__str__()
-    
+
     @staticmethod
     def create_standard_deck() -> list['Card']:
         """Create a standard 52-card deck."""
-        deck = []
-        for suit in Suit:
-            for value in ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']:
-                deck.append(Card(suit, value))
-        return deck 
\ No newline at end of file
+        from_definition = Card.from_definition
+        return [from_definition(definition) for definition in DEFINITIONS]
+
+# A fresh, unshuffled deck as packed codes (see Card.pack); players keep their
+# draw piles in this form so undrawn cards cost 4 bytes each.
+STANDARD_DECK_CODES = array('l', [(definition.face << 7) | definition.card_id for definition in DEFINITIONS])
@@ -1,60 +1,370 @@
-from typing import Dict, List
-from player import Archetype
+import random
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from player import Player, Archetype
 from card import Card, Suit
 
-def get_card_effect_description(card: Card, archetype: Archetype) -> str:
-    """Get a description of what a card does for a specific archetype."""
+class CardEffect(NamedTuple):
+    """One (archetype, suit) effect: its rules text, the handler that applies it
+    and the turn optimizer's model of it.
+
+    `text` is formatted with `value` (face value) and `half` (face value // 2).
+    `resolve(game_state, caster, spell, target, hand_type, bonus)` applies it.
+    `model` is registered with `model` right after the handler.
+    """
+    text: str
+    resolve: Callable[..., None]
+    model: Optional[Callable[..., tuple]] = None
+
+# (archetype, suit) -> CardEffect; GameState.resolve_spell dispatches through this.
+EFFECTS: Dict[Tuple[Archetype, Suit], CardEffect] = {}
+
+# Rendered strings: archetype -> list indexed by card_id (field lines by
+# 2 * card_id + tapped). Built per archetype on first use and cleared on registration.
+_DESCRIPTIONS: Dict[Archetype, List[str]] = {}
+_CARD_DISPLAYS: Dict[Archetype, List[str]] = {}
+_FIELD_DISPLAYS: Dict[Archetype, List[str]] = {}
+_INDEX_PREFIXES = [f"[{idx}] " for idx in range(64)]
+
+def effect(archetype: Archetype, suit: Suit, text: str) -> Callable:
+    """Register the decorated function as the handler for (archetype, suit)."""
+    def register(handler: Callable[..., None]) -> Callable[..., None]:
+        EFFECTS[(archetype, suit)] = CardEffect(text, handler)
+        _DESCRIPTIONS.clear()
+        _CARD_DISPLAYS.clear()
+        _FIELD_DISPLAYS.clear()
+        return handler
+    return register
+
+def model(archetype: Archetype, suit: Suit) -> Callable:
+    """Register the decorated function as turn_optimizer's model of the
+    (archetype, suit) effect; declare it right after the handler it models.
+
+    model(face, bonus, hand_type, context, state) -> ({gain: amount}, new state, mana gained),
+    where gains are keyed like turn_optimizer.DEFAULT_WEIGHTS, `context` is a
+    turn_optimizer.TurnContext and `state` is the search state (health, rage,
+    tokens, opponent mana, lives swapped).
+    """
+    def register(estimate: Callable[..., tuple]) -> Callable[..., tuple]:
+        EFFECTS[(archetype, suit)] = EFFECTS[(archetype, suit)]._replace(model=estimate)
+        return estimate
+    return register
+
+# --- Cultivator ---
+
+@effect(Archetype.CULTIVATOR, Suit.HEARTS, "Heal for {value}")
+def _cultivator_heal(game_state, caster: Player, spell: Card, target: Optional[Card], hand_type: str, bonus: int) -> None:
+    # Healing and protection
+    heal_amount = spell.face_value() * (1 + bonus)
+    caster.health = min(caster.max_health, caster.health + heal_amount)
+    print(f"{caster.name} heals for {heal_amount}")
+
+@model(Archetype.CULTIVATOR, Suit.HEARTS)
+def _model_cultivator_heal(face, bonus, hand_type, context, state):
+    health = state[0]
+    healed = min(context.max_health - health, face * (1 + bonus))
+    return {'healing': healed}, (health + healed,) + state[1:], 0
+
+@effect(Archetype.CULTIVATOR, Suit.DIAMONDS, "Draw 2 cards")
+def _cultivator_draw(game_state, caster: Player, spell: Card, target: Optional[Card], hand_type: str, bonus: int) -> None:
+    # Card advantage
+    caster.draw_cards(2 + bonus)
+    print(f"{caster.name} draws {2 + bonus} cards")
+
+@model(Archetype.CULTIVATOR, Suit.DIAMONDS)
+def _model_cultivator_draw(face, bonus, hand_type, context, state):
+    return {'cards': 2 + bonus}, state, 0
+
+@effect(Archetype.CULTIVATOR, Suit.CLUBS, "Gain 1 Growth Token (+1 mana next turn)")
+def _cultivator_growth(game_state, caster: Player, spell: Card, target: Optional[Card], hand_type: str, bonus: int) -> None:
+    # Resource generation
+    caster.growth_tokens += 1 + bonus
+    print(f"{caster.name} gains {1 + bonus} Growth Token(s) (+{1 + bonus} mana next turn)")
+    if hand_type == "Flush":
+        caster.growth_tokens += 2
+        print("Flush bonus: +2 additional Growth Tokens!")
+
+@model(Archetype.CULTIVATOR, Suit.CLUBS)
+def _model_cultivator_growth(face, bonus, hand_type, context, state):
+    return {'growth': 1 + bonus + (2 if hand_type == "Flush" else 0)}, state, 0
+
+@effect(Archetype.CULTIVATOR, Suit.SPADES, "Increase max mana by 1")
+def _cultivator_max_mana(game_state, caster: Player, spell: Card, target: Optional[Card], hand_type: str, bonus: int) -> None:
+    # Persistent effects
+    caster.max_mana += 1 + bonus
+    print(f"{caster.name} increases max mana by {1 + bonus}")
+    if hand_type == "Straight":
+        caster.max_mana += 1
+        print("Straight bonus: +1 additional max mana!")
+
+@model(Archetype.CULTIVATOR, Suit.SPADES)
+def _model_cultivator_max_mana(face, bonus, hand_type, context, state):
+    return {'max_mana': 1 + bonus + (1 if hand_type == "Straight" else 0)}, state, 0
+
+# --- Berserker ---
+
+@effect(Archetype.BERSERKER, Suit.HEARTS, "Deal {value} × (1 + rage) damage")
+def _berserker_damage(game_state, caster: Player, spell: Card, target: Optional[Card], hand_type: str, bonus: int) -> None:
+    # Direct damage
+    base_damage = spell.face_value()
+    rage_bonus = caster.rage_counters
+    total_damage = base_damage * (1 + rage_bonus + bonus)
+    opponent = game_state.get_opponent()
+    opponent.health -= total_damage
+    print(f"{caster.name} deals {total_damage} damage! (Base: {base_damage}, Rage: {rage_bonus}, Combo: {bonus})")
+
+@model(Archetype.BERSERKER, Suit.HEARTS)
+def _model_berserker_damage(face, bonus, hand_type, context, state):
+    return {'damage': face * (1 + state[1] + bonus)}, state, 0
+
+@effect(Archetype.BERSERKER, Suit.DIAMONDS, "Gain 1 Rage counter")
+def _berserker_rage(game_state, caster: Player, spell: Card, target: Optional[Card], hand_type: str, bonus: int) -> None:
+    # Rage generation
+    caster.rage_counters += 1 + bonus
+    print(f"{caster.name} gains {1 + bonus} Rage counter(s)")
+
+@model(Archetype.BERSERKER, Suit.DIAMONDS)
+def _model_berserker_rage(face, bonus, hand_type, context, state):
+    health, rage = state[0], state[1]
+    return {'rage': 1 + bonus}, (health, rage + 1 + bonus) + state[2:], 0
+
+@effect(Archetype.BERSERKER, Suit.CLUBS, "Take {half} damage, gain 2 Rage counters")
+def _berserker_bloodlust(game_state, caster: Player, spell: Card, target: Optional[Card], hand_type: str, bonus: int) -> None:
+    # Self-damage for power
+    self_damage = spell.face_value() // 2
+    caster.health -= self_damage
+    caster.rage_counters += 2 + bonus
+    print(f"{caster.name} takes {self_damage} damage to gain {2 + bonus} Rage counters")
+
+@model(Archetype.BERSERKER, Suit.CLUBS)
+def _model_berserker_bloodlust(face, bonus, hand_type, context, state):
+    health, rage = state[0], state[1]
+    return ({'self_damage': face // 2, 'rage': 2 + bonus},
+            (health - face // 2, rage + 2 + bonus) + state[2:], 0)
+
+@effect(Archetype.BERSERKER, Suit.SPADES, "Tap target creature")
+def _berserker_tap(game_state, caster: Player, spell: Card, target: Optional[Card], hand_type: str, bonus: int) -> None:
+    # Combat tricks
+    if target:
+        target.tapped = True
+        print(f"{target} is tapped")
+
+@model(Archetype.BERSERKER, Suit.SPADES)
+def _model_tap(face, bonus, hand_type, context, state):
+    return {'tap': 1}, state, 0
+
+# --- Mystic ---
+
+@effect(Archetype.MYSTIC, Suit.HEARTS, "Counter and tap target creature")
+def _mystic_counter(game_state, caster: Player, spell: Card, target: Optional[Card], hand_type: str, bonus: int) -> None:
+    # Counter effects
+    if target:
+        target.tapped = True
+        print(f"{target} is countered and tapped")
+
+model(Archetype.MYSTIC, Suit.HEARTS)(_model_tap)
+
+@effect(Archetype.MYSTIC, Suit.DIAMONDS, "Gain 1 Spell counter, tap target")
+def _mystic_mastery(game_state, caster: Player, spell: Card, target: Optional[Card], hand_type: str, bonus: int) -> None:
+    # Spell mastery
+    caster.spell_count += 1 + bonus
+    if target:
+        target.tapped = True
+    print(f"{caster.name} gains {1 + bonus} Spell counter(s)")
+
+@model(Archetype.MYSTIC, Suit.DIAMONDS)
+def _model_mystic_mastery(face, bonus, hand_type, context, state):
+    return {'spell_counters': 1 + bonus, 'tap': 1}, state, 0
+
+@effect(Archetype.MYSTIC, Suit.CLUBS, "Force opponent to discard a card")
+def _mystic_disrupt(game_state, caster: Player, spell: Card, target: Optional[Card], hand_type: str, bonus: int) -> None:
+    # Hand disruption
+    opponent = game_state.get_opponent()
+    for _ in range(1 + bonus):
+        if opponent.hand:
+            card = random.choice(opponent.hand)
+            opponent.discard_card(card)
+            print(f"{opponent.name} discards {card}")
+
+@model(Archetype.MYSTIC, Suit.CLUBS)
+def _model_discard(face, bonus, hand_type, context, state):
+    return {'discard': 1 + bonus}, state, 0
+
+@effect(Archetype.MYSTIC, Suit.SPADES, "Draw 2 cards (discard excess)")
+def _mystic_draw(game_state, caster: Player, spell: Card, target: Optional[Card], hand_type: str, bonus: int) -> None:
+    # Card manipulation
+    caster.draw_cards(2 + bonus)
+    if len(caster.hand) > 7:
+        discard_count = len(caster.hand) - 7
+        for _ in range(discard_count):
+            caster.discard_card(caster.hand[0])
+    print(f"{caster.name} draws {2 + bonus} cards and discards excess")
+
+@model(Archetype.MYSTIC, Suit.SPADES)
+def _model_mystic_draw(face, bonus, hand_type, context, state):
+    return {'cards': 2 + bonus}, state, 0
+
+# --- Trickster ---
+
+@effect(Archetype.TRICKSTER, Suit.HEARTS, "Swap life totals (up to 5 difference)")
+def _trickster_swap(game_state, caster: Player, spell: Card, target: Optional[Card], hand_type: str, bonus: int) -> None:
+    # Life manipulation
+    caster.disruption_count += 1 + bonus
+    opponent = game_state.get_opponent()
+    life_swap = min(5, caster.disruption_count)
+    caster.health, opponent.health = opponent.health, caster.health
+    print(f"{caster.name} swaps life totals with {opponent.name}")
+
+@model(Archetype.TRICKSTER, Suit.HEARTS)
+def _model_trickster_swap(face, bonus, hand_type, context, state):
+    # Swapping twice swaps back, so only the parity of swaps matters.
+    health, rage, tokens, opponent_mana, swapped = state
+    gain = context.opponent_health - context.health
+    return {'healing': -gain if swapped else gain}, (health, rage, tokens, opponent_mana, not swapped), 0
+
+@effect(Archetype.TRICKSTER, Suit.DIAMONDS, "Steal up to 2 mana from opponent")
+def _trickster_mana(game_state, caster: Player, spell: Card, target: Optional[Card], hand_type: str, bonus: int) -> None:
+    # Mana disruption
+    opponent = game_state.get_opponent()
+    stolen_mana = min(2 + bonus, opponent.mana)
+    opponent.mana -= stolen_mana
+    caster.mana += stolen_mana
+    print(f"{caster.name} steals {stolen_mana} mana from {opponent.name}")
+
+@model(Archetype.TRICKSTER, Suit.DIAMONDS)
+def _model_trickster_mana(face, bonus, hand_type, context, state):
+    health, rage, tokens, opponent_mana, swapped = state
+    stolen = min(2 + bonus, opponent_mana)
+    return {'mana': stolen}, (health, rage, tokens, opponent_mana - stolen, swapped), stolen
+
+@effect(Archetype.TRICKSTER, Suit.CLUBS, "Force opponent to discard a card")
+def _trickster_disrupt(game_state, caster: Player, spell: Card, target: Optional[Card], hand_type: str, bonus: int) -> None:
+    # Hand disruption
+    opponent = game_state.get_opponent()
+    for _ in range(1 + bonus):
+        if opponent.hand:
+            card = random.choice(opponent.hand)
+            opponent.discard_card(card)
+            caster.disruption_count += 1
+            print(f"{opponent.name} discards {card}")
+
+model(Archetype.TRICKSTER, Suit.CLUBS)(_model_discard)
+
+@effect(Archetype.TRICKSTER, Suit.SPADES, "Steal a random card from opponent")
+def _trickster_theft(game_state, caster: Player, spell: Card, target: Optional[Card], hand_type: str, bonus: int) -> None:
+    # Card theft
+    opponent = game_state.get_opponent()
+    for _ in range(1 + bonus):
+        if opponent.hand:
+            card = random.choice(opponent.hand)
+            opponent.hand.remove(card)
+            caster.hand.append(card)
+            print(f"{caster.name} steals {card} from {opponent.name}")
+
+@model(Archetype.TRICKSTER, Suit.SPADES)
+def _model_trickster_theft(face, bonus, hand_type, context, state):
+    return {'cards': 1 + bonus, 'discard': 1 + bonus}, state, 0
+
+# --- Commander ---
+
+@effect(Archetype.COMMANDER, Suit.HEARTS, "Create a Squire token (2/2)")
+def _commander_squires(game_state, caster: Player, spell: Card, target: Optional[Card], hand_type: str, bonus: int) -> None:
+    # Token generation
+    caster.tokens.create(1 + bonus)
+    caster.squire_count += 1 + bonus
+    print(f"{caster.name} creates {1 + bonus} Squire token(s)")
+
+@model(Archetype.COMMANDER, Suit.HEARTS)
+def _model_commander_squires(face, bonus, hand_type, context, state):
+    health, rage, tokens = state[0], state[1], state[2]
+    return {'tokens': 1 + bonus}, (health, rage, tokens + 1 + bonus) + state[3:], 0
+
+@effect(Archetype.COMMANDER, Suit.DIAMONDS, "Draw cards equal to number of tokens")
+def _commander_synergy(game_state, caster: Player, spell: Card, target: Optional[Card], hand_type: str, bonus: int) -> None:
+    # Token synergy
+    if caster.tokens:
+        caster.draw_cards(len(caster.tokens) * (1 + bonus))
+        print(f"{caster.name} draws {len(caster.tokens) * (1 + bonus)} cards for token synergy")
+
+@model(Archetype.COMMANDER, Suit.DIAMONDS)
+def _model_commander_synergy(face, bonus, hand_type, context, state):
+    return {'cards': state[2] * (1 + bonus)}, state, 0
+
+@effect(Archetype.COMMANDER, Suit.CLUBS, "Protect all tokens from effects")
+def _commander_protect(game_state, caster: Player, spell: Card, target: Optional[Card], hand_type: str, bonus: int) -> None:
+    # Token protection, until the caster's next turn
+    caster.tokens.protected = True
+    print(f"{caster.name} protects all tokens")
+
+@model(Archetype.COMMANDER, Suit.CLUBS)
+def _model_commander_protect(face, bonus, hand_type, context, state):
+    return {'token_buff': 0.5 * state[2]}, state, 0
+
+@effect(Archetype.COMMANDER, Suit.SPADES, "Buff all tokens by {half}")
+def _commander_buff(game_state, caster: Player, spell: Card, target: Optional[Card], hand_type: str, bonus: int) -> None:
+    # Token buffing: one offset for the whole army
+    buff_amount = spell.face_value() // 2 * (1 + bonus)
+    caster.tokens.add_buff(buff_amount)
+    print(f"{caster.name} buffs all tokens by {buff_amount}")
+
+@model(Archetype.COMMANDER, Suit.SPADES)
+def _model_commander_buff(face, bonus, hand_type, context, state):
+    return {'token_buff': face // 2 * (1 + bonus) * state[2]}, state, 0
+
+def _render_description(card: Card, archetype: Archetype) -> str:
     base_value = card.face_value()
-    
-    effects = {
-        Archetype.CULTIVATOR: {
-            Suit.HEARTS: f"Heal for {base_value}",
-            Suit.DIAMONDS: "Draw 2 cards",
-            Suit.CLUBS: "Gain 1 Growth Token (+1 mana next turn)",
-            Suit.SPADES: "Increase max mana by 1"
-        },
-        Archetype.BERSERKER: {
-            Suit.HEARTS: f"Deal {base_value} × (1 + rage) damage",
-            Suit.DIAMONDS: "Gain 1 Rage counter",
-            Suit.CLUBS: f"Take {base_value//2} damage, gain 2 Rage counters",
-            Suit.SPADES: "Tap target creature"
-        },
-        Archetype.MYSTIC: {
-            Suit.HEARTS: "Counter and tap target creature",
-            Suit.DIAMONDS: "Gain 1 Spell counter, tap target",
-            Suit.CLUBS: "Force opponent to discard a card",
-            Suit.SPADES: "Draw 2 cards (discard excess)"
-        },
-        Archetype.TRICKSTER: {
-            Suit.HEARTS: "Swap life totals (up to 5 difference)",
-            Suit.DIAMONDS: "Steal up to 2 mana from opponent",
-            Suit.CLUBS: "Force opponent to discard a card",
-            Suit.SPADES: "Steal a random card from opponent"
-        },
-        Archetype.COMMANDER: {
-            Suit.HEARTS: "Create a Squire token (2/2)",
-            Suit.DIAMONDS: "Draw cards equal to number of tokens",
-            Suit.CLUBS: "Protect all tokens from effects",
-            Suit.SPADES: f"Buff all tokens by {base_value//2}"
-        }
-    }
-    
-    effect = effects[archetype][card.suit]
+    effect = EFFECTS[(archetype, card.suit)].text.format(value=base_value, half=base_value // 2)
     if card.is_creature:
         effect += f" | Creature ({base_value}/{base_value})"
     return effect
 
+def _build_display_cache(archetype: Archetype) -> None:
+    deck = Card.create_standard_deck()
+    descriptions = [_render_description(card, archetype) for card in deck]
+    displays = [f"{card} - {description}" for card, description in zip(deck, descriptions)]
+    _DESCRIPTIONS[archetype] = descriptions
+    _CARD_DISPLAYS[archetype] = displays
+    _FIELD_DISPLAYS[archetype] = [f"{display} (Tapped: {tapped})"
+                                  for display in displays for tapped in (False, True)]
+
+def get_card_effect_description(card: Card, archetype: Archetype) -> str:
+    """Get a description of what a card does for a specific archetype."""
+    descriptions = _DESCRIPTIONS.get(archetype)
+    if descriptions is None:
+        _build_display_cache(archetype)
+        descriptions = _DESCRIPTIONS[archetype]
+    return descriptions[card.definition.card_id]
+
 def format_card_display(card: Card, archetype: Archetype) -> str:
     """Format a card for display with its effect."""
-    effect = get_card_effect_description(card, archetype)
-    return f"{card} - {effect}"
+    displays = _CARD_DISPLAYS.get(archetype)
+    if displays is None:
+        _build_display_cache(archetype)
+        displays = _CARD_DISPLAYS[archetype]
+    return displays[card.definition.card_id]
 
 def format_hand_display(cards: List[Card], archetype: Archetype) -> List[str]:
     """Format a list of cards for hand display."""
-    return [f"[{idx}] {format_card_display(card, archetype)}" 
+    displays = _CARD_DISPLAYS.get(archetype)
+    if displays is None:
+        _build_display_cache(archetype)
+        displays = _CARD_DISPLAYS[archetype]
+    prefixes = _INDEX_PREFIXES
+    if len(cards) > len(prefixes):
+        prefixes = [f"[{idx}] " for idx in range(len(cards))]
+    return [prefixes[idx] + displays[card.definition.card_id]
             for idx, card in enumerate(cards)]
 
 def format_field_display(cards: List[Card], archetype: Archetype) -> List[str]:
     """Format a list of cards for field display."""
-    return [f"{format_card_display(card, archetype)} (Tapped: {card.tapped})" 
-            for card in cards] 
\ No newline at end of file
+    lines = _FIELD_DISPLAYS.get(archetype)
+    if lines is None:
+        _build_display_cache(archetype)
+        lines = _FIELD_DISPLAYS[archetype]
+    return [lines[2 * card.definition.card_id + card.tapped] for card in cards]
+
+def warm_display_cache() -> None:
+    """Render descriptions and displays for every archetype x standard card."""
+    for archetype in Archetype:
+        _build_display_cache(archetype)
+
+warm_display_cache()
@@ -3,8 +3,9 @@ from typing import List, Optional
 from player import Player, Archetype
 from game_state import GameState, Phase
 from card import Card, Suit
-from card_lookup import format_hand_display, format_field_display
+from card_lookup import format_card_display, format_hand_display, format_field_display
 from ai_agent import AIAgent
+import actions
 
 def display_game_state(game_state: GameState, ai_agent: AIAgent) -> None:
     """Display the current game state."""
@@ -38,58 +39,37 @@ def display_game_state(game_state: GameState, ai_agent: AIAgent) -> None:
     
     print("=" * 50)
 
+def format_attack(game_state: GameState, action: int) -> str:
+    """Describe an encoded attack, e.g. "7S -> Player 2 (blocked by 5H)"."""
+    _, attacker_idx, target_seat, blocker_idx = actions.decode(action)
+    player = game_state.get_current_player()
+    target = game_state.players[target_seat]
+    text = f"{format_card_display(player.field[attacker_idx], player.archetype)} -> {target.name}"
+    if blocker_idx != actions.NO_BLOCKER:
+        text += f" (blocked by {target.field[blocker_idx]})"
+    return text
+
 def handle_ai_turn(game_state: GameState, ai_agent: AIAgent) -> None:
-    """Handle the AI's turn."""
-    while True:
-        if game_state.phase == Phase.END:
-            break
-            
-        prompt = ai_agent.get_ai_prompt()
-        # Here you would send the prompt to your LLM and get a response
-        # For now, we'll use a placeholder response
-        response = "end"  # Replace with actual LLM response
-        
-        action, params = ai_agent.get_ai_action(response)
-        
-        if action == "play" and game_state.phase in [Phase.MAIN1, Phase.MAIN2]:
-            card_idx = params[0]
-            if 0 <= card_idx < len(ai_agent.ai_player.hand):
-                card = ai_agent.ai_player.hand[card_idx]
-                if ai_agent.ai_player.can_play_card(card):
-                    ai_agent.ai_player.play_card(card)
-                    game_state.resolve_spell(ai_agent.ai_player, card)
-        elif action == "attack" and game_state.phase == Phase.COMBAT:
-            attacker_idx, target_idx, blocker_idx = params
-            if (0 <= attacker_idx < len(ai_agent.ai_player.field) and
-                1 <= target_idx <= len(game_state.players)):
-                attacker = ai_agent.ai_player.field[attacker_idx]
-                target = game_state.players[target_idx - 1]
-                
-                if blocker_idx == -1:
-                    game_state.resolve_combat(attacker)
-                else:
-                    if 0 <= blocker_idx < len(target.field):
-                        blocker = target.field[blocker_idx]
-                        game_state.resolve_combat(attacker, blocker)
-                
-                attacker.tapped = True
-        elif action == "end":
-            game_state.advance_phase()
-            break
+    """Handle the AI's turn with the local search agent (no LLM round-trip)."""
+    while not game_state.game_over and game_state.get_current_player() is ai_agent.ai_player:
+        action = ai_agent.search_agent.choose_action(game_state)
+        if action != actions.END:
+            print(f"AI: {actions.describe(action)}")
+        game_state.apply_action(action)
 
-def handle_player_turn(game_state: GameState, player: Player) -> None:
+def handle_player_turn(game_state: GameState, player: Player, ai_agent: AIAgent) -> None:
     """Handle a player's turn."""
-    while True:
-        if game_state.phase == Phase.END:
-            break
+    while not game_state.game_over and game_state.get_current_player() is player:
+        if game_state.phase in [Phase.BEGINNING, Phase.END]:
+            game_state.advance_phase()
+            continue
             
-        display_game_state(game_state, None)  # Pass None for ai_agent since it's player's turn
+        display_game_state(game_state, ai_agent)
         
         if game_state.phase in [Phase.MAIN1, Phase.MAIN2]:
             action = input("\nActions:\n1. Play card\n2. End phase\nChoice: ")
             if action == "2":
                 game_state.advance_phase()
-                break
             elif action == "1":
                 if not player.hand:
                     print("No cards in hand!")
@@ -98,10 +78,9 @@ def handle_player_turn(game_state: GameState, player: Player) -> None:
                 try:
                     card_idx = int(input("Enter card index: "))
                     if 0 <= card_idx < len(player.hand):
-                        card = player.hand[card_idx]
-                        if player.can_play_card(card):
-                            player.play_card(card)
-                            game_state.resolve_spell(player, card)
+                        action = actions.play(card_idx)
+                        if action in game_state.legal_actions():
+                            game_state.apply_action(action)
                         else:
                             print("Not enough mana!")
                     else:
@@ -113,50 +92,20 @@ def handle_player_turn(game_state: GameState, player: Player) -> None:
             action = input("\nCombat Actions:\n1. Attack\n2. End combat\nChoice: ")
             if action == "2":
                 game_state.advance_phase()
-                break
             elif action == "1":
-                attacking_creatures = [card for card in player.field if not card.tapped and card.is_creature]
-                if not attacking_creatures:
+                attacks = [move for move in game_state.legal_actions() if move != actions.END]
+                if not attacks:
                     print("No creatures to attack with!")
                     continue
                     
-                print("\nYour attacking creatures:")
-                for idx, card in enumerate(attacking_creatures):
-                    print(f"  [{idx}] {format_card_display(card, player.archetype)}")
+                print("\nAttacks:")
+                for idx, attack in enumerate(attacks):
+                    print(f"  [{idx}] {format_attack(game_state, attack)}")
                     
                 try:
-                    attacker_idx = int(input("Enter attacker index (or -1 to cancel): "))
-                    if attacker_idx == -1:
-                        continue
-                        
-                    if 0 <= attacker_idx < len(attacking_creatures):
-                        attacker = attacking_creatures[attacker_idx]
-                        target_idx = int(input("Enter target (1 for AI, 2 for other player): "))
-                        if 1 <= target_idx <= 2:
-                            target = game_state.players[target_idx - 1] if target_idx == 2 else None
-                            
-                            if target:
-                                blocking_creatures = [card for card in target.field if card.is_creature]
-                                print("\nTarget's creatures:")
-                                for idx, card in enumerate(blocking_creatures):
-                                    print(f"  [{idx}] {format_card_display(card, target.archetype)}")
-                                    
-                                blocker_idx = input("Enter blocker index (or press Enter for direct attack): ")
-                                if blocker_idx:
-                                    try:
-                                        blocker_idx = int(blocker_idx)
-                                        if 0 <= blocker_idx < len(blocking_creatures):
-                                            blocker = blocking_creatures[blocker_idx]
-                                            game_state.resolve_combat(attacker, blocker)
-                                            attacker.tapped = True
-                                    except ValueError:
-                                        print("Invalid blocker index!")
-                                else:
-                                    game_state.resolve_combat(attacker)
-                                    attacker.tapped = True
-                            else:
-                                game_state.resolve_combat(attacker)
-                                attacker.tapped = True
+                    attack_idx = int(input("Enter attack index (or -1 to cancel): "))
+                    if 0 <= attack_idx < len(attacks):
+                        game_state.apply_action(attacks[attack_idx])
                 except ValueError:
                     print("Invalid input!")
 
@@ -179,14 +128,14 @@ def main():
     
     # Initialize game
     game_state = GameState()
-    game_state.add_player(player1)
-    game_state.add_player(player2)
+    game_state.add_player(player1, team=0)
+    game_state.add_player(player2, team=0)
     
     # Initialize AI
     ai_agent = AIAgent(game_state)
     ai_archetype = random.choice(list(Archetype))
     ai_player = ai_agent.initialize_ai_player(ai_archetype)
-    game_state.add_player(ai_player)
+    game_state.add_player(ai_player, team=1)
     
     game_state.start_game()
     
@@ -197,7 +146,7 @@ def main():
         if current_player == ai_player:
             handle_ai_turn(game_state, ai_agent)
         else:
-            handle_player_turn(game_state, current_player)
+            handle_player_turn(game_state, current_player, ai_agent)
             
         game_state.check_game_over()
     
@@ -207,7 +156,7 @@ def main():
         if game_state.winner == ai_player:
             print("The AI wins!")
         else:
-            print(f"{game_state.winner.name} wins!")
+            print(f"{p1_name} and {p2_name} win!")
     else:
         print("It's a draw!")
 
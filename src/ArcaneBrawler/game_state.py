@@ -1,9 +1,11 @@
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from enum import Enum
 
 from player import Player, Archetype
-from card import Card, Suit
-import random
+from card import Card
+from poker_hand import ComboTracker, evaluate_hand
+from card_lookup import EFFECTS
+import actions
 
 class Phase(Enum):
     BEGINNING = "Beginning"
@@ -12,35 +14,112 @@ class Phase(Enum):
     MAIN2 = "Main2"
     END = "End"
 
+MAX_PLAYERS = 8
+
 class GameState:
+    """A table of 2 to MAX_PLAYERS seats. Each seat belongs to a team (by default
+    its own, i.e. free-for-all); the game ends when one team is left standing.
+    
+    Seat rotation and each seat's opposing seats are precomputed tables, rebuilt
+    only when a player joins or is eliminated.
+    """
     def __init__(self):
         self.players: List[Player] = []
+        self.teams: List[int] = []         # team of each seat
+        self.eliminated: List[bool] = []   # per seat, set by check_game_over
+        self._next_seat: List[int] = []    # seat -> next seat still in the game
+        self._opponent_seats: List[Tuple[int, ...]] = []  # seat -> live opposing seats, in turn order
+        self._seats: Dict[int, int] = {}   # id(player) -> seat
         self.current_player_index = 0
         self.phase = Phase.BEGINNING
         self.turn_number = 1
         self.game_over = False
         self.winner: Optional[Player] = None
-        self.last_played_cards: List[Card] = []  # Track cards played this turn for combo effects
+        self._played_cards: List[Card] = []  # Cards played this turn, for combo effects
+        self.combo = ComboTracker()  # Poker-hand state of _played_cards, updated per card
         
-    def add_player(self, player: Player) -> None:
-        """Add a player to the game."""
-        if len(self.players) < 2:
-            self.players.append(player)
+    def snapshot(self) -> tuple:
+        """Capture the full game state as compact, hashable tuples."""
+        winner_index = self.seat_of(self.winner) if self.winner is not None else -1
+        return (tuple([player.snapshot() for player in self.players]),
+                self.current_player_index, self.phase, self.turn_number,
+                self.game_over, winner_index,
+                tuple([card.pack() for card in self._played_cards]),
+                tuple(self.teams), tuple(self.eliminated))
+    
+    def restore(self, snapshot: tuple) -> None:
+        """Restore a `snapshot()` in place, reusing the existing Player objects."""
+        (player_snapshots, self.current_player_index, self.phase, self.turn_number,
+         self.game_over, winner_index, last_played, teams, eliminated) = snapshot
+        if len(self.players) != len(player_snapshots):
+            self.players = [Player.from_snapshot(p) for p in player_snapshots]
         else:
-            raise ValueError("Game can only have 2 players")
+            for player, player_snapshot in zip(self.players, player_snapshots):
+                player.restore(player_snapshot)
+        self.winner = self.players[winner_index] if winner_index >= 0 else None
+        self._played_cards = [Card.unpack(code) for code in last_played]
+        self.combo = ComboTracker(self._played_cards)
+        if teams != tuple(self.teams) or eliminated != tuple(self.eliminated) or len(self._seats) != len(self.players):
+            self.teams, self.eliminated = list(teams), list(eliminated)
+            self._rebuild_seats()
+    
+    def clone(self) -> 'GameState':
+        """Return an independent copy of this game, far cheaper than copy.deepcopy."""
+        clone = GameState()
+        clone.restore(self.snapshot())
+        return clone
+    
+    def add_player(self, player: Player, team: Optional[int] = None) -> None:
+        """Add a player to the next seat; without a team, the seat plays for itself."""
+        if len(self.players) >= MAX_PLAYERS:
+            raise ValueError(f"Game can only have {MAX_PLAYERS} players")
+        self.players.append(player)
+        self.teams.append(len(self.players) - 1 if team is None else team)
+        self.eliminated.append(False)
+        self._rebuild_seats()
+    
+    def _rebuild_seats(self) -> None:
+        """Recompute the rotation, opponent and seat tables."""
+        count = len(self.players)
+        live = [seat for seat in range(count) if not self.eliminated[seat]]
+        self._seats = {id(player): seat for seat, player in enumerate(self.players)}
+        self._next_seat = []
+        self._opponent_seats = []
+        for seat in range(count):
+            # Live seats in turn order, starting after this one
+            order = [other for other in live if other > seat] + [other for other in live if other <= seat]
+            self._next_seat.append(order[0] if order else seat)
+            self._opponent_seats.append(tuple([other for other in order
+                                               if self.teams[other] != self.teams[seat]]))
+    
+    def seat_of(self, player: Player) -> int:
+        """The seat index of `player`."""
+        seat = self._seats.get(id(player))
+        if seat is None or seat >= len(self.players) or self.players[seat] is not player:
+            seat = self.players.index(player)  # players was edited directly
+        return seat
     
     def get_current_player(self) -> Player:
         """Get the current active player."""
         return self.players[self.current_player_index]
     
+    def get_opponent_seat(self) -> int:
+        """Seat of the current player's opponent: the next live opposing seat in turn order."""
+        seats = self._opponent_seats[self.current_player_index]
+        return seats[0] if seats else self._next_seat[self.current_player_index]
+    
     def get_opponent(self) -> Player:
         """Get the opponent of the current player."""
-        return self.players[1 - self.current_player_index]
+        return self.players[self.get_opponent_seat()]
+    
+    def get_opponents(self) -> List[Player]:
+        """Every live player not on the current player's team, in turn order."""
+        return [self.players[seat] for seat in self._opponent_seats[self.current_player_index]]
     
     def start_game(self) -> None:
         """Initialize the game."""
-        if len(self.players) != 2:
-            raise ValueError("Game requires exactly 2 players")
+        if len(self.players) < 2 or len(set(self.teams)) < 2:
+            raise ValueError(f"Game requires 2 to {MAX_PLAYERS} players on at least 2 teams")
             
         # Each player draws 7 cards
         for player in self.players:
@@ -59,22 +138,85 @@ class GameState:
             self.get_current_player().start_turn()
         elif self.phase == Phase.END:
             self.get_current_player().end_turn()
-            self.current_player_index = 1 - self.current_player_index
+            self.clear_played_cards()
+            self.current_player_index = self._next_seat[self.current_player_index]
             self.turn_number += 1
     
+    def legal_actions(self) -> List[int]:
+        """Every action the current player may take now, encoded as in `actions`.
+        
+        Main phases: play any affordable card. Combat: attack any live opposing seat
+        with any untapped creature, directly or into one of that seat's creatures. END (advance
+        the phase) is always last; a finished game has no actions.
+        """
+        if self.game_over:
+            return []
+        player = self.get_current_player()
+        if self.phase == Phase.MAIN1 or self.phase == Phase.MAIN2:
+            hand_index = player.hand.index
+            legal = [actions.play(i) for i in sorted([hand_index(card) for card in player.playable_cards()])]
+        elif self.phase == Phase.COMBAT:
+            attackers = sorted([player.field.index(card) for card in player.ready_creatures()])
+            legal = []
+            if attackers:
+                for seat in self._opponent_seats[self.current_player_index]:
+                    opponent = self.players[seat]
+                    opponent_index = opponent.field.index
+                    blockers = [actions.NO_BLOCKER] + sorted([opponent_index(card) for card in opponent.field.creatures()])
+                    legal.extend([actions.attack(i, seat, blocker) for i in attackers for blocker in blockers])
+        else:
+            legal = []
+        legal.append(actions.END)
+        return legal
+    
+    def apply_action(self, action: int) -> None:
+        """Perform a `legal_actions()` action for the current player.
+        
+        END advances the phase; raises ValueError for an action that is not legal now.
+        """
+        if action not in self.legal_actions():
+            raise ValueError(f"Illegal action: {actions.describe(action)}")
+        kind, index, target_seat, blocker_index = actions.decode(action)
+        player = self.get_current_player()
+        if kind == actions.PLAY:
+            card = player.hand[index]
+            player.play_card(card)
+            self.resolve_spell(player, card)
+        elif kind == actions.ATTACK:
+            attacker = player.field[index]
+            target = self.players[target_seat]
+            blocker = target.field[blocker_index] if blocker_index != actions.NO_BLOCKER else None
+            self.resolve_combat(attacker, blocker, target)
+            attacker.tapped = True
+        else:
+            self.advance_phase()
+        self.check_game_over()
+    
     def check_game_over(self) -> bool:
-        """Check if the game is over and determine the winner."""
-        for player in self.players:
-            if player.health <= 0:
-                self.game_over = True
-                self.winner = self.get_opponent()
-                return True
-        return False
+        """Eliminate players at 0 health; the game is over when at most one team is left.
+        
+        The winner is the first surviving seat of that team (None if nobody survives).
+        """
+        eliminated = False
+        for seat, player in enumerate(self.players):
+            if player.health <= 0 and not self.eliminated[seat]:
+                self.eliminated[seat] = eliminated = True
+        if eliminated:
+            self._rebuild_seats()
+        if self.game_over:
+            return True
+        survivors = [seat for seat in range(len(self.players)) if not self.eliminated[seat]]
+        if len({self.teams[seat] for seat in survivors}) > 1:
+            return False
+        self.game_over = True
+        self.winner = self.players[survivors[0]] if survivors else None
+        return True
     
-    def resolve_combat(self, attacker: Card, blocker: Optional[Card] = None) -> None:
-        """Resolve combat between cards."""
+    def resolve_combat(self, attacker: Card, blocker: Optional[Card] = None,
+                       target: Optional[Player] = None) -> None:
+        """Resolve combat between cards; `target` (default: the opponent) owns the blocker."""
         current_player = self.get_current_player()
-        opponent = self.get_opponent()
+        opponent = target if target is not None else self.get_opponent()
         
         if blocker:
             # Both creatures take damage equal to each other's power
@@ -107,193 +249,31 @@ class GameState:
     
     def check_poker_hand(self, cards: List[Card]) -> Tuple[str, int]:
         """Check if cards form a poker hand and return the hand type and bonus value."""
-        if len(cards) < 2:
-            return "None", 0
-            
-        values = [card.face_value() for card in cards]
-        suits = [card.suit for card in cards]
-        
-        # Check for pairs
-        value_counts = {}
-        for value in values:
-            value_counts[value] = value_counts.get(value, 0) + 1
-            
-        # Check for straights
-        sorted_values = sorted(set(values))
-        is_straight = len(sorted_values) >= 5 and max(sorted_values) - min(sorted_values) == 4
-        
-        # Check for flushes
-        suit_counts = {}
-        for suit in suits:
-            suit_counts[suit] = suit_counts.get(suit, 0) + 1
-        is_flush = max(suit_counts.values()) >= 5
-        
-        # Determine hand type and bonus
-        if is_straight and is_flush:
-            return "Royal Flush", 12
-        elif is_straight:
-            return "Straight", 5
-        elif is_flush:
-            return "Flush", 4
-        elif 4 in value_counts.values():
-            return "Four of a Kind", 8
-        elif 3 in value_counts.values() and 2 in value_counts.values():
-            return "Full House", 10
-        elif 3 in value_counts.values():
-            return "Three of a Kind", 3
-        elif list(value_counts.values()).count(2) == 2:
-            return "Two Pair", 2
-        elif 2 in value_counts.values():
-            return "Pair", 1
-            
-        return "None", 0
+        return evaluate_hand(cards)
+    
+    @property
+    def last_played_cards(self) -> Tuple[Card, ...]:
+        """Cards played this turn, oldest first. Read-only: change them through
+        record_played_card and clear_played_cards so the combo stays in step."""
+        return tuple(self._played_cards)
+    
+    def record_played_card(self, card: Card) -> Tuple[str, int]:
+        """Add a card to this turn's combo and return the resulting (hand_type, bonus)."""
+        self._played_cards.append(card)
+        return self.combo.add(card)
+    
+    def clear_played_cards(self) -> None:
+        """Reset this turn's combo."""
+        self._played_cards.clear()
+        self.combo.reset()
     
     def resolve_spell(self, caster: Player, spell: Card, target: Optional[Card] = None) -> None:
         """Resolve a spell effect based on the archetype."""
-        self.last_played_cards.append(spell)
-        hand_type, bonus = self.check_poker_hand(self.last_played_cards)
+        hand_type, bonus = self.record_played_card(spell)
         
-        # Apply bonus to spell effects
-        if caster.archetype == Archetype.CULTIVATOR:
-            if spell.suit == Suit.CLUBS:
-                # Resource generation
-                caster.growth_tokens += 1 + bonus
-                print(f"{caster.name} gains {1 + bonus} Growth Token(s) (+{1 + bonus} mana next turn)")
-                if hand_type == "Flush":
-                    caster.growth_tokens += 2
-                    print("Flush bonus: +2 additional Growth Tokens!")
-            elif spell.suit == Suit.SPADES:
-                # Persistent effects
-                caster.max_mana += 1 + bonus
-                print(f"{caster.name} increases max mana by {1 + bonus}")
-                if hand_type == "Straight":
-                    caster.max_mana += 1
-                    print("Straight bonus: +1 additional max mana!")
-            elif spell.suit == Suit.HEARTS:
-                # Healing and protection
-                heal_amount = spell.face_value() * (1 + bonus)
-                caster.health = min(caster.max_health, caster.health + heal_amount)
-                print(f"{caster.name} heals for {heal_amount}")
-            elif spell.suit == Suit.DIAMONDS:
-                # Card advantage
-                caster.draw_cards(2 + bonus)
-                print(f"{caster.name} draws {2 + bonus} cards")
-                
-        elif caster.archetype == Archetype.BERSERKER:
-            if spell.suit == Suit.HEARTS:
-                # Direct damage
-                base_damage = spell.face_value()
-                rage_bonus = caster.rage_counters
-                total_damage = base_damage * (1 + rage_bonus + bonus)
-                opponent = self.get_opponent()
-                opponent.health -= total_damage
-                print(f"{caster.name} deals {total_damage} damage! (Base: {base_damage}, Rage: {rage_bonus}, Combo: {bonus})")
-            elif spell.suit == Suit.DIAMONDS:
-                # Rage generation
-                caster.rage_counters += 1 + bonus
-                print(f"{caster.name} gains {1 + bonus} Rage counter(s)")
-            elif spell.suit == Suit.CLUBS:
-                # Self-damage for power
-                self_damage = spell.face_value() // 2
-                caster.health -= self_damage
-                caster.rage_counters += 2 + bonus
-                print(f"{caster.name} takes {self_damage} damage to gain {2 + bonus} Rage counters")
-            elif spell.suit == Suit.SPADES:
-                # Combat tricks
-                if target:
-                    target.tapped = True
-                    print(f"{target} is tapped")
-                
-        elif caster.archetype == Archetype.MYSTIC:
-            if spell.suit == Suit.DIAMONDS:
-                # Spell mastery
-                caster.spell_count += 1 + bonus
-                if target:
-                    target.tapped = True
-                print(f"{caster.name} gains {1 + bonus} Spell counter(s)")
-            elif spell.suit == Suit.SPADES:
-                # Card manipulation
-                caster.draw_cards(2 + bonus)
-                if len(caster.hand) > 7:
-                    discard_count = len(caster.hand) - 7
-                    for _ in range(discard_count):
-                        caster.discard_card(caster.hand[0])
-                print(f"{caster.name} draws {2 + bonus} cards and discards excess")
-            elif spell.suit == Suit.HEARTS:
-                # Counter effects
-                if target:
-                    target.tapped = True
-                    print(f"{target} is countered and tapped")
-            elif spell.suit == Suit.CLUBS:
-                # Hand disruption
-                opponent = self.get_opponent()
-                for _ in range(1 + bonus):
-                    if opponent.hand:
-                        card = random.choice(opponent.hand)
-                        opponent.discard_card(card)
-                        print(f"{opponent.name} discards {card}")
-                
-        elif caster.archetype == Archetype.TRICKSTER:
-            if spell.suit == Suit.CLUBS:
-                # Hand disruption
-                opponent = self.get_opponent()
-                for _ in range(1 + bonus):
-                    if opponent.hand:
-                        card = random.choice(opponent.hand)
-                        opponent.discard_card(card)
-                        caster.disruption_count += 1
-                        print(f"{opponent.name} discards {card}")
-            elif spell.suit == Suit.HEARTS:
-                # Life manipulation
-                caster.disruption_count += 1 + bonus
-                opponent = self.get_opponent()
-                life_swap = min(5, caster.disruption_count)
-                caster.health, opponent.health = opponent.health, caster.health
-                print(f"{caster.name} swaps life totals with {opponent.name}")
-            elif spell.suit == Suit.DIAMONDS:
-                # Mana disruption
-                opponent = self.get_opponent()
-                stolen_mana = min(2 + bonus, opponent.mana)
-                opponent.mana -= stolen_mana
-                caster.mana += stolen_mana
-                print(f"{caster.name} steals {stolen_mana} mana from {opponent.name}")
-            elif spell.suit == Suit.SPADES:
-                # Card theft
-                opponent = self.get_opponent()
-                for _ in range(1 + bonus):
-                    if opponent.hand:
-                        card = random.choice(opponent.hand)
-                        opponent.hand.remove(card)
-                        caster.hand.append(card)
-                        print(f"{caster.name} steals {card} from {opponent.name}")
-                
-        elif caster.archetype == Archetype.COMMANDER:
-            if spell.suit == Suit.HEARTS:
-                # Token generation
-                for _ in range(1 + bonus):
-                    squire = Card(Suit.HEARTS, "2")
-                    caster.tokens.append(squire)
-                    caster.squire_count += 1
-                print(f"{caster.name} creates {1 + bonus} Squire token(s)")
-            elif spell.suit == Suit.SPADES:
-                # Token buffing
-                buff_amount = spell.face_value() // 2 * (1 + bonus)
-                for token in caster.tokens:
-                    # Implementation would depend on how we track token stats
-                    pass
-                print(f"{caster.name} buffs all tokens by {buff_amount}")
-            elif spell.suit == Suit.CLUBS:
-                # Token protection
-                for token in caster.tokens:
-                    # Implementation would depend on how we track token stats
-                    pass
-                print(f"{caster.name} protects all tokens")
-            elif spell.suit == Suit.DIAMONDS:
-                # Token synergy
-                if caster.tokens:
-                    caster.draw_cards(len(caster.tokens) * (1 + bonus))
-                    print(f"{caster.name} draws {len(caster.tokens) * (1 + bonus)} cards for token synergy")
+        # One table lookup selects the (archetype, suit) handler
+        EFFECTS[(caster.archetype, spell.suit)].resolve(self, caster, spell, target, hand_type, bonus)
         
         # Clear last played cards at end of turn
         if self.phase == Phase.END:
-            self.last_played_cards.clear() 
\ No newline at end of file
+            self.clear_played_cards() 
\ No newline at end of file
@@ -0,0 +1,129 @@
+"""Lethal detection: can the current player kill this turn? Cheap enough to run
+before any full search, so decided positions skip it.
+
+Damage this turn comes from spells (Berserker Hearts: face × (1 + rage + combo
+bonus)) and from direct attacks by untapped creatures (face + rage for a
+Berserker), including creatures cast in the first main phase. Other effects
+only matter through mana (Trickster steals), Rage, self-damage and the
+Trickster life swap, so the search models just those. Delaying spells to the
+second main phase never adds damage, so a line is: spells, then attacks.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import actions
+from card import Card, Suit
+from game_state import GameState, Phase
+from player import Archetype
+from poker_hand import ComboTracker
+
+def find_lethal(game_state: GameState, node_limit: int = 50_000) -> Optional[List[int]]:
+    """The action line (as in `actions`, ENDs included) that kills the opponent
+    this turn, or None if there is none or `node_limit` search nodes run out.
+
+    The line is planned from the current position. Draw and discard effects can
+    reorder the hand, so agents should play its first action and ask again;
+    a repeat search in a won position is cheap.
+    """
+    if game_state.game_over or game_state.phase not in (Phase.MAIN1, Phase.COMBAT, Phase.MAIN2):
+        return None
+    player, opponent = game_state.get_current_player(), game_state.get_opponent()
+    seat = game_state.get_opponent_seat()
+    berserker = player.archetype == Archetype.BERSERKER
+    trickster = player.archetype == Archetype.TRICKSTER
+    hand: List[Card] = list(player.hand)
+    field_size = len(player.field)
+    index_of = player.field.index
+    # (power, field index) of creatures that can attack now, strongest first
+    ready = sorted(((card.face_value(), index_of(card)) for card in player.ready_creatures()), reverse=True)
+
+    prefix: List[int] = []
+    opponent_health = opponent.health
+    if game_state.phase == Phase.COMBAT:
+        # Attack with everything, then look for the rest in the second main phase.
+        for power, index in ready:
+            prefix.append(actions.attack(index, seat))
+            opponent_health -= power + (player.rage_counters if berserker else 0)
+            if opponent_health <= 0:
+                return prefix
+        prefix.append(actions.END)
+    combat_ahead = game_state.phase == Phase.MAIN1
+
+    if not (berserker or trickster):
+        # Only attacks deal damage: bound by every creature we hold or control.
+        ceiling = sum(power for power, _ in ready) + sum(card.face_value() for card in hand if card.is_creature)
+        if not combat_ahead or ceiling < opponent_health:
+            return None
+
+    nodes = 0
+    best_seen: Dict[Tuple[int, int, int, int, int], int] = {}
+    order: List[int] = []
+
+    def line(attackers: List[Tuple[int, int]], rage: int, health_left: int) -> List[int]:
+        plays, played = [], []
+        for position in order:
+            plays.append(actions.play(position - sum(1 for earlier in played if earlier < position)))
+            played.append(position)
+        if not attackers:
+            return prefix + plays
+        attacks = []
+        for power, index in sorted(attackers, reverse=True):
+            attacks.append(actions.attack(index, seat))
+            health_left -= power + (rage if berserker else 0)
+            if health_left <= 0:
+                break
+        return prefix + plays + [actions.END] + attacks
+
+    def search(mask: int, mana: int, stealable: int, rage: int, own_health: int, health: int,
+               tracker: ComboTracker, new_attackers: List[Tuple[int, int]]) -> Optional[List[int]]:
+        nonlocal nodes
+        nodes += 1
+        if health <= 0:
+            return line([], rage, health)
+        if combat_ahead:
+            attackers = ready + new_attackers
+            if health - sum(power + (rage if berserker else 0) for power, _ in attackers) <= 0:
+                return line(attackers, rage, health)
+        key = (mask, mana, stealable, rage, own_health)
+        if best_seen.get(key, health + 1) <= health or nodes > node_limit:
+            return None
+        best_seen[key] = health
+
+        for position, card in enumerate(hand):
+            if mask & (1 << position) or card.mana_cost > mana:
+                continue
+            child = tracker.copy()
+            hand_type, bonus = child.add(card)
+            face = card.face_value()
+            next_mana, next_stealable = mana - card.mana_cost, stealable
+            next_rage, next_own, next_health = rage, own_health, health
+            suit = card.suit
+            if berserker:
+                if suit == Suit.HEARTS:
+                    next_health -= face * (1 + rage + bonus)
+                elif suit == Suit.DIAMONDS:
+                    next_rage += 1 + bonus
+                elif suit == Suit.CLUBS:
+                    next_own -= face // 2
+                    next_rage += 2 + bonus
+            elif trickster:
+                if suit == Suit.HEARTS:
+                    next_own, next_health = next_health, next_own
+                elif suit == Suit.DIAMONDS:
+                    stolen = min(2 + bonus, stealable)
+                    next_mana += stolen
+                    next_stealable -= stolen
+            if next_own <= 0:
+                continue  # Never kill ourselves first
+            attackers = new_attackers
+            if card.is_creature:
+                attackers = new_attackers + [(face, field_size + len(order))]
+            order.append(position)
+            found = search(mask | (1 << position), next_mana, next_stealable, next_rage,
+                           next_own, next_health, child, attackers)
+            if found is not None:
+                return found
+            order.pop()
+        return None
+
+    return search(0, player.mana, opponent.mana, player.rage_counters, player.health,
+                  opponent_health, ComboTracker(game_state.last_played_cards), [])
@@ -0,0 +1,134 @@
+"""Load-test client for server.py: many tables played at once over localhost.
+
+Each client opens a connection, creates a table, takes its human seats and
+plays random legal actions, timing every request until its ack. With `ai`,
+seat 2 of every table is an AI, so the server's worker pool is exercised too.
+
+Run from this directory: python loadtest.py [clients] [actions per client] [--ai]
+(starts an in-process server unless --port is given)
+"""
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+from server import GameServer
+
+class LoadStats(NamedTuple):
+    actions: int
+    seconds: float
+    p50: float  # seconds
+    p99: float
+
+    @property
+    def actions_per_second(self) -> float:
+        return self.actions / self.seconds if self.seconds else 0.0
+
+class Connection:
+    """A client connection that keeps each table's view up to date from pushed diffs."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.views: Dict[int, Dict[str, object]] = {}
+        self._next_id = 0
+
+    @classmethod
+    async def open(cls, host: str, port: int) -> 'Connection':
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def request(self, message: dict) -> dict:
+        """Send a request and return its reply, applying diffs that arrive first."""
+        self._next_id += 1
+        message = dict(message, id=self._next_id)
+        self.writer.write(json.dumps(message).encode() + b"\n")
+        await self.writer.drain()
+        while True:
+            reply = await self._receive()
+            if reply.get('id') == self._next_id:
+                if reply['op'] == 'joined':
+                    self.views[reply['table']] = reply['state']
+                return reply
+
+    async def wait_for_turn(self, table: int) -> Dict[str, object]:
+        """The table's view once we have legal actions or the game is over."""
+        view = self.views[table]
+        while not (view['legal'] or view['game_over']):
+            await self._receive()
+        return view
+
+    async def _receive(self) -> dict:
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("Server closed the connection")
+        message = json.loads(line)
+        if message['op'] == 'diff' and message['table'] in self.views:
+            # Diffs for a table we created but have not joined yet are skipped
+            self.views[message['table']].update(message['changes'])
+        return message
+
+    async def close(self) -> None:
+        self.writer.close()
+        await self.writer.wait_closed()
+
+async def play_table(host: str, port: int, actions: int, ai: bool, latencies: List[float],
+                     rng: random.Random) -> None:
+    """One client: play random legal actions at a fresh table (new tables after game over)."""
+    connection = await Connection.open(host, port)
+    try:
+        table = None
+        for _ in range(actions):
+            if table is None or connection.views[table]['game_over']:
+                if table is not None:
+                    await connection.request({'op': 'leave', 'table': table})
+                created = await connection.request({'op': 'create', 'archetypes': ["Berserker", "Cultivator"],
+                                                    'ai': [1] if ai else []})
+                table = created['table']
+                for seat in ((0,) if ai else (0, 1)):
+                    await connection.request({'op': 'join', 'table': table, 'seat': seat})
+            view = await connection.wait_for_turn(table)
+            if view['game_over']:
+                continue
+            start = time.perf_counter()
+            reply = await connection.request({'op': 'act', 'table': table, 'action': rng.choice(view['legal'])})
+            latencies.append(time.perf_counter() - start)
+            if reply['op'] != 'ack':
+                raise RuntimeError(f"Action rejected: {reply}")
+    finally:
+        await connection.close()
+
+async def run_load(host: str, port: int, clients: int = 50, actions: int = 200,
+                   ai: bool = False, seed: Optional[int] = 0) -> LoadStats:
+    """Run `clients` concurrent clients against a server; latency is per action round trip."""
+    latencies: List[float] = []
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    await asyncio.gather(*[play_table(host, port, actions, ai, latencies, random.Random(rng.random()))
+                           for _ in range(clients)])
+    seconds = time.perf_counter() - start
+    latencies.sort()
+    if not latencies:
+        return LoadStats(0, seconds, 0.0, 0.0)
+    return LoadStats(len(latencies), seconds, latencies[len(latencies) // 2],
+                     latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))])
+
+async def main(clients: int, actions: int, ai: bool, port: Optional[int]) -> None:
+    server = None
+    if port is None:
+        server = GameServer()
+        port = await server.start(port=0)
+    try:
+        stats = await run_load("127.0.0.1", port, clients, actions, ai)
+    finally:
+        if server is not None:
+            await server.close()
+    print(f"{clients} clients{' vs AI' if ai else ''}: {stats.actions} actions in {stats.seconds:.2f} s, "
+          f"{stats.actions_per_second:.0f} actions/s, p50 {stats.p50 * 1e3:.2f} ms, p99 {stats.p99 * 1e3:.2f} ms")
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    port = next((int(arg.split("=", 1)[1]) for arg in sys.argv[1:] if arg.startswith("--port=")), None)
+    asyncio.run(main(int(args[0]) if args else 50, int(args[1]) if len(args) > 1 else 200,
+                     "--ai" in sys.argv, port))
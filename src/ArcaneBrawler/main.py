@@ -2,7 +2,9 @@ from typing import List, Optional
 from player import Player, Archetype
 from game_state import GameState, Phase
 from card import Card, Suit
-from card_lookup import format_hand_display, format_field_display
+from card_lookup import format_card_display, format_hand_display, format_field_display
+from turn_optimizer import plan_turn
+import actions
 
 def display_game_state(game_state: GameState) -> None:
     """Display the current game state."""
@@ -35,10 +37,17 @@ def handle_main_phase(game_state: GameState) -> None:
     current_player = game_state.get_current_player()
     
     while True:
-        action = get_player_input("\nActions:\n1. Play card\n2. End phase\nChoice: ")
+        action = get_player_input("\nActions:\n1. Play card\n2. End phase\n3. Hint\nChoice: ")
         
         if action == "2":
             break
+        elif action == "3":
+            plan = plan_turn(game_state)
+            if plan.indexes:
+                print("Suggested plays: " + ", ".join(f"[{idx}] {card}" for idx, card in zip(plan.indexes, plan.cards)))
+                print("(indexes are for the current hand; play the first, then ask again)")
+            else:
+                print("Suggested: end the phase")
         elif action == "1":
             if not current_player.hand:
                 print("No cards in hand!")
@@ -47,16 +56,15 @@ def handle_main_phase(game_state: GameState) -> None:
             try:
                 card_idx = int(get_player_input("Enter card index: "))
                 if 0 <= card_idx < len(current_player.hand):
-                    card = current_player.hand[card_idx]
-                    if current_player.can_play_card(card):
-                        if current_player.play_card(card):
-                            print(f"Played {card}")
-                            # Handle card effects based on archetype
-                            game_state.resolve_spell(current_player, card)
-                        else:
-                            print("Not enough mana!")
+                    action = actions.play(card_idx)
+                    if action in game_state.legal_actions():
+                        print(f"Played {current_player.hand[card_idx]}")
+                        # Pays the mana and resolves the archetype effect
+                        game_state.apply_action(action)
+                        if game_state.game_over:
+                            break
                     else:
-                        print("Cannot play this card!")
+                        print("Not enough mana!")
                 else:
                     print("Invalid card index!")
             except ValueError:
@@ -74,7 +82,7 @@ def handle_combat_phase(game_state: GameState) -> None:
             break
         elif action == "1":
             # Only show creatures that can attack
-            attacking_creatures = [card for card in current_player.field if not card.tapped and card.is_creature]
+            attacking_creatures = current_player.ready_creatures()
             if not attacking_creatures:
                 print("No creatures to attack with!")
                 break
@@ -90,29 +98,31 @@ def handle_combat_phase(game_state: GameState) -> None:
                     
                 if 0 <= attacker_idx < len(attacking_creatures):
                     attacker = attacking_creatures[attacker_idx]
-                    if attacker.tapped:
-                        print("Card is tapped!")
-                        continue
+                    seat = game_state.get_opponent_seat()
                         
                     # Only show creatures that can block
-                    blocking_creatures = [card for card in opponent.field if card.is_creature]
+                    blocking_creatures = opponent.field.creatures()
                     print("\nOpponent's creatures:")
                     for idx, card in enumerate(blocking_creatures):
                         print(f"  [{idx}] {format_card_display(card, opponent.archetype)}")
                         
                     blocker_idx = get_player_input("Enter blocker index (or press Enter for direct attack): ")
+                    action = None
                     if blocker_idx:
                         try:
                             blocker_idx = int(blocker_idx)
                             if 0 <= blocker_idx < len(blocking_creatures):
                                 blocker = blocking_creatures[blocker_idx]
-                                game_state.resolve_combat(attacker, blocker)
-                                attacker.tapped = True
+                                action = actions.attack(current_player.field.index(attacker), seat,
+                                                        opponent.field.index(blocker))
                         except ValueError:
                             print("Invalid blocker index!")
                     else:
-                        game_state.resolve_combat(attacker)
-                        attacker.tapped = True
+                        action = actions.attack(current_player.field.index(attacker), seat)
+                    if action is not None and action in game_state.legal_actions():
+                        game_state.apply_action(action)
+                        if game_state.game_over:
+                            break
                 else:
                     print("Invalid attacker index!")
             except ValueError:
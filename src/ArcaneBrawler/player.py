@@ -1,7 +1,10 @@
 from typing import List
 from enum import Enum
 
-from card import Card, Suit
+from array import array
+from card import Card, Suit, STANDARD_DECK_CODES
+from tokens import TokenArmy
+from zones import CardZone
 import random
 
 class Archetype(Enum):
@@ -12,6 +15,11 @@ class Archetype(Enum):
     COMMANDER = "Commander"
 
 class Player:
+    __slots__ = ('name', 'archetype', 'health', 'max_health', 'mana', 'max_mana',
+                 'hand', 'deck', 'discard', 'field', 'tokens', 'turn_number',
+                 'growth_tokens', 'rage_counters', 'spell_count', 'disruption_count',
+                 'squire_count')
+
     def __init__(self, name: str, archetype: Archetype):
         self.name = name
         self.archetype = archetype
@@ -19,11 +27,11 @@ class Player:
         self.max_health = 20
         self.mana = 2  # Start with 2 mana
         self.max_mana = 2  # Start with max mana of 2
-        self.hand: List[Card] = []
-        self.deck: List[Card] = Card.create_standard_deck()
+        self.hand = CardZone()
+        self.deck = array('l', STANDARD_DECK_CODES)  # Packed cards (Card.pack), drawn from the end
         self.discard: List[Card] = []
-        self.field: List[Card] = []  # Cards in play
-        self.tokens: List[Card] = []  # Special tokens (e.g., Growth Tokens, Squires)
+        self.field = CardZone(track_tapped=True)  # Cards in play
+        self.tokens = TokenArmy()  # Squire tokens (Commander)
         self.turn_number = 0
         
         # Archetype-specific attributes
@@ -41,13 +49,13 @@ class Player:
         for _ in range(amount):
             if not self.deck:
                 if self.discard:
-                    self.deck.extend(self.discard)
+                    self.deck.extend([card.pack() for card in self.discard])
                     self.discard.clear()
                     random.shuffle(self.deck)
                 else:
                     return  # No cards to draw
             
-            self.hand.append(self.deck.pop())
+            self.hand.append(Card.unpack(self.deck.pop()))
     
     def discard_card(self, card: Card) -> None:
         """Move a card from hand to discard pile."""
@@ -80,10 +88,51 @@ class Player:
     def get_token_count(self) -> int:
         return len(self.tokens)
     
+    def snapshot(self) -> tuple:
+        """Capture the player's mutable state as nested tuples of packed cards."""
+        return (self.name, self.archetype, self.health, self.max_health, self.mana,
+                self.max_mana, self.turn_number,
+                (self.growth_tokens, self.rage_counters, self.spell_count,
+                 self.disruption_count, self.squire_count),
+                tuple([card.pack() for card in self.hand]),
+                tuple(self.deck),
+                tuple([card.pack() for card in self.discard]),
+                tuple([card.pack() for card in self.field]),
+                self.tokens.pack())
+    
+    def restore(self, snapshot: tuple) -> None:
+        """Restore state captured by `snapshot()`; cards are rebuilt as fresh objects."""
+        (self.name, self.archetype, self.health, self.max_health, self.mana,
+         self.max_mana, self.turn_number, counters,
+         hand, deck, discard, field, tokens) = snapshot
+        (self.growth_tokens, self.rage_counters, self.spell_count,
+         self.disruption_count, self.squire_count) = counters
+        unpack = Card.unpack
+        self.hand = CardZone([unpack(code) for code in hand])
+        self.deck = array('l', deck)
+        self.discard = [unpack(code) for code in discard]
+        self.field = CardZone([unpack(code) for code in field], track_tapped=True)
+        self.tokens = TokenArmy.unpack(tokens)
+    
+    @classmethod
+    def from_snapshot(cls, snapshot: tuple) -> 'Player':
+        """Build a player from a snapshot without creating or shuffling a new deck."""
+        player = cls.__new__(cls)
+        player.restore(snapshot)
+        return player
+    
     def can_play_card(self, card: Card) -> bool:
         """Check if a card can be played with current mana."""
         return card in self.hand and self.mana >= card.mana_cost
     
+    def playable_cards(self) -> List[Card]:
+        """Cards in hand affordable with current mana."""
+        return self.hand.affordable(self.mana)
+    
+    def ready_creatures(self) -> List[Card]:
+        """Untapped creatures on the field (can attack or block)."""
+        return self.field.untapped_creatures()
+    
     def start_turn(self) -> None:
         """Handle start of turn effects."""
         self.turn_number += 1
@@ -100,10 +149,9 @@ class Player:
         elif self.archetype == Archetype.TRICKSTER:
             self.disruption_count = 0
         elif self.archetype == Archetype.COMMANDER:
-            # Commander gets +1/+1 to all tokens at start of turn
-            for token in self.tokens:
-                # Implementation would depend on how we track token stats
-                pass
+            # Commander gets +1/+1 to all tokens at start of turn; last turn's protection ends
+            self.tokens.add_buff(1)
+            self.tokens.protected = False
     
     def end_turn(self) -> None:
         """Handle end of turn effects."""
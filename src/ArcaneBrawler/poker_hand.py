@@ -0,0 +1,125 @@
+from typing import Iterable, Tuple
+
+from card import Card
+
+# Face values run 2..11 (J/Q/K are 10, A is 11), so a value bitmask fits in 12 bits.
+
+def _is_straight(mask: int) -> bool:
+    """Five or more distinct values spanning exactly 4 (i.e. five consecutive values)."""
+    if bin(mask).count("1") < 5:
+        return False
+    return (mask.bit_length() - 1) - ((mask & -mask).bit_length() - 1) == 4
+
+# _STRAIGHT[value_mask] -> the straight bit of the hand key (0 or 32)
+_STRAIGHT = tuple(32 if _is_straight(mask) else 0 for mask in range(1 << 12))
+
+# Hand-key bits, most significant first.
+_STRAIGHT_BIT, _FLUSH_BIT, _FOUR_BIT, _THREE_BIT, _TWO_PAIR_BIT, _PAIR_BIT = 32, 16, 8, 4, 2, 1
+
+def _classify(key: int) -> Tuple[str, int]:
+    """Hand type and bonus for a key, in the precedence order of the combo rules."""
+    if key & _STRAIGHT_BIT and key & _FLUSH_BIT:
+        return "Royal Flush", 12
+    elif key & _STRAIGHT_BIT:
+        return "Straight", 5
+    elif key & _FLUSH_BIT:
+        return "Flush", 4
+    elif key & _FOUR_BIT:
+        return "Four of a Kind", 8
+    elif key & _THREE_BIT and key & _PAIR_BIT:
+        return "Full House", 10
+    elif key & _THREE_BIT:
+        return "Three of a Kind", 3
+    elif key & _TWO_PAIR_BIT:
+        return "Two Pair", 2
+    elif key & _PAIR_BIT:
+        return "Pair", 1
+    return "None", 0
+
+# _HAND_TABLE[key] -> (hand_type, bonus)
+_HAND_TABLE = tuple(_classify(key) for key in range(64))
+
+# Multiplicity patterns: how many values are held exactly 2, 3 and 4 times. Each
+# pattern gets a row of 5 slots, so the pattern after adding a card whose value
+# was already held `count` (< 5) times is _NEXT_PATTERN[pattern + count].
+_PATTERNS = [(pairs, threes, fours)
+             for pairs in range(13) for threes in range(13 - pairs) for fours in range(13 - pairs - threes)]
+_PATTERN_ROW = {pattern: 5 * i for i, pattern in enumerate(_PATTERNS)}
+
+def _next_pattern(pattern: Tuple[int, int, int], count: int) -> int:
+    counts = [0, 0, 0, 0, 0, 0]
+    counts[2], counts[3], counts[4] = pattern
+    counts[count] -= 1
+    counts[count + 1] += 1
+    return _PATTERN_ROW.get((counts[2], counts[3], counts[4]), 0)
+
+_NEXT_PATTERN = tuple(_next_pattern(pattern, count) for pattern in _PATTERNS for count in range(5))
+# _PATTERN_BITS[pattern] -> four/three/two-pair/pair bits of the hand key
+_PATTERN_BITS = {}
+for _pattern, _row in _PATTERN_ROW.items():
+    _PATTERN_BITS[_row] = ((_FOUR_BIT if _pattern[2] else 0) | (_THREE_BIT if _pattern[1] else 0)
+                           | (_TWO_PAIR_BIT if _pattern[0] == 2 else 0) | (_PAIR_BIT if _pattern[0] else 0))
+_PATTERN_BITS = tuple(_PATTERN_BITS[row] for row in sorted(_PATTERN_BITS))
+
+class ComboTracker:
+    """Incrementally maintained poker-hand evaluation over the cards played this turn.
+
+    Keeps a value histogram, the multiplicity pattern of that histogram, per-suit
+    counts and a value bitmask; adding a card is a few table lookups and reading
+    the current hand is O(1).
+    """
+    __slots__ = ('value_counts', 'pattern', 'suit_counts', 'value_mask',
+                 'flush_bit', 'size', 'result')
+
+    def __init__(self, cards: Iterable[Card] = ()):
+        self.reset()
+        for card in cards:
+            self.add(card)
+
+    def reset(self) -> None:
+        """Forget every card (start of a new turn)."""
+        self.value_counts = [0] * 12
+        self.pattern = 0
+        self.suit_counts = [0] * 4
+        self.value_mask = 0
+        self.flush_bit = 0
+        self.size = 0
+        self.result = _HAND_TABLE[0]
+
+    def copy(self) -> 'ComboTracker':
+        """An independent tracker in the same state (for branching searches)."""
+        tracker = ComboTracker.__new__(ComboTracker)
+        tracker.value_counts = self.value_counts[:]
+        tracker.pattern = self.pattern
+        tracker.suit_counts = self.suit_counts[:]
+        tracker.value_mask = self.value_mask
+        tracker.flush_bit = self.flush_bit
+        tracker.size = self.size
+        tracker.result = self.result
+        return tracker
+
+    def add(self, card: Card) -> Tuple[str, int]:
+        """Add a played card and return the updated (hand_type, bonus)."""
+        definition = card.definition
+        value = definition.face
+        value_counts = self.value_counts
+        count = value_counts[value]
+        value_counts[value] = count + 1
+        if count < 5:
+            self.pattern = _NEXT_PATTERN[self.pattern + count]
+        self.value_mask |= 1 << value
+
+        suit_counts = self.suit_counts
+        suit = definition.suit_index
+        if suit_counts[suit] == 4:
+            self.flush_bit = _FLUSH_BIT
+        suit_counts[suit] += 1
+        self.size += 1
+
+        self.result = result = _HAND_TABLE[_STRAIGHT[self.value_mask] | self.flush_bit
+                                           | _PATTERN_BITS[self.pattern // 5]]
+        return result
+
+def evaluate_hand(cards: Iterable[Card]) -> Tuple[str, int]:
+    """Evaluate an arbitrary list of cards (no incremental state kept)."""
+    return ComboTracker(cards).result
@@ -0,0 +1,94 @@
+from typing import Callable, Dict, Hashable, List
+
+import actions
+from card_lookup import format_field_display, format_hand_display
+from game_state import GameState, Phase
+from player import Player
+
+_FOOTER = """
+Example response: "play 2", "attack 0 1 -1" or {"action": "play", "card": 2}
+
+What action do you take?"""
+
+class PromptBuilder:
+    """Builds the AI's turn prompt from sections that are re-rendered only when
+    their inputs change.
+
+    Within a phase most actions leave most of the table alone (playing a card
+    touches the hand, mana and field; attacking touches one field), so each
+    section is cached under a cheap key of exactly what it shows, and the full
+    prompt is reused when no key changed.
+    """
+
+    def __init__(self, game_state: GameState, player: Player):
+        self.game_state = game_state
+        self.player = player
+        self._keys: Dict[str, Hashable] = {}
+        self._text: Dict[str, str] = {}
+        self._sections: List[str] = []
+        self._prompt = ""
+        self.renders = 0  # Sections rendered so far (for tests and benchmarks)
+
+    def build(self) -> str:
+        """The full prompt for the current position."""
+        player, game_state = self.player, self.game_state
+        sections = [
+            self._section('header', player.archetype, self._render_header),
+            self._section('status', (player.health, player.max_health, player.mana, player.max_mana),
+                          self._render_status),
+            self._section('opponents', tuple([(p.name, p.health, p.max_health)
+                                              for p in game_state.players if p is not player]),
+                          self._render_opponents),
+            self._section('hand', tuple([card.uid for card in player.hand]), self._render_hand),
+            self._section('field', tuple([(card.uid, card.tapped) for card in player.field]),
+                          self._render_field),
+            self._section('actions', (game_state.phase, tuple(game_state.legal_actions())),
+                          self._render_actions),
+        ]
+        if len(sections) != len(self._sections) or any(
+                text is not previous for text, previous in zip(sections, self._sections)):
+            self._sections = sections
+            self._prompt = "\n".join(sections) + _FOOTER
+        return self._prompt
+
+    def _section(self, name: str, key: Hashable, render: Callable[[Hashable], str]) -> str:
+        if name not in self._text or self._keys[name] != key:
+            self._keys[name] = key
+            self._text[name] = render(key)
+            self.renders += 1
+        return self._text[name]
+
+    def _render_header(self, archetype) -> str:
+        return f"You are playing Arcane Shuffle as the {archetype.value} archetype."
+
+    def _render_status(self, key) -> str:
+        health, max_health, mana, max_mana = key
+        return f"Your health: {health}/{max_health}\nYour mana: {mana}/{max_mana}\n"
+
+    def _render_opponents(self, key) -> str:
+        lines = ["Opponents:"]
+        for seat, player in enumerate(self.game_state.players):
+            if player is not self.player:
+                ally = " [ally]" if self.game_state.teams[seat] == self.game_state.teams[self.game_state.seat_of(self.player)] else ""
+                lines.append(f"{seat + 1}. {player.name} ({player.archetype.value}){ally} - "
+                             f"Health: {player.health}/{player.max_health}")
+        return "\n".join(lines) + "\n"
+
+    def _render_hand(self, key) -> str:
+        return "Your hand:\n" + "\n".join(format_hand_display(self.player.hand, self.player.archetype)) + "\n"
+
+    def _render_field(self, key) -> str:
+        return "Your field:\n" + "\n".join(format_field_display(self.player.field, self.player.archetype)) + "\n"
+
+    def _render_actions(self, key) -> str:
+        phase, legal = key
+        lines: List[str] = [f"Current phase: {phase.value}", "", "Available actions:"]
+        if phase == Phase.MAIN1 or phase == Phase.MAIN2:
+            lines.append('- Play a card: "play [card_index]"')
+            lines.append('- End phase: "end"')
+        elif phase == Phase.COMBAT:
+            lines.append('- Attack: "attack [attacker_index] [target_player_index] [blocker_index]"')
+            lines.append('   (target_player_index: seat number above, blocker_index: -1 for no blocker)')
+            lines.append('- End combat: "end"')
+        lines.append("Legal right now: " + ", ".join(actions.describe(action) for action in legal))
+        return "\n".join(lines)
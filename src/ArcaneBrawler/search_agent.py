@@ -0,0 +1,148 @@
+import contextlib
+import io
+import random
+import time
+from typing import Optional, Sequence
+
+import actions
+from game_state import GameState
+from lethal import find_lethal
+from player import Player
+
+WIN_SCORE = 1_000_000.0
+
+class SearchAgent:
+    """Offline opponent: depth-limited lookahead over GameState snapshots.
+
+    Positions with lethal this turn (see lethal.find_lethal) skip the search.
+    The search never sees hidden cards: it runs on a copy of the game in which
+    the agent's deck is reshuffled and each opponent's hand is redealt from
+    that hand and its deck.
+    Otherwise each legal action is tried on a scratch copy of the game and scored with a
+    static evaluation; with time left over, the search deepens one ply at a time
+    through the agent's own follow-up actions (iterative deepening). The best
+    action of the deepest completed pass is returned, so a move always costs
+    at most about `time_budget` seconds.
+
+    `seat` is the agent's seat; if omitted it is looked up (by identity) in the
+    game passed to the first `choose_action`. `health_multiplier` and
+    `power_multiplier` are the AIAgent's stat scalings:
+    the agent's (and its teammates') life is valued per point of its (scaled)
+    maximum, and damage to opponents is weighted by the power multiplier.
+    """
+
+    def __init__(self, player: Player, time_budget: float = 0.005, max_depth: int = 3,
+                 health_multiplier: float = 1.0, power_multiplier: float = 1.0,
+                 seat: Optional[int] = None):
+        self.player = player
+        self.seat = seat
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.health_multiplier = health_multiplier
+        self.power_multiplier = power_multiplier
+        self._scratch = GameState()
+
+    def evaluate(self, game_state: GameState) -> float:
+        """Static score of a position from this agent's point of view."""
+        teams = game_state.teams
+        team = teams[self._seat(game_state)]
+        if game_state.game_over:
+            winner = game_state.winner
+            if winner is None:
+                return 0.0
+            return WIN_SCORE if teams[game_state.seat_of(winner)] == team else -WIN_SCORE
+        score = 0.0
+        for index, player in enumerate(game_state.players):
+            value = self._material(player)
+            if teams[index] == team:
+                score += player.health / self.health_multiplier + value
+            else:
+                score -= player.health * self.power_multiplier + value
+        return score
+
+    def choose_action(self, game_state: GameState) -> int:
+        """The best legal action found within the time budget."""
+        self._seat(game_state)
+        legal = game_state.legal_actions()
+        if len(legal) <= 1:
+            return legal[0] if legal else actions.END
+        lethal = find_lethal(game_state)
+        if lethal:
+            return lethal[0]  # Decided position: no need to search
+        deadline = time.perf_counter() + self.time_budget
+        root = self._sample_hidden(game_state.snapshot(), game_state.teams)
+        best = legal[-1]
+        # Effect handlers narrate to stdout; keep the search quiet.
+        with contextlib.redirect_stdout(io.StringIO()):
+            for depth in range(1, self.max_depth + 1):
+                pass_best, pass_score, complete = None, None, True
+                for action in legal:
+                    self._scratch.restore(root)
+                    score = self._search(action, depth - 1, deadline)
+                    if score is None:
+                        complete = False
+                        break
+                    if pass_score is None or score > pass_score:
+                        pass_best, pass_score = action, score
+                if complete:
+                    best = pass_best
+                if not complete or pass_score >= WIN_SCORE:
+                    break
+        return best
+
+    def _search(self, action: int, depth: int, deadline: float) -> Optional[float]:
+        """Apply `action` to the scratch game and score it, following up with up
+        to `depth` more of our own actions. None once the deadline passes."""
+        game_state = self._scratch
+        game_state.apply_action(action)
+        seat = self._seat(game_state)
+        if depth == 0 or game_state.game_over or game_state.current_player_index != seat:
+            return self.evaluate(game_state)
+        if time.perf_counter() > deadline:
+            return None
+        snapshot = game_state.snapshot()
+        best = None
+        for follow_up in game_state.legal_actions():
+            game_state.restore(snapshot)
+            score = self._search(follow_up, depth - 1, deadline)
+            if score is None:
+                return None
+            if best is None or score > best:
+                best = score
+        return best
+
+    def _sample_hidden(self, snapshot: tuple, teams: Sequence[int]) -> tuple:
+        """`snapshot` with the cards this agent can't see reshuffled: its own
+        deck, and each opponent's hand (dealt again from that hand plus its deck)."""
+        players = list(snapshot[0])
+        team = teams[self.seat]
+        for index, player in enumerate(players):
+            # Player.snapshot(): hand and deck are fields 8 and 9
+            hand, deck = player[8], player[9]
+            if index == self.seat:
+                deck = list(deck)
+                random.shuffle(deck)
+            elif teams[index] != team:
+                pool = list(hand) + list(deck)
+                random.shuffle(pool)
+                hand, deck = pool[:len(hand)], pool[len(hand):]
+            else:
+                continue
+            players[index] = player[:8] + (tuple(hand), tuple(deck)) + player[10:]
+        return (tuple(players),) + snapshot[1:]
+
+    def _seat(self, game_state: GameState) -> int:
+        """This agent's seat. Snapshots rebuild players, so the seat index is kept
+        rather than matching players; it is looked up once in the live game."""
+        if self.seat is None:
+            self.seat = game_state.seat_of(self.player)
+        return self.seat
+
+    @staticmethod
+    def _material(player: Player) -> float:
+        """Board, hand and archetype resources, in rough life-point equivalents."""
+        return (sum(card.face_value() for card in player.field.creatures()) * 0.5
+                + len(player.hand) * 0.5
+                + player.tokens.total_power() * 0.5
+                + player.growth_tokens + player.rage_counters * 2.0
+                + player.spell_count * 0.5)
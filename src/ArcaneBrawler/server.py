@@ -0,0 +1,307 @@
+"""Multi-table game server: many GameStates in one asyncio process.
+
+Clients speak newline-delimited JSON over TCP. Requests carry an optional
+"id" that is echoed in the reply:
+
+    {"op": "create", "archetypes": ["Berserker", "Mystic"], "ai": [1], "teams": [0, 1]}
+        -> {"op": "created", "table": 3}     (the creator watches the table)
+    {"op": "join", "table": 3, "seat": 0}     (omit "seat" to watch)
+        -> {"op": "joined", "table": 3, "version": 0, "state": {...}}
+    {"op": "act", "table": 3, "action": 5}    (an int from `actions`)
+        -> {"op": "ack", "table": 3, "version": 4}
+    {"op": "leave", "table": 3}
+        -> {"op": "left", "table": 3}
+
+After every action each client at the table is pushed the keys of its view
+that changed: {"op": "diff", "table": 3, "version": 4, "changes": {...},
+"log": [...]}. A view shows every seat's public state, plus the hand and legal
+actions of the seats that client holds. Failed requests get {"op": "error"}.
+A table closes once every client watching or seated at it has left or
+disconnected, so at least one seat must be human.
+
+AI seats are played by SearchAgent in a worker pool (processes by default),
+so a slow search never blocks other tables. If the pool fails, the search runs
+in the server process instead; if that fails too, the table is closed.
+
+Run from this directory: python server.py [port]
+"""
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+from game_state import GameState
+from player import Archetype, Player
+from search_agent import SearchAgent
+
+DEFAULT_PORT = 8765
+
+log = logging.getLogger(__name__)
+
+def think(snapshot: tuple, seat: int, time_budget: float) -> int:
+    """Worker-pool entry point: the AI's action for `seat` in a snapshotted game."""
+    game_state = GameState()
+    game_state.restore(snapshot)
+    return SearchAgent(game_state.players[seat], time_budget=time_budget, seat=seat).choose_action(game_state)
+
+def table_view(game_state: GameState, seats: Set[int]) -> Dict[str, object]:
+    """Flat view of a table as seen by a client holding `seats`; diffs are per key."""
+    winner = game_state.winner
+    view: Dict[str, object] = {
+        'phase': game_state.phase.value,
+        'turn': game_state.turn_number,
+        'current': game_state.current_player_index,
+        'game_over': game_state.game_over,
+        'winner': game_state.seat_of(winner) if winner is not None else None,
+        'legal': game_state.legal_actions() if game_state.current_player_index in seats else [],
+    }
+    for seat, player in enumerate(game_state.players):
+        prefix = f"p{seat}."
+        view[prefix + 'health'] = player.health
+        view[prefix + 'mana'] = player.mana
+        view[prefix + 'max_mana'] = player.max_mana
+        view[prefix + 'hand_size'] = len(player.hand)
+        view[prefix + 'field'] = [[str(card), card.tapped] for card in player.field]
+        view[prefix + 'tokens'] = len(player.tokens)
+        view[prefix + 'out'] = game_state.eliminated[seat]
+        if seat in seats:
+            view[prefix + 'hand'] = [str(card) for card in player.hand]
+    return view
+
+class _Client:
+    """One connection: its writer and the view it was last sent at each table."""
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.seats: Dict[int, Set[int]] = {}              # table id -> seats held
+        self.views: Dict[int, Dict[str, object]] = {}     # table id -> last view sent
+
+    def send(self, message: dict) -> None:
+        if not self.writer.is_closing():
+            self.writer.write(json.dumps(message).encode() + b"\n")
+
+    async def drain(self) -> None:
+        """Wait for the write buffer to flush, so slow readers apply backpressure."""
+        with contextlib.suppress(ConnectionError):
+            await self.writer.drain()
+
+class Table:
+    """A hosted game, the clients seated at or watching it, and its AI seats."""
+
+    def __init__(self, table_id: int, game_state: GameState, ai_seats: Set[int]):
+        self.id = table_id
+        self.game_state = game_state
+        self.ai_seats = ai_seats
+        self.owners: Dict[int, _Client] = {}  # seat -> client
+        self.clients: Set[_Client] = set()
+        self.version = 0
+        self.ai_task: Optional[asyncio.Task] = None
+
+class GameServer:
+    """Hosts tables and routes client requests to them (see the module docstring)."""
+
+    def __init__(self, workers: int = 2, ai_time_budget: float = 0.005,
+                 executor: Optional[Executor] = None):
+        self.executor = executor or ProcessPoolExecutor(max_workers=workers)
+        self.ai_time_budget = ai_time_budget
+        self.tables: Dict[int, Table] = {}
+        self.actions_applied = 0
+        self._next_table = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._handlers: Dict[str, Callable[[_Client, dict], Awaitable[dict]]] = {
+            'create': self._create,
+            'join': self._join,
+            'act': self._act,
+            'leave': self._leave,
+        }
+
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> int:
+        """Start listening; returns the bound port (pass 0 for any free port)."""
+        self._server = await asyncio.start_server(self._serve_client, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        tasks = [table.ai_task for table in self.tables.values() if table.ai_task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        client = _Client(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                request = {}
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("Requests must be JSON objects")
+                    handler = self._handlers.get(request.get('op'))
+                    if handler is None:
+                        raise ValueError(f"Unknown op: {request.get('op')!r}")
+                    reply = await handler(client, request)
+                except (ValueError, KeyError, TypeError) as error:
+                    # json.JSONDecodeError is a ValueError
+                    reply = {'op': 'error', 'message': str(error)}
+                if isinstance(request, dict) and 'id' in request:
+                    reply['id'] = request['id']
+                client.send(reply)
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass  # Client gone, or the server is shutting down
+        finally:
+            for table_id in list(client.views):
+                self._drop(client, self.tables.get(table_id))
+            writer.close()
+
+    def _table(self, request: dict) -> Table:
+        table = self.tables.get(request['table'])
+        if table is None:
+            raise ValueError(f"No table {request['table']}")
+        return table
+
+    async def _create(self, client: _Client, request: dict) -> dict:
+        by_name = {archetype.value.lower(): archetype for archetype in Archetype}
+        archetypes = [by_name[name.lower()] for name in request['archetypes']]
+        teams = request.get('teams') or [None] * len(archetypes)
+        if len(teams) != len(archetypes):
+            raise ValueError(f"Got {len(teams)} teams for {len(archetypes)} seats")
+        game_state = GameState()
+        for seat, (archetype, team) in enumerate(zip(archetypes, teams)):
+            game_state.add_player(Player(f"Seat{seat + 1}", archetype), team)
+        game_state.start_game()
+        ai_seats = set(request.get('ai', ()))
+        if not ai_seats <= set(range(len(archetypes))):
+            raise ValueError(f"AI seats out of range: {sorted(ai_seats)}")
+        if len(ai_seats) == len(archetypes):
+            raise ValueError("At least one seat must be human")
+        self._next_table += 1
+        table = Table(self._next_table, game_state, ai_seats)
+        self.tables[table.id] = table
+        table.clients.add(client)
+        client.views[table.id] = table_view(game_state, set())
+        self._schedule_ai(table)
+        return {'op': 'created', 'table': table.id}
+
+    async def _join(self, client: _Client, request: dict) -> dict:
+        table = self._table(request)
+        seat = request.get('seat')
+        if seat is not None:
+            if not 0 <= seat < len(table.game_state.players) or seat in table.ai_seats:
+                raise ValueError(f"Seat {seat} cannot be taken")
+            if table.owners.get(seat, client) is not client:
+                raise ValueError(f"Seat {seat} is taken")
+            table.owners[seat] = client
+        seats = client.seats.setdefault(table.id, set())
+        if seat is not None:
+            seats.add(seat)
+        table.clients.add(client)
+        view = client.views[table.id] = table_view(table.game_state, seats)
+        return {'op': 'joined', 'table': table.id, 'version': table.version, 'state': view}
+
+    async def _act(self, client: _Client, request: dict) -> dict:
+        table = self._table(request)
+        game_state = table.game_state
+        if table.owners.get(game_state.current_player_index) is not client:
+            raise ValueError("Not your turn")
+        await self._apply(table, int(request['action']))
+        self._schedule_ai(table)
+        return {'op': 'ack', 'table': table.id, 'version': table.version}
+
+    async def _leave(self, client: _Client, request: dict) -> dict:
+        table = self._table(request)
+        self._drop(client, table)
+        return {'op': 'left', 'table': table.id}
+
+    def _drop(self, client: _Client, table: Optional[Table]) -> None:
+        """Release a client's seats at `table`; tables nobody can play are closed."""
+        if table is None:
+            return
+        for seat in client.seats.pop(table.id, ()):
+            del table.owners[seat]
+        client.views.pop(table.id, None)
+        table.clients.discard(client)
+        if not table.clients:
+            if table.ai_task:
+                table.ai_task.cancel()
+            del self.tables[table.id]
+
+    async def _apply(self, table: Table, action: int) -> None:
+        """Apply an action, push each client the part of its view that changed
+        and wait for those writes to drain."""
+        narration = io.StringIO()
+        with contextlib.redirect_stdout(narration):
+            table.game_state.apply_action(action)  # ValueError if illegal
+        table.version += 1
+        self.actions_applied += 1
+        log = narration.getvalue().splitlines()
+        for client in table.clients:
+            view = table_view(table.game_state, client.seats.get(table.id, set()))
+            previous = client.views.get(table.id, {})
+            changes = {key: value for key, value in view.items() if previous.get(key) != value}
+            client.views[table.id] = view
+            client.send({'op': 'diff', 'table': table.id, 'version': table.version,
+                         'changes': changes, 'log': log})
+        await asyncio.gather(*[client.drain() for client in list(table.clients)])
+
+    def _close_table(self, table: Table, message: str) -> None:
+        """Tell everyone at `table` it is gone and drop it."""
+        for client in list(table.clients):
+            client.send({'op': 'error', 'table': table.id, 'message': message})
+            client.seats.pop(table.id, None)
+            client.views.pop(table.id, None)
+        table.clients.clear()
+        self.tables.pop(table.id, None)
+
+    def _schedule_ai(self, table: Table) -> None:
+        game_state = table.game_state
+        if (not game_state.game_over and game_state.current_player_index in table.ai_seats
+                and (table.ai_task is None or table.ai_task.done())):
+            table.ai_task = asyncio.create_task(self._run_ai(table))
+
+    async def _run_ai(self, table: Table) -> None:
+        """Play AI seats until a human is to act; searches run in the worker pool."""
+        loop = asyncio.get_running_loop()
+        game_state = table.game_state
+        while not game_state.game_over and game_state.current_player_index in table.ai_seats:
+            args = (game_state.snapshot(), game_state.current_player_index, self.ai_time_budget)
+            try:
+                action = await loop.run_in_executor(self.executor, think, *args)
+            except Exception:
+                log.exception("Table %d: AI search failed in the worker pool; searching locally", table.id)
+                try:
+                    action = think(*args)
+                except Exception:
+                    log.exception("Table %d: AI search failed; closing the table", table.id)
+                    self._close_table(table, "The AI failed; table closed")
+                    return
+            if table.id not in self.tables:
+                return
+            try:
+                await self._apply(table, action)
+            except ValueError:
+                log.exception("Table %d: AI chose an illegal action; closing the table", table.id)
+                self._close_table(table, "The AI failed; table closed")
+                return
+
+async def serve(port: int = DEFAULT_PORT, workers: int = 2) -> None:
+    server = GameServer(workers)
+    bound = await server.start(port=port)
+    print(f"Serving ArcaneBrawler on 127.0.0.1:{bound}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+if __name__ == "__main__":
+    asyncio.run(serve(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PORT))
@@ -0,0 +1,68 @@
+"""Self-play driver over GameState.legal_actions(), for smoke tests, bots and throughput.
+
+Run from this directory: python simulator.py [games] [--optimizer]
+(--optimizer plays turn_optimizer's planned cards instead of random actions)
+"""
+import contextlib
+import io
+import random
+import sys
+import time
+from typing import Callable, Optional, Sequence
+
+from game_state import GameState
+from player import Player, Archetype
+from turn_optimizer import optimizer_policy
+
+Policy = Callable[[GameState], int]
+
+def random_policy(game_state: GameState) -> int:
+    """Pick uniformly among the legal actions."""
+    return random.choice(game_state.legal_actions())
+
+def new_game(archetypes: Sequence[Archetype] = (Archetype.BERSERKER, Archetype.CULTIVATOR)) -> GameState:
+    """A started game with one player per archetype."""
+    game_state = GameState()
+    for seat, archetype in enumerate(archetypes):
+        game_state.add_player(Player(f"Bot{seat + 1}", archetype))
+    game_state.start_game()
+    return game_state
+
+def play_game(game_state: GameState, policies: Sequence[Policy], max_turns: int = 200) -> GameState:
+    """Play until someone wins or `max_turns` pass; `policies[i]` acts for seat i.
+
+    Effect handlers print as they resolve, so output is discarded while playing.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        while not game_state.game_over and game_state.turn_number <= max_turns:
+            policy = policies[game_state.current_player_index]
+            game_state.apply_action(policy(game_state))
+    return game_state
+
+def run(games: int = 200, seed: Optional[int] = 0, policy: Policy = random_policy) -> None:
+    """Play games with `policy` in every seat and report throughput and outcomes."""
+    if seed is not None:
+        random.seed(seed)
+    archetypes = list(Archetype)
+    wins = draws = actions_taken = 0
+
+    def counting_policy(game_state: GameState) -> int:
+        nonlocal actions_taken
+        actions_taken += 1
+        return policy(game_state)
+
+    start = time.perf_counter()
+    for _ in range(games):
+        game_state = play_game(new_game(random.sample(archetypes, 2)), [counting_policy] * 2)
+        if game_state.winner:
+            wins += 1
+        else:
+            draws += 1
+    seconds = time.perf_counter() - start
+    print(f"{games} games ({wins} decided, {draws} hit the turn limit), {actions_taken} actions: "
+          f"{seconds / games * 1e3:.2f} ms per game, {seconds / actions_taken * 1e6:.1f} us per action")
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if arg != "--optimizer"]
+    run(int(args[0]) if args else 200,
+        policy=optimizer_policy if "--optimizer" in sys.argv[1:] else random_policy)
@@ -1,7 +1,54 @@
+import asyncio
+import random
 import unittest
+from concurrent.futures import Executor
+from typing import List, Tuple
+import actions
+from ai_agent import AIAgent
 from game_state import GameState, Phase
 from player import Player, Archetype
 from card import Card, Suit
+from card_lookup import (EFFECTS, format_card_display, format_field_display,
+                         format_hand_display, get_card_effect_description)
+from lethal import find_lethal
+from loadtest import Connection, run_load
+from search_agent import SearchAgent
+from server import GameServer
+from simulator import new_game, play_game, random_policy
+from turn_optimizer import TurnContext, optimizer_policy, plan_turn, solve
+
+def legacy_check_poker_hand(cards: List[Card]) -> Tuple[str, int]:
+    """The original dict/sort based evaluator, the reference for the tests and benchmarks."""
+    if len(cards) < 2:
+        return "None", 0
+    values = [card.face_value() for card in cards]
+    suits = [card.suit for card in cards]
+    value_counts = {}
+    for value in values:
+        value_counts[value] = value_counts.get(value, 0) + 1
+    sorted_values = sorted(set(values))
+    is_straight = len(sorted_values) >= 5 and max(sorted_values) - min(sorted_values) == 4
+    suit_counts = {}
+    for suit in suits:
+        suit_counts[suit] = suit_counts.get(suit, 0) + 1
+    is_flush = max(suit_counts.values()) >= 5
+    if is_straight and is_flush:
+        return "Royal Flush", 12
+    elif is_straight:
+        return "Straight", 5
+    elif is_flush:
+        return "Flush", 4
+    elif 4 in value_counts.values():
+        return "Four of a Kind", 8
+    elif 3 in value_counts.values() and 2 in value_counts.values():
+        return "Full House", 10
+    elif 3 in value_counts.values():
+        return "Three of a Kind", 3
+    elif list(value_counts.values()).count(2) == 2:
+        return "Two Pair", 2
+    elif 2 in value_counts.values():
+        return "Pair", 1
+    return "None", 0
 
 class TestArcaneBrawler(unittest.TestCase):
     def setUp(self):
@@ -130,6 +177,28 @@ class TestArcaneBrawler(unittest.TestCase):
         self.game_state.resolve_spell(commander, diamonds_card)
         self.assertEqual(commander.get_hand_size(), initial_hand_size + 1)
 
+    def test_effect_registry(self):
+        """Test that every archetype/suit pair has one effect for both text and behavior."""
+        for archetype in Archetype:
+            for suit in Suit:
+                self.assertIn((archetype, suit), EFFECTS)
+        self.assertEqual(get_card_effect_description(Card(Suit.CLUBS, "9"), Archetype.BERSERKER),
+                         "Take 4 damage, gain 2 Rage counters")
+        self.assertEqual(get_card_effect_description(Card(Suit.HEARTS, "5"), Archetype.BERSERKER),
+                         "Deal 5 × (1 + rage) damage | Creature (5/5)")
+
+    def test_display_cache(self):
+        """Test that formatted card text is rendered once and reused."""
+        first = format_card_display(Card(Suit.SPADES, "8"), Archetype.COMMANDER)
+        self.assertEqual(first, "8S - Buff all tokens by 4 | Creature (8/8)")
+        self.assertIs(format_card_display(Card(Suit.SPADES, "8"), Archetype.COMMANDER), first)
+        card = Card(Suit.CLUBS, "K")
+        card.tapped = True
+        self.assertEqual(format_hand_display([card], Archetype.MYSTIC),
+                         ["[0] KC - Force opponent to discard a card"])
+        self.assertEqual(format_field_display([card], Archetype.MYSTIC),
+                         ["KC - Force opponent to discard a card (Tapped: True)"])
+
     def test_poker_hand_detection(self):
         """Test poker hand detection and bonuses."""
         # Test pair
@@ -154,6 +223,27 @@ class TestArcaneBrawler(unittest.TestCase):
         self.assertEqual(hand_type, "Flush")
         self.assertEqual(bonus, 15)
 
+    def test_poker_hand_matches_reference(self):
+        """Test the table-driven evaluator against the original evaluator."""
+        rng = random.Random(7)
+        deck = Card.create_standard_deck()
+        for _ in range(500):
+            cards = [rng.choice(deck) for _ in range(rng.randint(0, 12))]
+            self.assertEqual(self.game_state.check_poker_hand(cards), legacy_check_poker_hand(cards))
+
+    def test_incremental_combo_tracking(self):
+        """Test that spells update the combo incrementally and the turn end resets it."""
+        for value in ["9", "9", "4"]:
+            self.assertEqual(self.game_state.record_played_card(Card(Suit.CLUBS, value)),
+                             legacy_check_poker_hand(self.game_state.last_played_cards))
+        self.assertEqual(self.game_state.combo.result, ("Pair", 1))
+        with self.assertRaises(AttributeError):
+            self.game_state.last_played_cards = []  # Only record/clear_played_cards change it
+        self.game_state.phase = Phase.MAIN2
+        self.game_state.advance_phase()
+        self.assertEqual(self.game_state.last_played_cards, ())
+        self.assertEqual(self.game_state.combo.result, ("None", 0))
+
     def test_combat_resolution(self):
         """Test combat resolution between cards."""
         # Create test cards
@@ -195,5 +285,381 @@ class TestArcaneBrawler(unittest.TestCase):
         self.assertEqual(self.game_state.current_player_index, 1)
         self.assertEqual(self.game_state.turn_number, 2)
 
+    def test_snapshot_restore(self):
+        """Test that snapshots restore hands, field state and counters exactly."""
+        attacker = Card(Suit.SPADES, "7")
+        attacker.tapped = True
+        attacker.health = 3
+        self.player1.field.append(attacker)
+        self.player2.rage_counters = 2
+        snapshot = self.game_state.snapshot()
+
+        self.player1.draw_cards(3)
+        self.player1.field.clear()
+        self.player2.health = 1
+        self.player2.rage_counters = 0
+        self.game_state.restore(snapshot)
+
+        self.assertEqual(self.game_state.snapshot(), snapshot)
+        self.assertEqual(self.player1.get_hand_size(), 7)
+        restored = self.player1.field[0]
+        self.assertEqual((str(restored), restored.tapped, restored.health), ("7S", True, 3))
+        self.assertEqual(self.player2.health, 20)
+        self.assertEqual(self.player2.rage_counters, 2)
+
+    def test_flyweight_cards(self):
+        """Test that copies share one definition but keep their own state."""
+        first, second = Card(Suit.HEARTS, "Q"), Card(Suit.HEARTS, "Q")
+        self.assertIs(first.definition, second.definition)
+        first.tapped = True
+        first.health = 4
+        self.assertFalse(second.tapped)
+        self.assertEqual(second.health, 10)
+        self.assertEqual((first.mana_cost, first.is_creature, str(first)), (10, True, "QH"))
+
+        drawn = self.player1.hand[0]
+        self.assertIsInstance(drawn, Card)
+        self.assertEqual(self.player1.get_deck_size(), 45)
+
+    def test_clone_is_independent(self):
+        """Test that a cloned game shares no mutable state with the original."""
+        clone = self.game_state.clone()
+        self.assertEqual(clone.snapshot(), self.game_state.snapshot())
+        clone.players[0].hand.clear()
+        clone.players[1].health = 5
+        self.assertEqual(self.player1.get_hand_size(), 7)
+        self.assertEqual(self.player2.health, 20)
+
+    def test_card_zones(self):
+        """Test hand/field membership by identity and the maintained views."""
+        self.player1.hand.clear()
+        ace, five, king = Card(Suit.CLUBS, "A"), Card(Suit.HEARTS, "5"), Card(Suit.SPADES, "K")
+        self.player1.hand.extend([king, five, ace])
+        self.assertNotIn(Card(Suit.CLUBS, "A"), self.player1.hand)
+        self.assertEqual(self.player1.hand.index(five), 1)
+        self.player1.mana = 5
+        self.assertEqual(self.player1.playable_cards(), [ace, five])
+
+        self.assertTrue(self.player1.play_card(five))
+        self.assertEqual(list(self.player1.hand), [king, ace])
+        self.assertEqual(self.player1.ready_creatures(), [five])
+        five.tapped = True
+        self.assertEqual(self.player1.ready_creatures(), [])
+        self.assertEqual(self.player1.field.creatures(), [five])
+        self.player1.end_turn()
+        self.assertEqual(self.player1.ready_creatures(), [five])
+
+        self.player1.field.remove(five)
+        five.tapped = True
+        self.assertEqual(self.player1.ready_creatures(), [])
+        with self.assertRaises(ValueError):
+            self.player1.field.remove(five)
+
+    def test_legal_actions(self):
+        """Test action enumeration and application in main and combat phases."""
+        self.game_state.phase = Phase.MAIN1
+        self.player1.hand.clear()
+        self.player1.hand.extend([Card(Suit.DIAMONDS, "9"), Card(Suit.HEARTS, "3"), Card(Suit.CLUBS, "A")])
+        self.player1.mana = 3
+        self.assertEqual(self.game_state.legal_actions(), [actions.play(1), actions.play(2), actions.END])
+        with self.assertRaises(ValueError):
+            self.game_state.apply_action(actions.play(0))
+
+        self.game_state.apply_action(actions.play(1))
+        self.assertEqual(self.player1.mana, 0)
+        self.assertEqual([str(card) for card in self.player1.field], ["3H"])
+
+        self.game_state.phase = Phase.COMBAT
+        blocker = Card(Suit.SPADES, "2")
+        self.player2.field.append(blocker)
+        self.assertEqual(self.game_state.legal_actions(),
+                         [actions.attack(0, 1), actions.attack(0, 1, 0), actions.END])
+        self.game_state.apply_action(actions.attack(0, 1, 0))
+        self.assertNotIn(blocker, self.player2.field)
+        self.assertEqual(self.game_state.legal_actions(), [actions.END])
+        self.assertEqual(actions.describe(actions.attack(3, 1, -1)), "attack 3 2 -1")
+
+    def test_action_codes_past_64_cards(self):
+        """Test that large zones don't alias actions, and that oversized indexes are rejected."""
+        self.assertNotEqual(actions.attack(64, 1), actions.attack(0, 2))
+        self.assertEqual(actions.decode(actions.attack(64, 1, 70)), (actions.ATTACK, 64, 1, 70))
+        self.assertEqual(actions.decode(actions.play(actions.MAX_INDEX)), (actions.PLAY, actions.MAX_INDEX, 0, -1))
+        for encode in (lambda: actions.play(actions.MAX_INDEX + 1), lambda: actions.play(-1),
+                       lambda: actions.attack(0, actions.MAX_SEAT + 1), lambda: actions.attack(0, 1, -2)):
+            with self.assertRaises(ValueError):
+                encode()
+
+        self.game_state.phase = Phase.COMBAT
+        self.player1.field.extend([Card(Suit.SPADES, "2") for _ in range(66)])
+        last = actions.attack(65, 1)
+        self.assertIn(last, self.game_state.legal_actions())
+        self.game_state.apply_action(last)
+        self.assertTrue(self.player1.field[65].tapped)
+        self.assertFalse(self.player1.field[1].tapped)
+
+    def test_random_self_play(self):
+        """Test that random play through legal actions always finishes cleanly."""
+        random.seed(7)
+        for _ in range(5):
+            game_state = play_game(new_game([Archetype.BERSERKER, Archetype.TRICKSTER]),
+                                   [random_policy, random_policy], max_turns=100)
+            self.assertTrue(game_state.game_over or game_state.turn_number > 100)
+
+    def test_search_agent(self):
+        """Test that the search agent finds lethal and leaves the real game untouched."""
+        self.game_state.current_player_index = 1
+        self.game_state.phase = Phase.MAIN1
+        self.player2.hand.clear()
+        self.player2.hand.extend([Card(Suit.DIAMONDS, "4"), Card(Suit.HEARTS, "5")])
+        self.player2.mana = 5
+        self.player1.health = 5
+        self.player1.name = self.player2.name  # Seats, not names, identify the agent
+        snapshot = self.game_state.snapshot()
+
+        agent = SearchAgent(self.player2, time_budget=0.05)
+        self.assertEqual(agent.choose_action(self.game_state), actions.play(1))
+        self.assertEqual(self.game_state.snapshot(), snapshot)
+        self.assertEqual(agent.seat, 1)
+
+        # The search only sees its own hand: hidden cards are resampled
+        random.seed(3)
+        players = agent._sample_hidden(snapshot, self.game_state.teams)[0]
+        real = snapshot[0]
+        self.assertEqual(players[1][8], real[1][8])
+        self.assertEqual(sorted(players[1][9]), sorted(real[1][9]))
+        self.assertNotEqual(players[1][9], real[1][9])
+        self.assertEqual(len(players[0][8]), len(real[0][8]))
+        self.assertEqual(sorted(players[0][8] + players[0][9]), sorted(real[0][8] + real[0][9]))
+        self.assertNotEqual(players[0][8], real[0][8])
+        self.assertEqual(agent.evaluate(self.game_state.clone()),
+                         SearchAgent(self.player2, seat=1).evaluate(self.game_state))
+
+    def test_turn_optimizer(self):
+        """Test that the planner respects mana and orders plays for combo value."""
+        rage_then_damage = [Card(Suit.HEARTS, "9"), Card(Suit.DIAMONDS, "2"), Card(Suit.CLUBS, "K")]
+        plan = solve(rage_then_damage, 11, Archetype.BERSERKER, TurnContext(rage=1))
+        self.assertEqual([str(card) for card in plan.cards], ["2D", "9H"])
+        self.assertLessEqual(sum(card.mana_cost for card in plan.cards), 11)
+        self.assertEqual(solve(rage_then_damage, 1, Archetype.BERSERKER).indexes, ())
+
+        self.game_state.phase = Phase.MAIN1
+        self.player1.hand.clear()
+        self.player1.hand.extend([Card(Suit.CLUBS, "3"), Card(Suit.SPADES, "9")])
+        self.player1.mana = 3
+        self.assertEqual(plan_turn(self.game_state).indexes, (0,))
+        self.assertEqual(optimizer_policy(self.game_state), actions.play(0))
+        self.assertTrue(all(effect.model for effect in EFFECTS.values()))
+
+        game_state = play_game(new_game(), [optimizer_policy, random_policy], max_turns=100)
+        self.assertTrue(game_state.game_over or game_state.turn_number > 100)
+
+    def test_lethal_detection(self):
+        """Test that a found lethal line really kills, and that no line is invented."""
+        self.game_state.current_player_index = 1
+        self.game_state.phase = Phase.MAIN1
+        self.player2.hand.clear()
+        self.player2.hand.extend([Card(Suit.HEARTS, "4"), Card(Suit.DIAMONDS, "2"), Card(Suit.SPADES, "3")])
+        self.player2.field.append(Card(Suit.SPADES, "6"))
+        self.player2.mana = 9
+        # Best line: 2D (+1 rage), 4H for 8, then 6S, 4H and 3S attack for 7 + 5 + 4
+        self.player1.health = 25
+        self.assertIsNone(find_lethal(self.game_state))
+
+        self.player1.health = 24
+        line = find_lethal(self.game_state)
+        self.assertIsNotNone(line)
+        for action in line:
+            self.game_state.apply_action(action)
+        self.assertTrue(self.game_state.game_over)
+        self.assertIs(self.game_state.winner, self.player2)
+
+    def test_token_army(self):
+        """Test army-wide buffs and protection, and token stats through snapshots."""
+        commander = Player("Commander", Archetype.COMMANDER)
+        self.game_state.players[0] = commander
+        self.game_state.resolve_spell(commander, Card(Suit.HEARTS, "2"))
+        self.game_state.clear_played_cards()
+        self.game_state.resolve_spell(commander, Card(Suit.SPADES, "7"))
+        self.assertEqual(list(commander.tokens), [(5, 5)])
+        commander.tokens.create(2)
+        self.assertEqual(commander.tokens.total_power(), 9)
+
+        self.game_state.clear_played_cards()
+        self.game_state.resolve_spell(commander, Card(Suit.CLUBS, "4"))
+        self.assertFalse(commander.tokens.damage(0, 10))
+        commander.start_turn()
+        self.assertFalse(commander.tokens.protected)
+        self.assertEqual(list(commander.tokens), [(6, 6), (3, 3), (3, 3)])
+        self.assertTrue(commander.tokens.damage(0, 6))
+        self.assertEqual(sorted(commander.tokens), [(3, 3), (3, 3)])
+
+        restored = Player.from_snapshot(commander.snapshot())
+        self.assertEqual(list(restored.tokens), list(commander.tokens))
+        self.assertEqual(restored.tokens.total_power(), 6)
+
+    def test_token_army_in_combat(self):
+        """Blocked Commander attacks get +1 per Squire, whatever their buffs, and leave the army alone."""
+        commander = Player("Commander", Archetype.COMMANDER)
+        self.game_state.players[0] = commander
+        commander.tokens.create(2)
+        commander.tokens.add_buff(1)
+        attacker, blocker = Card(Suit.HEARTS, "2"), Card(Suit.DIAMONDS, "9")
+        commander.field.append(attacker)
+        self.game_state.resolve_combat(attacker, blocker)
+        self.assertEqual(blocker.health, 9 - (2 + 2))
+        self.assertNotIn(attacker, commander.field)
+        self.assertEqual(list(commander.tokens), [(3, 3), (3, 3)])
+
+        commander.tokens.clear()
+        commander.tokens.create(1)
+        self.assertEqual(list(commander.tokens), [(2, 2)])
+
+    def test_ai_response_validation(self):
+        """Test text and JSON responses, and rejection of illegal ones."""
+        agent = AIAgent(self.game_state)
+        agent.ai_player = self.player1
+        self.game_state.phase = Phase.MAIN1
+        self.player1.hand.clear()
+        self.player1.hand.extend([Card(Suit.SPADES, "9"), Card(Suit.CLUBS, "2")])
+        self.player1.mana = 2
+
+        self.assertEqual(agent.parse_ai_response('{"action": "attack", "attacker": 0, "target": 2}'),
+                         ("attack", [0, 2, -1]))
+        self.assertEqual(agent.validate_response("Play 1"), actions.play(1))
+        self.assertEqual(agent.validate_response('I choose ```{"action": "play", "card": 1}```'),
+                         actions.play(1))
+        self.assertIsNone(agent.validate_response("play 0"))  # 9S costs 9
+        self.assertIsNone(agent.validate_response('{"action": "play"}'))
+        self.assertIsNone(agent.validate_response("attack 0 2 -1"))  # Not in combat
+        self.assertEqual(agent.choose_action("nonsense"), actions.play(1))
+        self.assertEqual(agent.parse_ai_response("End turn"), ("end", []))
+        self.assertIsNone(agent.parse_ai_response("defend"))
+
+    def test_prompt_builder_reuses_sections(self):
+        """Test that only the sections an action touches are re-rendered."""
+        agent = AIAgent(self.game_state)
+        agent.ai_player = self.player1
+        self.game_state.phase = Phase.MAIN1
+        self.player1.mana = 10
+        prompt = agent.get_ai_prompt()
+        self.assertIn("2. Player2 (Berserker) - Health: 20/20", prompt)
+        renders = agent.prompt_builder.renders
+        self.assertIs(agent.get_ai_prompt(), prompt)
+        self.assertEqual(agent.prompt_builder.renders, renders)
+
+        self.game_state.apply_action(self.game_state.legal_actions()[0])
+        agent.get_ai_prompt()
+        # status, hand, field and actions change; header and opponents don't
+        self.assertLessEqual(agent.prompt_builder.renders - renders, 4)
+
+    def test_multiplayer_table(self):
+        """Test team seating, turn rotation past eliminated seats and team victory."""
+        game_state = GameState()
+        players = [Player(f"P{seat}", Archetype.BERSERKER) for seat in range(4)]
+        for seat, player in enumerate(players):
+            game_state.add_player(player, team=seat % 2)
+        game_state.start_game()
+        self.assertEqual(game_state.get_opponents(), [players[1], players[3]])
+        self.assertEqual(game_state.seat_of(players[2]), 2)
+
+        game_state.phase = Phase.COMBAT
+        players[0].field.append(Card(Suit.HEARTS, "5"))
+        targets = {actions.decode(action)[2] for action in game_state.legal_actions()[:-1]}
+        self.assertEqual(targets, {1, 3})
+
+        players[1].health = 0
+        self.assertFalse(game_state.check_game_over())
+        self.assertEqual(game_state.get_opponent(), players[3])
+        game_state.phase = Phase.MAIN2
+        game_state.advance_phase()
+        self.assertEqual(game_state.current_player_index, 2)  # Seat 1 is out
+
+        players[3].health = 0
+        self.assertTrue(game_state.check_game_over())
+        self.assertEqual(game_state.winner, players[0])
+        with self.assertRaises(ValueError):
+            for seat in range(5):
+                game_state.add_player(Player(f"Extra{seat}", Archetype.MYSTIC))
+
+class TestGameServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = GameServer(workers=1)
+        self.port = await self.server.start(port=0)
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_table_with_ai_seat(self):
+        """Test that actions are validated, diffs pushed and AI turns played by the pool."""
+        connection = await Connection.open("127.0.0.1", self.port)
+        try:
+            table = (await connection.request({'op': 'create', 'archetypes': ["Berserker", "Mystic"],
+                                               'ai': [1]}))['table']
+            joined = await connection.request({'op': 'join', 'table': table, 'seat': 0})
+            self.assertIn('p0.hand', joined['state'])
+            self.assertNotIn('p1.hand', joined['state'])
+            self.assertEqual(joined['state']['legal'], [actions.END])  # Beginning phase
+
+            rejected = await connection.request({'op': 'act', 'table': table, 'action': actions.play(40)})
+            self.assertEqual(rejected['op'], 'error')
+            taken = await connection.request({'op': 'join', 'table': table, 'seat': 1})
+            self.assertEqual(taken['op'], 'error')
+
+            while connection.views[table]['current'] == 0:
+                reply = await connection.request({'op': 'act', 'table': table, 'action': actions.END})
+                self.assertEqual(reply['op'], 'ack')
+            view = await asyncio.wait_for(connection.wait_for_turn(table), timeout=10)
+            self.assertEqual(view['current'], 0)
+            self.assertEqual(view['turn'], 3)  # The AI played its whole turn
+        finally:
+            await connection.close()
+
+    async def test_tables_close_with_their_clients(self):
+        """Test that all-AI tables are refused and a table closes when its creator disconnects."""
+        connection = await Connection.open("127.0.0.1", self.port)
+        refused = await connection.request({'op': 'create', 'archetypes': ["Berserker", "Mystic"],
+                                            'ai': [0, 1]})
+        self.assertEqual(refused['op'], 'error')
+        table = (await connection.request({'op': 'create', 'archetypes': ["Berserker", "Mystic"],
+                                           'ai': [1]}))['table']
+        self.assertIn(table, self.server.tables)
+        await connection.close()
+        for _ in range(100):
+            if table not in self.server.tables:
+                break
+            await asyncio.sleep(0.01)
+        self.assertNotIn(table, self.server.tables)
+
+    async def test_ai_survives_a_failed_worker_pool(self):
+        """Test that AI turns fall back to a local search when the pool fails."""
+        class BrokenExecutor(Executor):
+            def submit(self, fn, *args, **kwargs):
+                raise RuntimeError("pool is broken")
+
+        await self.server.close()
+        self.server = GameServer(executor=BrokenExecutor())
+        self.port = await self.server.start(port=0)
+        connection = await Connection.open("127.0.0.1", self.port)
+        try:
+            mismatched = await connection.request({'op': 'create', 'archetypes': ["Berserker", "Mystic"],
+                                                   'teams': [0]})
+            self.assertEqual(mismatched['op'], 'error')
+            table = (await connection.request({'op': 'create', 'archetypes': ["Berserker", "Mystic"],
+                                               'ai': [1]}))['table']
+            await connection.request({'op': 'join', 'table': table, 'seat': 0})
+            with self.assertLogs('server', 'ERROR'):
+                while connection.views[table]['current'] == 0:
+                    await connection.request({'op': 'act', 'table': table, 'action': actions.END})
+                view = await asyncio.wait_for(connection.wait_for_turn(table), timeout=10)
+            self.assertEqual(view['turn'], 3)
+        finally:
+            await connection.close()
+
+    async def test_load_client(self):
+        """Test that concurrent clients all get their actions acknowledged."""
+        stats = await run_load("127.0.0.1", self.port, clients=5, actions=20)
+        self.assertEqual(stats.actions, 100)
+        self.assertLessEqual(stats.p50, stats.p99)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,91 @@
+from array import array
+from typing import Iterator, Tuple
+
+# Squire tokens are 2/2 when created.
+SQUIRE_STATS = (2, 2)
+
+class TokenArmy:
+    """A player's tokens: base stats in flat arrays plus army-wide offsets.
+
+    "+N to all tokens" only moves `buff`, so it is O(1) however large the army
+    is. Stats are stored relative to the buff in effect when each token was
+    created, so later tokens don't inherit earlier buffs; effective stats are
+    computed on demand. `protected` shields every token from damage until the
+    owner's next turn.
+    """
+    __slots__ = ('_power', '_toughness', '_power_sum', 'buff', 'protected')
+
+    def __init__(self):
+        self._power = array('l')
+        self._toughness = array('l')
+        self._power_sum = 0  # Sum of stored (pre-buff) power
+        self.buff = 0
+        self.protected = False
+
+    def create(self, count: int = 1, stats: Tuple[int, int] = SQUIRE_STATS) -> None:
+        """Add `count` tokens with the given (power, toughness)."""
+        power, toughness = stats[0] - self.buff, stats[1] - self.buff
+        self._power.extend([power] * count)
+        self._toughness.extend([toughness] * count)
+        self._power_sum += power * count
+
+    def add_buff(self, amount: int) -> None:
+        """+amount/+amount to every token currently in the army."""
+        self.buff += amount
+
+    def power(self, index: int) -> int:
+        return self._power[index] + self.buff
+
+    def toughness(self, index: int) -> int:
+        return self._toughness[index] + self.buff
+
+    def total_power(self) -> int:
+        """Combined effective power of the army, O(1)."""
+        return self._power_sum + self.buff * len(self._power)
+
+    def damage(self, index: int, amount: int) -> bool:
+        """Deal damage to one token; returns True if it was destroyed (and removed)."""
+        if self.protected:
+            return False
+        self._toughness[index] -= amount
+        if self._toughness[index] + self.buff > 0:
+            return False
+        self.remove(index)
+        return True
+
+    def remove(self, index: int) -> None:
+        """Destroy a token. Order carries no meaning, so the last one takes its slot."""
+        self._power_sum -= self._power[index]
+        last_power, last_toughness = self._power.pop(), self._toughness.pop()
+        if index < len(self._power):
+            self._power[index], self._toughness[index] = last_power, last_toughness
+
+    def clear(self) -> None:
+        del self._power[:], self._toughness[:]
+        self._power_sum = 0
+        self.buff = 0
+
+    def pack(self) -> tuple:
+        """Snapshot as plain tuples (see Player.snapshot)."""
+        return (self.buff, self.protected, tuple(self._power), tuple(self._toughness))
+
+    @classmethod
+    def unpack(cls, packed: tuple) -> 'TokenArmy':
+        army = cls()
+        army.buff, army.protected, power, toughness = packed
+        army._power.extend(power)
+        army._toughness.extend(toughness)
+        army._power_sum = sum(power)
+        return army
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        """Effective (power, toughness) of each token."""
+        buff = self.buff
+        for power, toughness in zip(self._power, self._toughness):
+            yield power + buff, toughness + buff
+
+    def __len__(self) -> int:
+        return len(self._power)
+
+    def __repr__(self) -> str:
+        return f"TokenArmy({len(self)} tokens, buff +{self.buff}{', protected' if self.protected else ''})"
@@ -0,0 +1,132 @@
+"""Mana-constrained turn planning: which cards to play, and in which order.
+
+Choosing plays under a mana budget is a knapsack problem whose item values
+change with order (each spell's combo bonus comes from every card played so
+far this turn, and Rage, tokens or stolen mana feed later spells). `solve`
+runs a memoized search over (cards used bitmask, remaining mana, tracked
+counters); the combo for a bitmask is built incrementally from its parent's.
+What each spell is worth comes from the model registered next to its
+handler in card_lookup (see card_lookup.model).
+"""
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple
+
+import actions
+from card import Card
+from card_lookup import EFFECTS
+from game_state import GameState, Phase
+from player import Archetype
+from poker_hand import ComboTracker
+
+class TurnContext(NamedTuple):
+    """The parts of the table that change what a spell is worth."""
+    health: int = 20
+    max_health: int = 20
+    opponent_health: int = 20
+    opponent_mana: int = 0
+    rage: int = 0
+    tokens: int = 0
+
+class TurnPlan(NamedTuple):
+    """Cards to play in order (and their hand indexes) and the plan's score."""
+    indexes: Tuple[int, ...]
+    cards: Tuple[Card, ...]
+    score: float
+
+# Evaluation weights, in rough life-point equivalents per unit.
+DEFAULT_WEIGHTS: Dict[str, float] = {
+    'damage': 1.0,        # to the opponent
+    'healing': 0.8,       # effective (capped at max health)
+    'self_damage': -1.0,
+    'growth': 1.5,        # Growth Tokens (+1 mana each turn)
+    'max_mana': 1.5,
+    'rage': 2.0,
+    'cards': 1.0,         # drawn or stolen
+    'discard': 0.8,       # cards the opponent discards
+    'mana': 0.3,          # mana stolen (on top of what it lets us play)
+    'spell_counters': 0.5,
+    'tap': 0.5,
+    'tokens': 1.5,
+    'token_buff': 0.5,    # per point per token
+    'board': 0.25,        # per point of creature power left on the field
+}
+
+# State threaded through the search (see card_lookup.model)
+_State = Tuple[int, int, int, int, bool]
+
+def solve(hand: Sequence[Card], mana: int, archetype: Archetype,
+          context: TurnContext = TurnContext(), played: Sequence[Card] = (),
+          weights: Optional[Dict[str, float]] = None) -> TurnPlan:
+    """Best play sequence for `hand` with `mana` to spend.
+
+    `played` are cards already played this turn (they count toward combos);
+    `weights` overrides entries of DEFAULT_WEIGHTS.
+    """
+    if weights:
+        weights = {**DEFAULT_WEIGHTS, **weights}
+    else:
+        weights = DEFAULT_WEIGHTS
+    hand = list(hand)
+    models = [EFFECTS[(archetype, card.suit)].model for card in hand]
+    costs = [card.mana_cost for card in hand]
+    board = [weights['board'] * card.face_value() if card.is_creature else 0.0 for card in hand]
+    combos: Dict[int, ComboTracker] = {0: ComboTracker(played)}
+    memo: Dict[Tuple[int, int, _State], Tuple[float, Tuple[int, ...]]] = {}
+
+    def combo(mask: int, index: int) -> Tuple[str, int]:
+        child = mask | (1 << index)
+        tracker = combos.get(child)
+        if tracker is None:
+            tracker = combos[mask].copy()
+            tracker.add(hand[index])
+            combos[child] = tracker
+        return tracker.result
+
+    def best(mask: int, mana_left: int, state: _State) -> Tuple[float, Tuple[int, ...]]:
+        key = (mask, mana_left, state)
+        cached = memo.get(key)
+        if cached is not None:
+            return cached
+        result = (0.0, ())
+        for index in range(len(hand)):
+            if mask & (1 << index) or costs[index] > mana_left:
+                continue
+            hand_type, bonus = combo(mask, index)
+            gains, next_state, mana_gained = models[index](hand[index].face_value(), bonus,
+                                                           hand_type, context, state)
+            value = board[index] + sum(weights[name] * amount for name, amount in gains.items())
+            rest_score, rest = best(mask | (1 << index), mana_left - costs[index] + mana_gained, next_state)
+            if value + rest_score > result[0]:
+                result = (value + rest_score, (index,) + rest)
+        memo[key] = result
+        return result
+
+    score, indexes = best(0, mana, (context.health, context.rage, context.tokens,
+                                    context.opponent_mana, False))
+    return TurnPlan(indexes, tuple(hand[index] for index in indexes), score)
+
+def context_for(game_state: GameState) -> TurnContext:
+    """TurnContext for the current player."""
+    player, opponent = game_state.get_current_player(), game_state.get_opponent()
+    return TurnContext(player.health, player.max_health, opponent.health, opponent.mana,
+                       player.rage_counters, len(player.tokens))
+
+def plan_turn(game_state: GameState, weights: Optional[Dict[str, float]] = None) -> TurnPlan:
+    """Best play sequence for the current player's hand and mana."""
+    player = game_state.get_current_player()
+    return solve(player.hand, player.mana, player.archetype, context_for(game_state),
+                 game_state.last_played_cards, weights)
+
+def optimizer_policy(game_state: GameState) -> int:
+    """Simulator/agent policy: play the first card of the best plan, then end the phase.
+
+    In combat it takes the first legal attack, so creatures swing once each.
+    """
+    if game_state.phase in (Phase.MAIN1, Phase.MAIN2):
+        plan = plan_turn(game_state)
+        if plan.indexes:
+            return actions.play(plan.indexes[0])
+    elif game_state.phase == Phase.COMBAT:
+        for action in game_state.legal_actions():
+            if actions.decode(action)[0] == actions.ATTACK:
+                return action
+    return actions.END
@@ -0,0 +1,146 @@
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from card import Card
+
+# Mana costs run 0 (Aces) to 10 (face cards).
+_MAX_COST = 10
+
+class CardZone:
+    """An ordered card container (hand or field) keyed by each card's stable uid.
+
+    Behaves like the list it replaces (append/remove/pop/index/slicing/iteration),
+    but membership and removal are O(1), and these views are maintained as cards
+    come and go instead of being rebuilt by scanning:
+
+    - `affordable(mana)`: cards bucketed by mana cost;
+    - `creatures()`: every creature in the zone (potential blockers);
+    - `untapped_creatures()`: creatures ready to attack or block.
+
+    The creature views are only kept for zones created with `track_tapped=True`
+    (fields); such zones claim their cards' `zone` hook so that tapping and
+    untapping keep the untapped view current.
+    """
+    __slots__ = ('_cards', '_order', '_positions', '_by_cost', '_creatures', '_untapped', 'track_tapped')
+
+    def __init__(self, cards: Iterable[Card] = (), track_tapped: bool = False):
+        self._cards: Dict[int, Card] = {}  # uid -> card, in insertion order
+        self._order: Optional[List[Card]] = None  # positional cache, rebuilt lazily
+        self._positions: Optional[Dict[int, int]] = None
+        self._by_cost: Dict[int, Dict[int, Card]] = {}  # mana cost -> uid -> card
+        self._creatures: Dict[int, Card] = {}
+        self._untapped: Dict[int, Card] = {}
+        self.track_tapped = track_tapped
+        for card in cards:
+            self.append(card)
+
+    def append(self, card: Card) -> None:
+        uid = card.uid
+        if uid in self._cards:
+            raise ValueError(f"{card} is already in this zone")
+        self._cards[uid] = card
+        bucket = self._by_cost.get(card.definition.mana_cost)
+        if bucket is None:
+            self._by_cost[card.definition.mana_cost] = {uid: card}
+        else:
+            bucket[uid] = card
+        if self.track_tapped:
+            card.zone = self
+            if card.definition.is_creature:
+                self._creatures[uid] = card
+                if not card._tapped:
+                    self._untapped[uid] = card
+        self._order = self._positions = None
+
+    def extend(self, cards: Iterable[Card]) -> None:
+        for card in cards:
+            self.append(card)
+
+    def remove(self, card: Card) -> None:
+        uid = card.uid
+        if self._cards.get(uid) is not card:
+            raise ValueError(f"{card} is not in this zone")
+        del self._cards[uid]
+        del self._by_cost[card.definition.mana_cost][uid]
+        if self.track_tapped:
+            self._creatures.pop(uid, None)
+            self._untapped.pop(uid, None)
+            if card.zone is self:
+                card.zone = None
+        self._order = self._positions = None
+
+    def pop(self, index: int = -1) -> Card:
+        card = self[index]
+        self.remove(card)
+        return card
+
+    def clear(self) -> None:
+        for card in self._cards.values():
+            if card.zone is self:
+                card.zone = None
+        self._cards.clear()
+        self._by_cost.clear()
+        self._creatures.clear()
+        self._untapped.clear()
+        self._order = self._positions = None
+
+    def index(self, card: Card) -> int:
+        """Position of `card` (as shown in hand/field listings)."""
+        if self._cards.get(card.uid) is not card:
+            raise ValueError(f"{card} is not in this zone")
+        if self._positions is None:
+            self._positions = {uid: i for i, uid in enumerate(self._cards)}
+        return self._positions[card.uid]
+
+    def on_tapped(self, card: Card) -> None:
+        """Card hook: keep the untapped-creatures view in sync with `card.tapped`."""
+        if card._tapped:
+            self._untapped.pop(card.uid, None)
+        elif card.definition.is_creature and card.uid in self._cards:
+            self._untapped[card.uid] = card
+
+    def creatures(self) -> List[Card]:
+        """Every creature in the zone, in the order they entered it."""
+        return list(self._creatures.values())
+
+    def untapped_creatures(self) -> List[Card]:
+        """Creatures that can attack or block, in the order they became ready."""
+        return list(self._untapped.values())
+
+    def affordable(self, mana: int) -> List[Card]:
+        """Cards whose mana cost is at most `mana`, cheapest first."""
+        cards: List[Card] = []
+        by_cost = self._by_cost
+        for cost in range(min(mana, _MAX_COST) + 1):
+            bucket = by_cost.get(cost)
+            if bucket:
+                cards.extend(bucket.values())
+        return cards
+
+    def _cards_in_order(self) -> List[Card]:
+        if self._order is None:
+            self._order = list(self._cards.values())
+        return self._order
+
+    def __getitem__(self, index):
+        return self._cards_in_order()[index]
+
+    def __contains__(self, card: Card) -> bool:
+        return self._cards.get(card.uid) is card
+
+    def __iter__(self) -> Iterator[Card]:
+        return iter(self._cards_in_order())
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CardZone):
+            return self._cards_in_order() == other._cards_in_order()
+        if isinstance(other, list):
+            return self._cards_in_order() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"CardZone({self._cards_in_order()!r})"
@@ -0,0 +1,135 @@
+"""Micro-benchmarks for the BirdsOfPray engine.
+
+Run from src/: python -m BirdsOfPray.benchmarks
+"""
+import random
+import timeit
+
+from BirdsOfPray.main import Board, Unit, get_points_on_line
+from BirdsOfPray.map_generator import PIECE_COUNTS, generate_map
+
+
+def make_board(seed=0):
+    """A board with the usual terrain mix and a few units per side."""
+    rng = random.Random(seed)
+    board = Board()
+    cells = [(x, y) for x in range(board.width) for y in range(1, board.height - 1)]
+    rng.shuffle(cells)
+    for code, count in (('2', 4), ('3', 4), ('4', 2)):
+        for _ in range(count):
+            board.place_object(code, cells.pop())
+    for owner, codes in ((1, ['AC', 'KC', 'QD', 'JS']), (2, ['AH', 'KD', 'QC', 'JH'])):
+        for code in codes:
+            pos = cells.pop()
+            board.place_object(Unit(code, owner, pos), pos)
+    return board
+
+
+def bench_board(number=20000):
+    """Square lookups and per-player unit queries."""
+    board = make_board()
+    positions = [(x, y) for x in range(board.width) for y in range(board.height)]
+
+    def lookups():
+        get_at_pos = board.get_at_pos
+        for pos in positions:
+            get_at_pos(pos)
+
+    lookup = timeit.timeit(lookups, number=number // 100) / (number // 100) / len(positions)
+    units = timeit.timeit(lambda: board.get_units_for_player(1), number=number) / number
+    print(f"board: get_at_pos {lookup * 1e9:.0f} ns | get_units_for_player {units * 1e6:.2f} us")
+
+def bench_line_of_sight(number=20):
+    """Every (from, to) LoS query on a board: walking the line vs the bitmask table."""
+    board = make_board()
+    squares = [(x, y) for x in range(board.width) for y in range(board.height)]
+    pairs = [(a, b) for a in squares for b in squares]
+
+    def walk():
+        # The previous implementation: build the line, look at each square on it
+        for pos1, pos2 in pairs:
+            all(board.get_at_pos(p) != '3' for p in get_points_on_line(pos1, pos2) - {pos1, pos2})
+
+    def table():
+        has_line_of_sight = board.has_line_of_sight
+        for pos1, pos2 in pairs:
+            has_line_of_sight(pos1, pos2)
+
+    old = timeit.timeit(walk, number=number) / number / len(pairs)
+    new = timeit.timeit(table, number=number) / number / len(pairs)
+    visible = timeit.timeit(lambda: board.visible_targets((4, 8), 2), number=number * 100) / (number * 100)
+    print(f"line of sight: walk {old * 1e9:.0f} ns | table {new * 1e9:.0f} ns | {old / new:.1f}x faster; "
+          f"visible_targets {visible * 1e6:.2f} us")
+
+
+def bench_movement(number=5000):
+    """Reachable squares for every unit: BFS from scratch vs the cached field."""
+    board = make_board()
+    units = board.get_units_for_player(1) + board.get_units_for_player(2)
+
+    def cold():
+        board.version += 1 # Invalidate, as a board change would
+        for unit in units:
+            board.reachable_squares(unit)
+
+    def warm():
+        for unit in units:
+            board.reachable_squares(unit)
+
+    old = timeit.timeit(cold, number=number) / number / len(units)
+    new = timeit.timeit(warm, number=number) / number / len(units)
+    print(f"movement: BFS {old * 1e6:.2f} us | cached {new * 1e6:.2f} us per unit")
+
+
+def bench_threats(number=2000):
+    """Keeping an enemy threat map current after a move: rebuild vs incremental update."""
+    board = make_board()
+    threats = board.threat_map(2)
+    unit = board.get_units_for_player(2)[0]
+
+    rebuild = timeit.timeit(threats.rebuild, number=number) / number
+    update = timeit.timeit(lambda: threats.update(unit), number=number) / number
+    moves = timeit.timeit(lambda: board.evaluate_moves(board.get_units_for_player(1)[1]), number=number) / number
+    print(f"threat map: rebuild {rebuild * 1e6:.1f} us | per-unit update {update * 1e6:.1f} us; "
+          f"evaluate_moves {moves * 1e6:.1f} us")
+
+
+def bench_units(number=20000):
+    """Creating units from shared templates, cloning them, and cached stat lookups."""
+    unit = Unit('KC', 1, (0, 0))
+    create = timeit.timeit(lambda: Unit('KC', 1, (0, 0)), number=number) / number
+    clone = timeit.timeit(unit.clone, number=number) / number
+    stat = timeit.timeit(lambda: unit.get_stat('attack'), number=number) / number
+    print(f"units: create {create * 1e6:.2f} us | clone {clone * 1e6:.2f} us | get_stat {stat * 1e9:.0f} ns")
+
+
+def bench_maps(number=2000):
+    """Setup layouts: rejection sampling on a Board (the previous setup_game) vs the generator."""
+    rng = random.Random(0)
+
+    def rejection():
+        board = Board()
+        for code, count in PIECE_COUNTS.items():
+            placed, attempts = 0, 0
+            while placed < count and attempts < board.width * board.height * 2:
+                pos = (rng.randint(0, board.width - 1), rng.randint(1, board.height - 2))
+                attempts += 1
+                if board.get_at_pos(pos) is not None:
+                    continue
+                if code == '3' and any(board.get_at_pos((pos[0] + dx, pos[1] + dy)) in ['2', '3']
+                                       for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy):
+                    continue
+                board.place_object(code, pos)
+                placed += 1
+
+    old = timeit.timeit(rejection, number=number // 10) / (number // 10)
+    new = timeit.timeit(lambda: generate_map(rng), number=number) / number
+    print(f"maps: rejection sampling {1 / old:.0f} maps/s | generator {1 / new:.0f} maps/s")
+
+if __name__ == "__main__":
+    bench_board()
+    bench_line_of_sight()
+    bench_movement()
+    bench_threats()
+    bench_units()
+    bench_maps()
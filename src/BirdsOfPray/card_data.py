@@ -1,3 +1,6 @@
+from dataclasses import dataclass, fields
+from typing import Optional, Tuple
+
 # --- Game Constants ---
 
 GRID_SIZE = (9, 9)  # Width, Height
@@ -8,6 +11,12 @@ STARTING_FOOD = 2
 BASE_FOOD_INCOME = 1  # Food gained at the start of each turn automatically
 SUIT_RESOURCE_VALUE = 1 # Food generated by playing a 5-10 card for its suit
 
+# --- Victory Points (decide the game if no Champion falls in MAX_ROUNDS) ---
+VP_PER_UNIT_DEFEATED = 2 # For each enemy unit defeated in combat
+VP_PER_CENTER_SQUARE = 1 # For each center square you hold at the end of your turn
+CENTER_SIZE = 3 # The center is the middle CENTER_SIZE x CENTER_SIZE squares
+FOOD_PER_VP = 3 # Unspent Food at the end of the game is worth 1 VP per FOOD_PER_VP
+
 # --- Terrain & Resource Cache Definitions ---
 
 TERRAIN_EFFECTS = {
@@ -199,18 +208,157 @@ CARD_DATA = {
         ]
     },
 
-    # --- Numbered Cards (5-10) ---
-    # These don't have stats in the same way. Their primary function is defined
-    # by SUIT_RESOURCE_VALUE. We don't need individual entries unless they
-    # gain unique secondary effects later. For now, the game logic will just
-    # check the suit and rank (5-10) when played as a resource.
-
 } # End of CARD_DATA
 
+# --- Numbered Cards (5-10) ---
+# These don't have stats. Their function is defined by SUIT_RESOURCE_VALUE:
+# they are played from hand for Food. Entries are generated so every card in
+# the deck has a record; the rank of the 10 is 'T', as in its card code.
+
+SUITS = {'C': 'Clubs', 'H': 'Hearts', 'D': 'Diamonds', 'S': 'Spades'}
+RESOURCE_RANKS = {'5': "Five", '6': "Six", '7': "Seven", '8': "Eight", '9': "Nine", 'T': "Ten"}
+
+for _rank, _rank_name in RESOURCE_RANKS.items():
+    for _initial, _suit in SUITS.items():
+        CARD_DATA[_rank + _initial] = {
+            'name': f"{_rank_name} of {_suit}",
+            'suit': _suit, 'rank': _rank, 'type': 'Resource',
+            'food': SUIT_RESOURCE_VALUE,
+        }
+
+# --- Auras ---
+# Passive abilities that change the stats of nearby friendly units:
+# ability name -> the stat, the bonus, the range (squares) and the suit it affects.
+AURAS = {
+    "Commander's Presence": {'stat': 'attack', 'amount': 1, 'range': 2, 'suit': 'Clubs'},
+}
+
+# --- Compiled Card Records ---
+# CARD_DATA is compiled once, at import, into immutable records: a UnitTemplate
+# per Champion/Unit card (shared by every Unit of that card, so creating or
+# cloning a unit copies nothing) and a ResourceCard per numbered card. Hot code
+# reads attributes (CARDS[code].type); records also answer record['name'] /
+# record.get('range'), like the dicts they replace.
+
+class _Record:
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        value = getattr(self, key, None)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        value = getattr(self, key, None)
+        return default if value is None else value
+
+    def __contains__(self, key):
+        return getattr(self, key, None) is not None
+
+    def items(self):
+        return [(field.name, getattr(self, field.name)) for field in fields(self)]
+
+@dataclass(frozen=True, slots=True)
+class Ability(_Record):
+    name: str
+    cost: str # 'Passive', '1 AP', '2 AP'
+    description: str
+    range: Optional[int] = None
+    ap_cost: int = 0 # Parsed from `cost`; 0 for passives
+
+    @property
+    def passive(self):
+        return self.cost == 'Passive'
+
+@dataclass(frozen=True, slots=True)
+class UnitTemplate(_Record):
+    code: str
+    name: str
+    suit: str
+    rank: str
+    type: str
+    cost: int
+    hp: int
+    attack: int
+    defense: int
+    movement: int
+    range: int
+    abilities: Tuple[Ability, ...] = ()
+    damage: Optional[int] = None # Absent for every card so far: damage equals attack
+    active_abilities: Tuple[Ability, ...] = () # The abilities that cost AP
+    ability_names: frozenset = frozenset()
+
+    @property
+    def damage_stat(self):
+        """The stat an attack's damage is read from: 'damage' if the card has one, else 'attack'."""
+        return 'attack' if self.damage is None else 'damage'
+
+    def has_ability(self, name):
+        return name in self.ability_names
+
+@dataclass(frozen=True, slots=True)
+class ResourceCard(_Record):
+    code: str
+    name: str
+    suit: str
+    rank: str
+    type: str # 'Resource'
+    food: int
+
+UNIT_STATS = ('cost', 'hp', 'attack', 'defense', 'movement', 'range')
+
+def parse_ap_cost(cost):
+    """'2 AP' -> 2; 'Passive' -> 0."""
+    if cost == 'Passive':
+        return 0
+    amount, unit = cost.split(' ')
+    if unit != 'AP' or not amount.isdigit():
+        raise ValueError(f"Unrecognised ability cost: {cost!r}")
+    return int(amount)
+
+def _compile_card(code, data):
+    if data['type'] == 'Resource':
+        return ResourceCard(code=code, **data)
+    missing = [stat for stat in UNIT_STATS if not isinstance(data.get(stat), int)]
+    if missing:
+        raise ValueError(f"Card {code} is missing stats: {', '.join(missing)}")
+    if 'damage' in data and not isinstance(data['damage'], int):
+        raise ValueError(f"Card {code} has a non-integer damage stat: {data['damage']!r}")
+    abilities = tuple(Ability(ap_cost=parse_ap_cost(ability['cost']), **ability)
+                      for ability in data.get('abilities', []))
+    stats = {key: value for key, value in data.items() if key != 'abilities'}
+    return UnitTemplate(code=code, abilities=abilities,
+                        active_abilities=tuple(ability for ability in abilities if not ability.passive),
+                        ability_names=frozenset(ability.name for ability in abilities), **stats)
+
+def _index(attribute):
+    index = {}
+    for code, card in CARDS.items():
+        index.setdefault(getattr(card, attribute), []).append(code)
+    return {key: tuple(codes) for key, codes in index.items()}
+
+CARDS = {code: _compile_card(code, data) for code, data in CARD_DATA.items()} # code -> record
+UNIT_TEMPLATES = {code: card for code, card in CARDS.items() if isinstance(card, UnitTemplate)}
+
+# Card codes by attribute, e.g. BY_TYPE['Resource'], BY_SUIT['Clubs'], BY_ABILITY['Flying']
+BY_SUIT = _index('suit')
+BY_RANK = _index('rank')
+BY_TYPE = _index('type')
+BY_ABILITY = {}
+for _code, _template in UNIT_TEMPLATES.items():
+    for _name in _template.ability_names:
+        BY_ABILITY.setdefault(_name, ())
+        BY_ABILITY[_name] += (_code,)
+
+def get_template(card_code):
+    """The shared UnitTemplate for a Champion/Unit card code (None for any other code)."""
+    return UNIT_TEMPLATES.get(card_code)
+
 # --- Helper function (optional, but can be useful) ---
 def get_card_data(card_code):
-    """Retrieves data for a specific card code."""
-    return CARD_DATA.get(card_code, None)
+    """Retrieves the compiled record for a specific card code."""
+    return CARDS.get(card_code, None)
 
 # Example Usage (if run directly)
 if __name__ == "__main__":
@@ -278,6 +426,6 @@ Stats: Tried to align stats with the faction roles (Clubs = high Atk/HP, Hearts
 
 Abilities: Implemented core concepts from the rules (Healing, Food Gen, Ranged Attacks, Cover interaction, Necromancy, Buffs, Movement tricks). Passive abilities are noted. Action Point costs are specified for activated abilities.
 
-Numbered Cards (5-10): Explicitly noted that these don't need individual entries yet. Their function is primarily handled by the SUIT_RESOURCE_VALUE constant.
+Numbered Cards (5-10): Generated 'Resource' entries with no stats. Their function is handled by the SUIT_RESOURCE_VALUE constant.
 
 """
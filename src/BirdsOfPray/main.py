@@ -2,8 +2,15 @@
 
 import random
 import math
-from copy import deepcopy
+from collections.abc import Mapping
+from dataclasses import dataclass
 import BirdsOfPray.card_data as card_data # Import our card definitions and constants
+import BirdsOfPray.map_generator as map_generator
+
+try:
+    import numpy as np # Optional: vectorizes whole-board queries in Board
+except ImportError:
+    np = None
 
 # --- Helper Functions ---
 
@@ -16,6 +23,10 @@ def get_distance(pos1, pos2):
     """Calculates Manhattan distance between two points (tuples)."""
     return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
 
+def hit_chance(attack, defense):
+    """Chance that a d6 + attack meets defense."""
+    return max(0, min(6, 7 - (defense - attack))) / 6
+
 def get_points_on_line(pos1, pos2):
     """Very basic line generation (includes endpoints). Not perfect for LoS."""
     points = set()
@@ -40,26 +51,129 @@ def get_points_on_line(pos1, pos2):
             y1 += sy
     return points
 
+_LOS_TABLES = {} # {(width, height): [between-cells bitmask for from * cells + to]}
+
+def get_los_table(width, height):
+    """For every (from, to) cell pair on a board this size, a bitmask of the cells
+    strictly between them on the get_points_on_line path. Built once per size."""
+    table = _LOS_TABLES.get((width, height))
+    if table is None:
+        cells = width * height
+        table = [0] * (cells * cells)
+        for a in range(cells):
+            pos1 = (a % width, a // width)
+            for b in range(cells):
+                pos2 = (b % width, b // width)
+                mask = 0
+                for x, y in get_points_on_line(pos1, pos2) - {pos1, pos2}:
+                    mask |= 1 << (y * width + x)
+                table[a * cells + b] = mask
+        _LOS_TABLES[(width, height)] = table
+    return table
+
+_NEIGHBOUR_TABLES = {} # {(width, height): [orthogonal neighbour cells of each cell]}
+
+def get_neighbour_table(width, height):
+    table = _NEIGHBOUR_TABLES.get((width, height))
+    if table is None:
+        table = []
+        for i in range(width * height):
+            x, y = i % width, i // width
+            table.append(tuple(ny * width + nx for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))
+                               if 0 <= nx < width and 0 <= ny < height))
+        _NEIGHBOUR_TABLES[(width, height)] = table
+    return table
+
 # --- Game Classes ---
 
+@dataclass(frozen=True, slots=True)
+class Modifier:
+    """A change to one of a unit's stats, e.g. Sanctuary's +2 Defense."""
+    stat: str
+    amount: int
+    source: str # Name of the ability or effect that applied it
+    until_next_turn: bool = False # Expires at the start of the owner's next turn
+
 class Unit:
-    """Represents a unit on the board."""
-    def __init__(self, card_code, owner_id, position):
-        self.base_data = deepcopy(card_data.get_card_data(card_code))
+    """Represents a unit on the board.
+
+    Card stats come from the card's shared, immutable card_data.UnitTemplate
+    (`base_data`). Per-unit changes are Modifiers, plus aura bonuses the Board
+    sets from nearby friendly units; effective stats are cached until either changes.
+    """
+    __slots__ = ('base_data', 'card_code', 'owner_id', 'unit_id', 'position', 'current_hp',
+                 'activated_this_turn', 'can_attack_this_activation', 'ap', 'squares_moved',
+                 'modifiers', 'auras', 'board', '_stats')
+
+    def __init__(self, card_code, owner_id, position, unit_id=None):
+        self.base_data = card_data.get_template(card_code)
         if not self.base_data:
             raise ValueError(f"Invalid card code for Unit: {card_code}")
 
         self.card_code = card_code
         self.owner_id = owner_id
+        self.unit_id = unit_id # 'u1', 'u2', ... - assigned by the Board when placed if not given
         self.position = position # (x, y) tuple
         self.current_hp = self.base_data['hp']
         self.activated_this_turn = False
         self.can_attack_this_activation = True # Usually true, some abilities might disable
         self.ap = 0 # Action points for current activation
+        self.squares_moved = 0 # Squares moved this activation (Devastating Charge)
+        self.modifiers = [] # Modifier objects
+        self.auras = {} # {stat: bonus} from friendly auras, kept up to date by the Board
+        self.board = None # The Board this unit is on, told when its stats change
+        self._stats = {} # Effective stat cache
 
     def get_stat(self, stat_name):
-        # Placeholder for future buffs/debuffs
-        return self.base_data.get(stat_name, 0)
+        value = self._stats.get(stat_name)
+        if value is None:
+            value = self.base_data.get(stat_name, 0) + self.auras.get(stat_name, 0)
+            for modifier in self.modifiers:
+                if modifier.stat == stat_name:
+                    value += modifier.amount
+            self._stats[stat_name] = value
+        return value
+
+    def _stats_changed(self):
+        self._stats = {}
+        if self.board is not None:
+            self.board.on_stats_changed(self)
+
+    def add_modifier(self, modifier):
+        self.modifiers.append(modifier)
+        self._stats_changed()
+
+    def remove_modifiers(self, source):
+        """Remove every modifier applied by `source`; True if there were any."""
+        kept = [modifier for modifier in self.modifiers if modifier.source != source]
+        if len(kept) == len(self.modifiers):
+            return False
+        self.modifiers = kept
+        self._stats_changed()
+        return True
+
+    def expire_modifiers(self):
+        """Start of the owner's turn: drop modifiers that last until then."""
+        kept = [modifier for modifier in self.modifiers if not modifier.until_next_turn]
+        if len(kept) != len(self.modifiers):
+            self.modifiers = kept
+            self._stats_changed()
+
+    def set_auras(self, auras):
+        if auras != self.auras:
+            self.auras = auras
+            self._stats_changed()
+
+    def clone(self):
+        """An independent copy (for search); the template is shared, not copied."""
+        clone = Unit.__new__(Unit)
+        for name in Unit.__slots__:
+            setattr(clone, name, getattr(self, name))
+        clone.modifiers = list(self.modifiers)
+        clone.auras = dict(self.auras)
+        clone.board = None
+        clone._stats = {}
+        return clone
 
     def take_damage(self, amount):
         self.current_hp -= amount
@@ -93,6 +207,8 @@ class Player:
         self.hand = [] # List of card codes
         self.discard = [] # List of card codes
         self.units_on_board = {} # {unit_id: Unit object} - unit_id can be simple counter or unique hash
+        self.champion = None # The champion Unit while it is on the board
+        self.vp = 0 # Victory Points scored so far (see score())
 
     def draw_card(self, game_deck_ref, game_discard_ref):
         if not game_deck_ref:
@@ -107,7 +223,7 @@ class Player:
         if game_deck_ref:
             card = game_deck_ref.pop(0)
             self.hand.append(card)
-            print(f"Player {self.id} drew {card_data.get_card_data(card)['name']} ({card}).")
+            print(f"Player {self.id} drew {card_data.CARDS[card].name} ({card}).")
             return True
         return False
 
@@ -131,98 +247,438 @@ class Player:
             return True
         return False
 
+    def gain_vp(self, amount, reason):
+        self.vp += amount
+        print(f"Player {self.id} scores {amount} VP for {reason} (Total: {self.vp}).")
+
+    def score(self):
+        """Victory Points, counting unspent Food; kept up to date as the game goes, so O(1)."""
+        return self.vp + self.food // card_data.FOOD_PER_VP
+
     def add_unit(self, unit_object, unit_id):
         self.units_on_board[unit_id] = unit_object
+        if unit_object.base_data.type == 'Champion':
+            self.champion = unit_object
 
     def remove_unit(self, unit_id):
         if unit_id in self.units_on_board:
             defeated_unit = self.units_on_board.pop(unit_id)
+            if defeated_unit is self.champion:
+                self.champion = None
             # Put non-champion defeated units into discard
-            if defeated_unit.base_data['type'] != 'Champion':
+            if defeated_unit.base_data.type != 'Champion':
                  self.discard.append(defeated_unit.card_code)
                  print(f"{defeated_unit.base_data['name']} added to Player {self.id}'s discard pile.")
             return defeated_unit # Return the unit object in case needed (e.g., for VP)
         return None
 
 
+class ThreatMap:
+    """Where one player's units can attack without moving: for each cell, which
+    units reach it (range and line of sight), how many, and their total damage.
+
+    Kept by the Board and updated per unit when one is placed, moves or is
+    removed; only a change in line-of-sight-blocking terrain rebuilds it.
+    """
+    def __init__(self, board, player_id):
+        self.board = board
+        self.player_id = player_id
+        self.rebuild()
+
+    def rebuild(self):
+        cells = self.board.width * self.board.height
+        self.coverage = [0] * cells # Units that can attack each cell
+        self.damage = [0] * cells # Their combined damage
+        self.attackers = [set() for _ in range(cells)] # Their unit ids
+        self._footprints = {} # {unit_id: (cells, attack, damage)}
+        for unit in self.board.get_units_for_player(self.player_id):
+            self.add(unit)
+
+    def add(self, unit):
+        board = self.board
+        width, height = board.width, board.height
+        x0, y0 = unit.position
+        start = y0 * width + x0
+        row = start * width * height
+        los, blocking = board._los, board.blocking
+        reach = unit.get_stat('range')
+        footprint = []
+        for y in range(max(0, y0 - reach), min(height, y0 + reach + 1)):
+            span = reach - abs(y - y0)
+            for x in range(max(0, x0 - span), min(width, x0 + span + 1)):
+                b = y * width + x
+                if b != start and not los[row + b] & blocking:
+                    footprint.append(b)
+        damage = unit.get_stat(unit.base_data.damage_stat)
+        self._footprints[unit.unit_id] = (footprint, unit.get_stat('attack'), damage)
+        for b in footprint:
+            self.coverage[b] += 1
+            self.damage[b] += damage
+            self.attackers[b].add(unit.unit_id)
+
+    def remove(self, unit):
+        footprint, _, damage = self._footprints.pop(unit.unit_id)
+        for b in footprint:
+            self.coverage[b] -= 1
+            self.damage[b] -= damage
+            self.attackers[b].discard(unit.unit_id)
+
+    def update(self, unit):
+        if unit.unit_id in self._footprints:
+            self.remove(unit)
+        self.add(unit)
+
+    def expected_damage(self, pos, defense):
+        """Expected damage if every unit threatening `pos` attacked a defender there
+        with base `defense` (plus the square's cover)."""
+        b = self.board.cell(pos)
+        defense += self.board.get_cover_bonus(pos)
+        footprints = self._footprints
+        total = 0.0
+        for unit_id in self.attackers[b]:
+            _, attack, damage = footprints[unit_id]
+            total += hit_chance(attack, defense) * damage
+        return total
+
+
+class _GridView(Mapping):
+    """Read-only {(x, y): object} view of the board, for code written against the old grid dict."""
+    def __init__(self, board):
+        self._board = board
+
+    def __getitem__(self, pos):
+        obj = self._board.get_at_pos(pos)
+        if obj is None:
+            raise KeyError(pos)
+        return obj
+
+    def __iter__(self):
+        board = self._board
+        for i in board.occupied_cells():
+            yield board.pos_of(i)
+
+    def __len__(self):
+        return len(self._board.occupied_cells())
+
+
 class Board:
-    """Represents the game board state."""
+    """Represents the game board state.
+
+    One cell per square, indexed y * width + x, with a layer per kind of content:
+      units   - the Unit standing on the cell, or None
+      owner   - that unit's owner id, 0 if empty (so it doubles as the occupancy layer)
+      terrain - 0, 2 (Low Cover) or 3 (Heavy Cover)
+      caches  - 1 if a Food Cache ('4') is on the cell
+    The number layers are NumPy arrays when NumPy is installed (bytearrays
+    otherwise), so whole-board queries are vectorized.
+
+    Units may stand on Low Cover and Food Caches (to use the cover or consume the
+    cache); Heavy Cover is impassable. Terrain and caches go on empty cells only.
+
+    The board is also the unit registry: units by id, each player's units, and
+    each unit's position, all kept up to date on place/move/remove.
+    """
     def __init__(self, size=card_data.GRID_SIZE):
         self.width, self.height = size
-        # Store board elements in a dictionary for sparse population: {(x, y): object}
-        # object can be a Unit instance or a terrain/resource code ('2', '3', '4')
-        self.grid = {}
-        self.unit_positions = {} # {unit_id: (x, y)} for quick lookup
+        cells = self.width * self.height
+        self.units = [None] * cells
+        self.owner = self._layer(cells)
+        self.terrain = self._layer(cells)
+        self.caches = self._layer(cells)
+        self.units_by_id = {} # {unit_id: Unit}
+        self.unit_positions = {} # {unit_id: (x, y)}
+        self._player_units = {} # {player_id: {unit_id: Unit}}, in placement order
+        self._unit_id_counter = 0
+        self._los = get_los_table(self.width, self.height)
+        self.blocking = 0 # Bitmask of cells whose terrain blocks line of sight
+        self._neighbours = get_neighbour_table(self.width, self.height)
+        self.version = 0 # Bumped on every change, invalidating cached movement fields
+        self._reachable = {} # {unit_id: (version, position, movement, {pos: steps})}
+        self._threats = {} # {player_id: ThreatMap}, built on first use
+        self._aura_sources = {} # {unit_id: Unit} for units with a card_data.AURAS ability
+        low_x, low_y = (self.width - card_data.CENTER_SIZE) // 2, (self.height - card_data.CENTER_SIZE) // 2
+        self.center_cells = tuple(y * self.width + x
+                                  for y in range(low_y, low_y + card_data.CENTER_SIZE)
+                                  for x in range(low_x, low_x + card_data.CENTER_SIZE))
+
+    @staticmethod
+    def _layer(cells):
+        if np is not None:
+            return np.zeros(cells, dtype=np.uint8)
+        return bytearray(cells)
+
+    @property
+    def grid(self):
+        """{(x, y): Unit or terrain/resource code} for every non-empty square."""
+        return _GridView(self)
 
     def is_valid_pos(self, pos):
         x, y = pos
         return 0 <= x < self.width and 0 <= y < self.height
 
+    def cell(self, pos):
+        """Flat index of a (valid) position."""
+        return pos[1] * self.width + pos[0]
+
+    def pos_of(self, cell):
+        return (cell % self.width, cell // self.width)
+
     def get_at_pos(self, pos):
-        return self.grid.get(pos, None)
+        """The unit on a square if any, else its terrain/resource code ('2', '3', '4'), else None."""
+        if not self.is_valid_pos(pos):
+            return None
+        i = pos[1] * self.width + pos[0]
+        unit = self.units[i]
+        if unit is not None:
+            return unit
+        return self._code_at(i)
+
+    def terrain_at(self, pos):
+        """The terrain/resource code on a square, ignoring any unit standing there."""
+        if not self.is_valid_pos(pos):
+            return None
+        return self._code_at(self.cell(pos))
+
+    def _code_at(self, i):
+        terrain = self.terrain[i]
+        if terrain:
+            return '3' if terrain == 3 else '2'
+        if self.caches[i]:
+            return '4'
+        return None
+
+    def next_unit_id(self):
+        self._unit_id_counter += 1
+        return f"u{self._unit_id_counter}"
+
+    def can_enter(self, pos):
+        """Can a unit end its move here: on the board, no unit and no Heavy Cover."""
+        if not self.is_valid_pos(pos):
+            return False
+        i = pos[1] * self.width + pos[0]
+        return self.units[i] is None and self.terrain[i] != 3
 
     def place_object(self, obj, pos):
         if not self.is_valid_pos(pos):
             print(f"Error: Position {pos} is outside board boundaries.")
             return False
-        # Allow placing terrain/resource over empty space
-        # Allow placing unit over empty space
+        i = self.cell(pos)
         current_obj = self.get_at_pos(pos)
         if isinstance(obj, Unit):
-            if current_obj is not None:
+            if not self.can_enter(pos):
                  print(f"Error: Cannot place unit at {pos}, position occupied by {current_obj}.")
                  return False
-            self.grid[pos] = obj
-            self.unit_positions[obj.card_code + str(obj.owner_id)] = pos # Simple unique ID
+            if obj.unit_id in self.units_by_id:
+                 print(f"Error: {obj} is already on the board.")
+                 return False
+            if obj.unit_id is None:
+                obj.unit_id = self.next_unit_id()
+                while obj.unit_id in self.units_by_id: # Skip ids handed out elsewhere
+                    obj.unit_id = self.next_unit_id()
+            self.units[i] = obj
+            self.owner[i] = obj.owner_id
+            self.units_by_id[obj.unit_id] = obj
+            self.unit_positions[obj.unit_id] = pos
+            self._player_units.setdefault(obj.owner_id, {})[obj.unit_id] = obj
+            self.version += 1
+            threats = self._threats.get(obj.owner_id)
+            if threats is not None:
+                threats.add(obj)
+            obj.board = self
+            if any(ability.name in card_data.AURAS for ability in obj.base_data.abilities):
+                self._aura_sources[obj.unit_id] = obj
+            self._refresh_auras()
             return True
         elif obj in ['2', '3', '4']: # Terrain or Resource
              if current_obj is not None:
                  print(f"Error: Cannot place terrain/resource at {pos}, position occupied by {current_obj}.")
                  return False
-             self.grid[pos] = obj
+             if obj == '4':
+                 self.caches[i] = 1
+             else:
+                 self.terrain[i] = int(obj)
+                 if card_data.TERRAIN_EFFECTS[obj]['blocks_line_of_sight']:
+                     self.blocking |= 1 << i
+                     self._rebuild_threats()
+             self.version += 1
              return True
         else:
             print(f"Error: Cannot place unknown object type: {obj}")
             return False
 
     def remove_object(self, pos):
-        obj = self.grid.pop(pos, None)
-        if isinstance(obj, Unit):
-            # Also remove from unit_positions lookup
-            unit_id_to_remove = None
-            for uid, unit_pos in self.unit_positions.items():
-                if unit_pos == pos:
-                    unit_id_to_remove = uid
-                    break
-            if unit_id_to_remove:
-                del self.unit_positions[unit_id_to_remove]
+        """Remove what get_at_pos shows: the unit if there is one, else the terrain/resource."""
+        if not self.is_valid_pos(pos):
+            return None
+        i = self.cell(pos)
+        obj = self.units[i]
+        if obj is not None:
+            self.units[i] = None
+            self.owner[i] = 0
+            del self.units_by_id[obj.unit_id]
+            del self.unit_positions[obj.unit_id]
+            del self._player_units[obj.owner_id][obj.unit_id]
+            self._reachable.pop(obj.unit_id, None)
+            self.version += 1
+            threats = self._threats.get(obj.owner_id)
+            if threats is not None:
+                threats.remove(obj)
+            obj.board = None
+            obj.set_auras({})
+            if self._aura_sources.pop(obj.unit_id, None) is not None or self._aura_sources:
+                self._refresh_auras(force=True)
+            return obj
+        obj = self._code_at(i)
+        self.terrain[i] = 0
+        self.caches[i] = 0
+        if self.blocking >> i & 1:
+            self.blocking &= ~(1 << i)
+            self._rebuild_threats()
+        self.version += 1
         return obj # Return the removed object
 
+    def remove_cache(self, pos):
+        """Remove the Food Cache on a square (a unit may be standing on it)."""
+        if not self.is_valid_pos(pos) or not self.caches[self.cell(pos)]:
+            return False
+        self.caches[self.cell(pos)] = 0
+        self.version += 1
+        return True
+
     def move_unit(self, unit, new_pos):
         if not isinstance(unit, Unit): return False
-        old_pos = unit.position
-        if self.is_valid_pos(new_pos) and self.get_at_pos(new_pos) is None:
-            self.remove_object(old_pos)
-            self.place_object(unit, new_pos)
-            unit.move_to(new_pos) # Update unit's internal position
-            return True
-        return False
+        if self.units_by_id.get(unit.unit_id) is not unit or not self.can_enter(new_pos):
+            return False
+        old, new = self.cell(unit.position), self.cell(new_pos)
+        self.units[old], self.owner[old] = None, 0
+        self.units[new], self.owner[new] = unit, unit.owner_id
+        self.unit_positions[unit.unit_id] = new_pos
+        unit.move_to(new_pos) # Update unit's internal position
+        self.version += 1
+        threats = self._threats.get(unit.owner_id)
+        if threats is not None:
+            threats.update(unit)
+        self._refresh_auras()
+        return True
+
+    def on_stats_changed(self, unit):
+        """Called by a unit on this board when its effective stats change."""
+        threats = self._threats.get(unit.owner_id)
+        if threats is not None and unit.unit_id in threats._footprints:
+            threats.update(unit)
+        self._reachable.pop(unit.unit_id, None)
+
+    def _refresh_auras(self, force=False):
+        """Recompute aura bonuses for every unit; only units whose bonus changed
+        lose their cached stats."""
+        if not self._aura_sources and not force:
+            return
+        bonuses = {} # {unit_id: {stat: bonus}}
+        for source in self._aura_sources.values():
+            for ability in source.base_data.abilities:
+                aura = card_data.AURAS.get(ability.name)
+                if aura is None:
+                    continue
+                for unit in self._player_units[source.owner_id].values():
+                    if (unit is not source and unit.base_data.suit == aura['suit']
+                            and get_distance(unit.position, source.position) <= aura['range']):
+                        bonus = bonuses.setdefault(unit.unit_id, {})
+                        bonus[aura['stat']] = bonus.get(aura['stat'], 0) + aura['amount']
+        for units in self._player_units.values():
+            for unit in units.values():
+                unit.set_auras(bonuses.get(unit.unit_id, {}))
+
+    def threat_map(self, player_id):
+        """The ThreatMap of `player_id`'s units (what they can attack)."""
+        threats = self._threats.get(player_id)
+        if threats is None:
+            threats = self._threats[player_id] = ThreatMap(self, player_id)
+        return threats
+
+    def _rebuild_threats(self):
+        for threats in self._threats.values():
+            threats.rebuild()
+
+    def evaluate_moves(self, unit):
+        """Reachable squares with the damage the enemy can be expected to deal there, safest first."""
+        enemy = self.threat_map(3 - unit.owner_id)
+        defense = unit.get_stat('defense')
+        reachable = self.reachable_squares(unit)
+        return sorted(((pos, enemy.expected_damage(pos, defense)) for pos in reachable),
+                      key=lambda move: (move[1], reachable[move[0]]))
+
+    def reachable_squares(self, unit):
+        """{(x, y): squares walked} for every square `unit` can move to this action.
+
+        Breadth-first over orthogonal steps, up to the unit's movement: units and
+        Heavy Cover block the way, except for Flying units, which only need an
+        empty landing square. Cached until the board changes.
+        """
+        movement = unit.get_stat('movement')
+        cached = self._reachable.get(unit.unit_id)
+        if cached is not None and cached[:3] == (self.version, unit.position, movement):
+            return cached[3]
+        flying = any(ab['name'] == "Flying" for ab in unit.base_data.get('abilities', []))
+        units, terrain, neighbours = self.units, self.terrain, self._neighbours
+        start = self.cell(unit.position)
+        steps = {start: 0}
+        frontier = [start]
+        for step in range(1, movement + 1):
+            next_frontier = []
+            for i in frontier:
+                for n in neighbours[i]:
+                    if n in steps or (not flying and (units[n] is not None or terrain[n] == 3)):
+                        continue
+                    steps[n] = step
+                    next_frontier.append(n)
+            frontier = next_frontier
+        reachable = {self.pos_of(i): step for i, step in steps.items()
+                     if i != start and units[i] is None and terrain[i] != 3}
+        self._reachable[unit.unit_id] = (self.version, unit.position, movement, reachable)
+        return reachable
 
     def get_unit_by_id(self, unit_id):
-        # Need to search grid if using simple ID, or have a better lookup
-        for obj in self.grid.values():
-            if isinstance(obj, Unit) and (obj.card_code + str(obj.owner_id)) == unit_id:
-                return obj
-        return None
+        return self.units_by_id.get(unit_id)
+
+    def unit_id_at(self, pos):
+        unit = self.get_at_pos(pos)
+        return unit.unit_id if isinstance(unit, Unit) else None
 
     def get_units_for_player(self, player_id):
-        units = []
-        for obj in self.grid.values():
-            if isinstance(obj, Unit) and obj.owner_id == player_id:
-                units.append(obj)
-        return units
+        return list(self._player_units.get(player_id, {}).values())
+
+    # --- Whole-board queries (vectorized with NumPy) ---
+
+    @staticmethod
+    def cells_where(layer, value):
+        """Flat indexes of the cells where `layer` equals `value`."""
+        if np is not None:
+            return np.flatnonzero(layer == value).tolist()
+        return [i for i, v in enumerate(layer) if v == value]
+
+    def occupied_cells(self):
+        """Flat indexes of every cell holding a unit, terrain or a cache."""
+        if np is not None:
+            return np.flatnonzero(self.owner | self.terrain | self.caches).tolist()
+        return [i for i, cell in enumerate(zip(self.owner, self.terrain, self.caches)) if any(cell)]
+
+    def empty_positions(self):
+        """Every square with no unit, terrain or cache."""
+        occupied = set(self.occupied_cells())
+        return [self.pos_of(i) for i in range(self.width * self.height) if i not in occupied]
+
+    def positions_of(self, code):
+        """Every square holding terrain/resource `code` ('2', '3' or '4')."""
+        if code == '4':
+            cells = self.cells_where(self.caches, 1)
+        else:
+            cells = self.cells_where(self.terrain, int(code))
+        return [self.pos_of(i) for i in cells]
 
-    def display(self):
+    def display(self, danger_for=None):
+        """Print the board. With `danger_for` (a player id), empty squares that
+        player's enemies can attack show how many enemies reach them ("!2")."""
+        danger = self.threat_map(3 - danger_for).coverage if danger_for else None
         print("\n--- BOARD STATE ---")
         header = "   " + " ".join(f"{i:<2}" for i in range(self.width))
         print(header)
@@ -232,12 +688,14 @@ class Board:
             for x in range(self.width):
                 obj = self.get_at_pos((x, y))
                 if isinstance(obj, Unit):
-                    # Simple representation: First letter of rank + Suit initial + Owner ID
-                    rank_char = obj.base_data['rank'][0] if obj.base_data['rank'] != '10' else 'T'
+                    # Simple representation: Rank character of the card code + Suit initial + Owner ID
+                    rank_char = obj.base_data.code[0]
                     suit_char = obj.base_data['suit'][0]
                     display = f"{rank_char}{suit_char}{obj.owner_id}"
                 elif obj in ['2', '3', '4']:
                     display = f" {obj} " # Terrain/Resource
+                elif danger and danger[y * self.width + x]:
+                    display = f"!{danger[y * self.width + x]} " # Empty, under threat
                 else:
                     display = " . " # Empty
                 row_str += f"{display[0:3]:<3}|" # Ensure fixed width
@@ -246,33 +704,212 @@ class Board:
         print("-" * len(header))
 
     def has_line_of_sight(self, pos1, pos2):
-        """Simplified LoS check: Checks for Heavy Cover ('3') on the line between points."""
-        if pos1 == pos2: return True # Can always see self
-
-        line_points = get_points_on_line(pos1, pos2)
-        # Exclude start and end points from the check
-        points_between = line_points - {pos1, pos2}
-
-        for point in points_between:
-            obj = self.get_at_pos(point)
-            if obj == '3': # Heavy Cover blocks LoS
-                # Check if the object is actually terrain data
-                terrain_data = card_data.TERRAIN_EFFECTS.get('3')
-                if terrain_data and terrain_data['blocks_line_of_sight']:
-                    print(f"LoS blocked by Heavy Cover at {point}")
-                    return False
-        return True
+        """No line-of-sight-blocking terrain (Heavy Cover) strictly between the two squares."""
+        width = self.width
+        a = pos1[1] * width + pos1[0]
+        b = pos2[1] * width + pos2[0]
+        return not self._los[a * width * self.height + b] & self.blocking
+
+    def visible_cells(self, pos):
+        """Bitmask of every cell in line of sight from `pos`."""
+        cells = self.width * self.height
+        row = self.cell(pos) * cells
+        los, blocking = self._los, self.blocking
+        visible = 0
+        for b in range(cells):
+            if not los[row + b] & blocking:
+                visible |= 1 << b
+        return visible
+
+    def visible_targets(self, pos, player_id, max_range=None):
+        """`player_id`'s units in line of sight of `pos` (and within `max_range`, Manhattan)."""
+        cells = self.width * self.height
+        row = self.cell(pos) * cells
+        los, blocking, units = self._los, self.blocking, self.units
+        targets = []
+        for b in self.cells_where(self.owner, player_id):
+            unit = units[b]
+            if max_range is not None and get_distance(pos, unit.position) > max_range:
+                continue
+            if not los[row + b] & blocking:
+                targets.append(unit)
+        return targets
+
+    def center_control(self, player_id):
+        """How many center squares `player_id`'s units stand on."""
+        owner = self.owner
+        return sum(1 for i in self.center_cells if owner[i] == player_id)
 
     def get_cover_bonus(self, target_pos):
         """Checks adjacent squares for cover relative to attacker (simplified)."""
         # This is highly simplified. Real cover depends on attacker position.
         # For now, just check if the target is *on* a cover square.
-        obj = self.get_at_pos(target_pos)
+        obj = self.terrain_at(target_pos)
         if obj in ['2', '3']:
             return card_data.TERRAIN_EFFECTS[obj]['defense_bonus']
         return 0
 
 
+# --- Abilities ---
+
+class AbilityHandler:
+    """How an ability resolves, registered in ABILITIES under its name.
+
+    Cost and range are compiled from card_data once. Activated abilities have
+    an `effect(game, caster, target, handler)` returning True if it happened,
+    and usually a `targets(game, caster, handler)` selector listing what the
+    player may pick (units, squares or card codes). Passive abilities may give
+    combat hooks instead: `attack_bonus(attacker, defender)` and
+    `ignores_low_cover`, applied by Game.resolve_combat.
+    """
+    __slots__ = ('name', 'cost', 'range', 'effect', 'targets', 'once_per_turn',
+                 'attack_bonus', 'ignores_low_cover')
+
+    def __init__(self, name, effect=None, targets=None, once_per_turn=False,
+                 attack_bonus=None, ignores_low_cover=False):
+        codes = card_data.BY_ABILITY.get(name)
+        if not codes:
+            raise ValueError(f"No card has the ability '{name}'")
+        ability = next(ab for ab in card_data.CARDS[codes[0]].abilities if ab.name == name)
+        self.name = name
+        self.cost = ability.ap_cost
+        self.range = ability.range # None: the caster's Range stat
+        self.effect = effect
+        self.targets = targets
+        self.once_per_turn = once_per_turn
+        self.attack_bonus = attack_bonus
+        self.ignores_low_cover = ignores_low_cover
+
+    def reach(self, caster):
+        return caster.get_stat('range') if self.range is None else self.range
+
+ABILITIES = {} # ability name -> AbilityHandler
+
+def ability(*names, **options):
+    """Register the decorated function as the effect of the named abilities."""
+    def register(effect):
+        for name in names:
+            ABILITIES[name] = AbilityHandler(name, effect, **options)
+        return effect
+    return register
+
+# Target selectors
+
+def friendly_units_in_range(game, caster, handler):
+    reach = handler.reach(caster)
+    return [unit for unit in game.board.get_units_for_player(caster.owner_id)
+            if get_distance(caster.position, unit.position) <= reach]
+
+def enemies_in_sight(game, caster, handler):
+    return game.board.visible_targets(caster.position, 3 - caster.owner_id, handler.reach(caster))
+
+def empty_squares_in_range(game, caster, handler):
+    reach = handler.reach(caster)
+    return [pos for pos in game.board.empty_positions() if get_distance(caster.position, pos) <= reach]
+
+def skirmish_squares(game, caster, handler):
+    reachable = game.board.reachable_squares(caster)
+    return sorted((pos for pos, squares in reachable.items() if squares <= 2),
+                  key=lambda pos: (reachable[pos], pos[1], pos[0]))
+
+def raisable_cards(game, caster, handler):
+    """Non-Champion unit cards costing 3 or less in the caster's discard, if there is room to raise one."""
+    if not empty_squares_in_range(game, caster, handler):
+        return []
+    cards = game.players[caster.owner_id].discard
+    return list(dict.fromkeys(code for code in cards
+                              if card_data.CARDS[code].type == 'Unit' and card_data.CARDS[code].cost <= 3))
+
+# Effects
+
+HEAL_AMOUNTS = {"Minor Heal": 2, "Heal": 3, "Greater Heal": 4}
+
+@ability("Minor Heal", "Heal", "Greater Heal", targets=friendly_units_in_range)
+def _heal(game, caster, target, handler):
+    target.heal(HEAL_AMOUNTS[handler.name])
+    return True
+
+@ability("Sanctuary")
+def _sanctuary(game, caster, target, handler):
+    caster.add_modifier(Modifier('defense', 2, handler.name, until_next_turn=True))
+    print(f"{caster.base_data['name']} gains +2 Defense until the start of your next turn.")
+    return True
+
+@ability("Protective Ward", targets=friendly_units_in_range)
+def _protective_ward(game, caster, target, handler):
+    target.add_modifier(Modifier('defense', 2, handler.name, until_next_turn=True))
+    print(f"{target.base_data['name']} gains +2 Defense until the start of your next turn.")
+    return True
+
+@ability("Ranged Shot", "Shadow Bolt", "Arcane Bolt", "Basic Melee", targets=enemies_in_sight)
+def _attack(game, caster, target, handler):
+    return game.resolve_combat(caster, target, max_range=handler.reach(caster))
+
+@ability("Fierce Strike", targets=enemies_in_sight)
+def _fierce_strike(game, caster, target, handler):
+    return game.resolve_combat(caster, target, attack_bonus=1, max_range=handler.reach(caster))
+
+@ability("Focused Blast", targets=enemies_in_sight)
+def _focused_blast(game, caster, target, handler):
+    return game.resolve_combat(caster, target, attack_bonus=1, ignore_low_cover=True,
+                               max_range=handler.reach(caster))
+
+@ability("Precision Attack", targets=enemies_in_sight)
+def _precision_attack(game, caster, target, handler):
+    return game.resolve_combat(caster, target, cover_ignored=1, max_range=handler.reach(caster))
+
+@ability("Skirmish", targets=skirmish_squares)
+def _skirmish(game, caster, target, handler):
+    squares = game.board.reachable_squares(caster)[target]
+    if not game.board.move_unit(caster, target):
+        return False
+    caster.squares_moved += squares
+    print(f"{caster.base_data['name']} skirmishes to {target}.")
+    return True
+
+@ability("Scout Ahead", once_per_turn=True)
+def _scout_ahead(game, caster, target, handler):
+    player = game.players[caster.owner_id]
+    if not player.draw_card(game.deck, player.discard):
+        print("Could not draw card.")
+        return False
+    return True
+
+@ability("Resource Surge", once_per_turn=True)
+def _resource_surge(game, caster, target, handler):
+    game.players[caster.owner_id].gain_food(3)
+    return True
+
+@ability("Raise Dead", targets=raisable_cards)
+def _raise_dead(game, caster, target, handler):
+    pos = game.choose(empty_squares_in_range(game, caster, handler), "square")
+    if pos is None:
+        return False
+    player = game.players[caster.owner_id]
+    raised = Unit(target, caster.owner_id, pos, game._get_next_unit_id())
+    raised.current_hp = 1
+    raised.activated_this_turn = True
+    if not game.board.place_object(raised, pos):
+        return False
+    player.discard.remove(target)
+    player.add_unit(raised, raised.unit_id)
+    print(f"{raised.base_data['name']} rises at {pos} with 1 HP.")
+    return True
+
+@ability("Obscuring Mist", targets=empty_squares_in_range)
+def _obscuring_mist(game, caster, target, handler):
+    if not game.board.place_object('3', target):
+        return False
+    game.mists.append((target, game.current_round + 1)) # Lifts after the end of the next round
+    print(f"Mist gathers at {target}.")
+    return True
+
+# Passives that change an attack
+ABILITIES["Devastating Charge"] = AbilityHandler(
+    "Devastating Charge", attack_bonus=lambda attacker, defender: 2 if attacker.squares_moved >= 3 else 0)
+ABILITIES["Keen Eyes"] = AbilityHandler("Keen Eyes", ignores_low_cover=True)
+
+
 class Game:
     """Main game engine."""
     def __init__(self):
@@ -287,13 +924,14 @@ class Game:
         self.current_round = 1
         self.game_over = False
         self.winner = None
-        self._unit_id_counter = 0 # Simple way to give units unique IDs
+        self.abilities_used = set() # (unit_id, ability name) for once-per-turn abilities
+        self.mists = [] # [(pos, last round)] Obscuring Mist tokens on the board
 
     def _get_next_unit_id(self):
-        self._unit_id_counter += 1
-        return f"u{self._unit_id_counter}"
+        return self.board.next_unit_id()
 
-    def setup_game(self):
+    def setup_game(self, layout=None):
+        """Set up a new game; `layout` is a map_generator layout (default: a fresh random one)."""
         print("--- AVIA ASCENDANCY SETUP ---")
 
         # 1. Choose Champions (Simplified: Assign first two Aces)
@@ -301,77 +939,34 @@ class Game:
         random.shuffle(available_aces)
         p1_champ = available_aces.pop(0)
         p2_champ = available_aces.pop(0)
-        print(f"Player 1 chooses Champion: {card_data.get_card_data(p1_champ)['name']}")
-        print(f"Player 2 chooses Champion: {card_data.get_card_data(p2_champ)['name']}")
+        print(f"Player 1 chooses Champion: {card_data.CARDS[p1_champ].name}")
+        print(f"Player 2 chooses Champion: {card_data.CARDS[p2_champ].name}")
         self.players[1] = Player(1, p1_champ)
         self.players[2] = Player(2, p2_champ)
 
         # Place Champions
         p1_start_pos = (self.board.width // 2, self.board.height - 1)
         p2_start_pos = (self.board.width // 2, 0)
-        champ1_unit = Unit(p1_champ, 1, p1_start_pos)
-        champ2_unit = Unit(p2_champ, 2, p2_start_pos)
-        champ1_id = self._get_next_unit_id()
-        champ2_id = self._get_next_unit_id()
+        champ1_unit = Unit(p1_champ, 1, p1_start_pos, self._get_next_unit_id())
+        champ2_unit = Unit(p2_champ, 2, p2_start_pos, self._get_next_unit_id())
         self.board.place_object(champ1_unit, p1_start_pos)
         self.board.place_object(champ2_unit, p2_start_pos)
-        self.players[1].add_unit(champ1_unit, champ1_id)
-        self.players[2].add_unit(champ2_unit, champ2_id)
+        self.players[1].add_unit(champ1_unit, champ1_unit.unit_id)
+        self.players[2].add_unit(champ2_unit, champ2_unit.unit_id)
 
 
         # 2. Prepare Deck (Remove Aces, 2s, 3s, 4s)
         full_deck = [r + s for s in ['C', 'H', 'D', 'S'] for r in ['A', '2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K']]
-        terrain_cards = [c for c in full_deck if c[0] in ['2', '3']]
-        resource_cards = [c for c in full_deck if c[0] == '4']
         used_aces = [p1_champ, p2_champ]
         self.deck = [c for c in full_deck if c[0] not in ['A', '2', '3', '4'] or c in used_aces] # Keep chosen aces in potential pool? No, rules say discard others.
         self.deck = [c for c in full_deck if c[0] not in ['2', '3', '4'] and c not in available_aces and c not in used_aces] # Correct deck
         random.shuffle(self.deck)
 
-        # 3. Place Terrain & Resources (Simplified Random Placement)
-        num_low_cover = len([c for c in terrain_cards if c[0] == '2']) // 2 # Approx
-        num_heavy_cover = len([c for c in terrain_cards if c[0] == '3']) // 2
-        num_caches = len(resource_cards) // 2
-
-        placed_count = 0
-        max_attempts = self.board.width * self.board.height * 2
-        attempts = 0
-        while placed_count < num_low_cover and attempts < max_attempts:
-            x, y = random.randint(0, self.board.width - 1), random.randint(1, self.board.height - 2) # Avoid start rows
-            if self.board.get_at_pos((x,y)) is None:
-                self.board.place_object('2', (x,y))
-                placed_count += 1
-            attempts += 1
-        # Repeat for Heavy Cover and Caches
-        placed_count = 0
-        attempts = 0
-        while placed_count < num_heavy_cover and attempts < max_attempts:
-            x, y = random.randint(0, self.board.width - 1), random.randint(1, self.board.height - 2)
-            if self.board.get_at_pos((x,y)) is None:
-                 # Avoid placing adjacent initially (simple check)
-                 is_adjacent_clear = True
-                 for dx in [-1, 0, 1]:
-                     for dy in [-1, 0, 1]:
-                         if dx == 0 and dy == 0: continue
-                         if self.board.get_at_pos((x+dx, y+dy)) in ['2', '3']:
-                             is_adjacent_clear = False
-                             break
-                     if not is_adjacent_clear: break
-                 if is_adjacent_clear:
-                    self.board.place_object('3', (x,y))
-                    placed_count += 1
-            attempts += 1
-
-        placed_count = 0
-        attempts = 0
-        while placed_count < num_caches and attempts < max_attempts:
-             x, y = random.randint(0, self.board.width - 1), random.randint(1, self.board.height - 2)
-             if self.board.get_at_pos((x,y)) is None:
-                 self.board.place_object('4', (x,y))
-                 placed_count += 1
-             attempts += 1
-
-        print(f"Placed terrain and {placed_count} food caches.")
+        # 3. Place Terrain & Resources (a generated or pre-made layout, see map_generator)
+        if layout is None:
+            layout = map_generator.generate_map(size=(self.board.width, self.board.height))
+        map_generator.apply_map(self.board, layout)
+        print(f"Placed terrain and {sum(1 for _, code in layout if code == '4')} food caches.")
 
         # 4. Starting Hand & Food (Food already set)
         print("Drawing starting hands...")
@@ -389,25 +984,20 @@ class Game:
     def display_game_state(self):
         clear_console()
         print(f"--- ROUND {self.current_round}/{card_data.MAX_ROUNDS} --- PLAYER {self.current_player_id}'s TURN ---")
-        self.board.display()
+        self.board.display(danger_for=self.current_player_id)
         print("\n--- Player States ---")
         for pid, player in self.players.items():
-            print(f"Player {pid}: Food={player.food}")
-            print(f"  Hand: {[f'{card_data.get_card_data(c)['name']} ({c})' for c in player.hand]}")
+            print(f"Player {pid}: Food={player.food} VP={player.vp}")
+            print(f"  Hand: {[f'{card_data.CARDS[c].name} ({c})' for c in player.hand]}")
             # print(f"  Discard: {len(player.discard)} cards")
             # print(f"  Deck: {len(self.deck)} cards remaining") # Global deck
             print(f"  Units: {[str(u) for u in self.board.get_units_for_player(pid)]}")
         print("-" * 20)
 
     def check_win_condition(self):
-        p1_champ_alive = False
-        p2_champ_alive = False
-        for unit in self.board.grid.values():
-            if isinstance(unit, Unit) and unit.base_data['type'] == 'Champion':
-                if unit.owner_id == 1:
-                    p1_champ_alive = True
-                elif unit.owner_id == 2:
-                    p2_champ_alive = True
+        """Constant time: champions are tracked by their players, VP as they're scored."""
+        p1_champ_alive = self.players[1].champion is not None
+        p2_champ_alive = self.players[2].champion is not None
 
         if not p1_champ_alive:
             self.game_over = True
@@ -422,52 +1012,65 @@ class Game:
 
         if self.current_round > card_data.MAX_ROUNDS:
             self.game_over = True
-            # TODO: Implement VP scoring for tie-breaker
-            print(f"Round limit ({card_data.MAX_ROUNDS}) reached. Game is a draw (VP scoring not implemented).")
-            self.winner = 0 # Draw
+            p1_score, p2_score = self.players[1].score(), self.players[2].score()
+            print(f"Round limit ({card_data.MAX_ROUNDS}) reached. Victory Points: P1 {p1_score}, P2 {p2_score}.")
+            if p1_score != p2_score:
+                self.winner = 1 if p1_score > p2_score else 2
+            else:
+                self.winner = 0 # Draw
             return True
 
         return False
 
-    def resolve_combat(self, attacker_unit, defender_unit):
+    def resolve_combat(self, attacker_unit, defender_unit, attack_bonus=0, ignore_low_cover=False, cover_ignored=0,
+                       max_range=None):
+        """One attack roll; False if the attack couldn't be made (no line of
+        sight, or out of range). Abilities add `attack_bonus`, ignore Low
+        Cover, ignore `cover_ignored` points of cover, or reach `max_range`
+        instead of the attacker's Range; the attacker's passive
+        AbilityHandlers add theirs."""
         print(f"\nCombat: {attacker_unit.base_data['name']} (P{attacker_unit.owner_id}) attacks {defender_unit.base_data['name']} (P{defender_unit.owner_id})")
 
         # Check Line of Sight
         if not self.board.has_line_of_sight(attacker_unit.position, defender_unit.position):
             print("Attack failed: Line of sight blocked!")
-            return
+            return False
 
         # Check Range
         distance = get_distance(attacker_unit.position, defender_unit.position)
-        attack_range = attacker_unit.get_stat('range')
+        attack_range = attacker_unit.get_stat('range') if max_range is None else max_range
         if distance > attack_range:
             print(f"Attack failed: Target out of range ({distance} > {attack_range})")
-            return
+            return False
 
         # Roll to Hit
+        for name in attacker_unit.base_data.ability_names:
+            handler = ABILITIES.get(name)
+            if handler is not None:
+                if handler.attack_bonus is not None:
+                    attack_bonus += handler.attack_bonus(attacker_unit, defender_unit)
+                ignore_low_cover = ignore_low_cover or handler.ignores_low_cover
         roll = random.randint(1, 6)
-        attack_bonus = attacker_unit.get_stat('attack')
-        # TODO: Add other modifiers (abilities, etc.)
-        attack_total = roll + attack_bonus
-        print(f"Attacker rolls {roll} + {attack_bonus} (Attack) = {attack_total}")
+        attack_stat = attacker_unit.get_stat('attack') + attack_bonus
+        attack_total = roll + attack_stat
+        print(f"Attacker rolls {roll} + {attack_stat} (Attack) = {attack_total}")
 
         # Calculate Defense
         defense_base = defender_unit.get_stat('defense')
         cover_bonus = self.board.get_cover_bonus(defender_unit.position)
-        # TODO: Add other modifiers (abilities, etc.)
+        if ignore_low_cover and self.board.terrain_at(defender_unit.position) == '2':
+            cover_bonus = 0
+        cover_bonus = max(0, cover_bonus - cover_ignored)
         defense_total = defense_base + cover_bonus
         print(f"Defender has {defense_base} (Defense) + {cover_bonus} (Cover) = {defense_total}")
 
         # Compare
         if attack_total >= defense_total:
             print("Hit!")
-            damage = attacker_unit.get_stat('damage') # Assuming 'damage' stat exists, otherwise use 'attack'? Let's assume base damage = attack stat for now.
-            if 'damage' not in attacker_unit.base_data: # Use attack if no specific damage stat
-                 damage = attacker_unit.get_stat('attack')
-                 print(f"(Using Attack stat for base damage: {damage})")
-            else:
-                 damage = attacker_unit.get_stat('damage')
-                 print(f"(Base damage: {damage})")
+            # Cards without a damage stat deal their Attack (see UnitTemplate.damage_stat)
+            damage_stat = attacker_unit.base_data.damage_stat
+            damage = attacker_unit.get_stat(damage_stat)
+            print(f"(Base damage: {damage})" if damage_stat == 'damage' else f"(Using Attack stat for base damage: {damage})")
 
             # TODO: Damage modifiers
 
@@ -476,133 +1079,85 @@ class Game:
                 # Remove unit from board and player's control
                 defender_owner = self.players[defender_unit.owner_id]
                 self.board.remove_object(defender_unit.position)
-                # Find the unit_id to remove from player
-                unit_id_to_remove = None
-                for uid, unit_obj in defender_owner.units_on_board.items():
-                    if unit_obj == defender_unit:
-                        unit_id_to_remove = uid
-                        break
-                if unit_id_to_remove:
-                    defender_owner.remove_unit(unit_id_to_remove)
+                defender_owner.remove_unit(defender_unit.unit_id)
+                self.players[attacker_unit.owner_id].gain_vp(card_data.VP_PER_UNIT_DEFEATED,
+                                                             f"defeating {defender_unit.base_data['name']}")
                 # Check win condition immediately if a champion fell
                 self.check_win_condition()
         else:
             print("Miss!")
+        return True
 
     def execute_ability(self, caster_unit, ability_name):
-        # Find the ability data
-        ability_data = None
-        for ab in caster_unit.base_data.get('abilities', []):
-            if ab['name'] == ability_name:
-                ability_data = ab
-                break
-
-        if not ability_data:
+        """Use one of the caster's activated abilities (see ABILITIES), paying
+        its AP cost from the caster's AP; True if it took effect."""
+        if ability_name not in caster_unit.base_data.ability_names:
             print(f"Error: Ability '{ability_name}' not found for {caster_unit.base_data['name']}.")
             return False
+        handler = ABILITIES.get(ability_name)
+        if handler is None or handler.effect is None:
+            if any(ab.name == ability_name for ab in caster_unit.base_data.active_abilities):
+                print(f"Ability '{ability_name}' logic not implemented yet.")
+            else:
+                print("(Passive ability, cannot be used as an action)")
+            return False
+        if handler.once_per_turn and (caster_unit.unit_id, ability_name) in self.abilities_used:
+            print(f"{ability_name} can only be used once per turn.")
+            return False
+        if caster_unit.ap < handler.cost:
+            print(f"Not enough AP (Needs {handler.cost}, Has {caster_unit.ap}).")
+            return False
 
         print(f"{caster_unit.base_data['name']} uses '{ability_name}'...")
-        caster_player = self.players[caster_unit.owner_id]
-        target = None # Required for many abilities
-
-        # --- Implement Ability Logic ---
-        # This needs to be expanded significantly for all abilities
-        # Use ability_data['description'] and other fields as guide
-
-        if ability_name == "Minor Heal" or ability_name == "Heal" or ability_name == "Greater Heal":
-            heal_amount = {'Minor Heal': 2, 'Heal': 3, 'Greater Heal': 4}[ability_name]
-            target_range = ability_data.get('range', 1)
-
-            # Get potential targets
-            potential_targets = []
-            for unit in self.board.get_units_for_player(caster_unit.owner_id):
-                 if get_distance(caster_unit.position, unit.position) <= target_range:
-                     potential_targets.append(unit)
-
-            if not potential_targets:
-                 print("No valid targets in range.")
-                 return False
-
-            print("Select target unit to heal:")
-            for i, unit in enumerate(potential_targets):
-                 print(f"  {i}: {unit}")
-            try:
-                 choice = int(input("Enter target number: "))
-                 if 0 <= choice < len(potential_targets):
-                     target = potential_targets[choice]
-                     target.heal(heal_amount)
-                     return True
-                 else:
-                     print("Invalid choice.")
-                     return False
-            except ValueError:
-                 print("Invalid input.")
-                 return False
-
-        elif ability_name == "Resourceful Leader": # Passive handled at start of turn
-             print("(Passive ability, effect applied at start of turn)")
-             return False # Cannot actively use a passive
-
-        elif ability_name == "Scout Ahead":
-             if caster_player.draw_card(self.deck, caster_player.discard):
-                 # Maybe limit uses per turn if needed
-                 return True
-             else:
-                 print("Could not draw card.")
-                 return False
-
-        elif ability_name == "Generates Food": # Passive handled at start of turn
-             print("(Passive ability, effect applied at start of turn)")
-             return False
-
-        elif ability_name == "Ranged Shot" or ability_name == "Shadow Bolt" or ability_name == "Arcane Bolt":
-             target_range = caster_unit.get_stat('range')
-             potential_targets = []
-             opponent_id = 3 - caster_unit.owner_id
-             for unit in self.board.get_units_for_player(opponent_id):
-                  dist = get_distance(caster_unit.position, unit.position)
-                  if dist <= target_range and self.board.has_line_of_sight(caster_unit.position, unit.position):
-                      potential_targets.append(unit)
-
-             if not potential_targets:
-                  print("No valid targets in range/LoS.")
-                  return False
-
-             print("Select target unit to attack:")
-             for i, unit in enumerate(potential_targets):
-                  print(f"  {i}: {unit}")
-             try:
-                  choice = int(input("Enter target number: "))
-                  if 0 <= choice < len(potential_targets):
-                      target = potential_targets[choice]
-                      # Use standard combat resolution for damage spells for now
-                      self.resolve_combat(caster_unit, target)
-                      return True
-                  else:
-                      print("Invalid choice.")
-                      return False
-             except ValueError:
-                  print("Invalid input.")
-                  return False
-
-        # --- Add more ability implementations here ---
-        # e.g., Fierce Strike, Commander's Presence (passive check during combat),
-        # Sanctuary, Precognitive Dodge (passive check during combat), Focused Blast,
-        # Skirmish, Devastating Charge (check movement before attack), Flying (ignore terrain),
-        # First Strike (reaction logic needed), Precision Attack (modify combat), etc.
-        # Necromancy would need access to discard piles.
-        # Obscuring Mist needs temporary terrain placement.
-
-        else:
-            print(f"Ability '{ability_name}' logic not implemented yet.")
+        target = None
+        if handler.targets is not None:
+            candidates = handler.targets(self, caster_unit, handler)
+            if not candidates:
+                print("No valid targets.")
+                return False
+            target = self.choose(candidates, "target")
+            if target is None:
+                return False
+        if not handler.effect(self, caster_unit, target, handler):
             return False
+        caster_unit.ap -= handler.cost
+        if handler.once_per_turn:
+            self.abilities_used.add((caster_unit.unit_id, ability_name))
+        return True
 
+    def choose(self, options, noun):
+        """Prompt for one of `options` (units, squares or card codes); None if the choice is invalid."""
+        print(f"Select {noun}:")
+        for i, option in enumerate(options):
+            label = f"{card_data.CARDS[option].name} ({option})" if isinstance(option, str) else option
+            print(f"  {i}: {label}")
+        try:
+            choice = int(input(f"Enter {noun} number: "))
+        except ValueError:
+            print("Invalid input.")
+            return None
+        if not 0 <= choice < len(options):
+            print("Invalid choice.")
+            return None
+        return options[choice]
+
+    def lift_mists(self):
+        """Remove Obscuring Mist tokens whose last round has ended."""
+        lasting = []
+        for pos, last_round in self.mists:
+            if last_round < self.current_round:
+                self.board.remove_object(pos)
+                print(f"The mist at {pos} lifts.")
+            else:
+                lasting.append((pos, last_round))
+        self.mists = lasting
 
     def handle_unit_activation(self, unit):
         player = self.players[unit.owner_id]
         unit.ap = 2 # Reset AP for activation
         unit.activated_this_turn = True
         unit.can_attack_this_activation = True # Reset attack flag
+        unit.squares_moved = 0
 
         while unit.ap > 0:
             self.display_game_state()
@@ -622,64 +1177,42 @@ class Game:
                 if unit.ap < 1: print("Not enough AP."); continue
                 move_speed = unit.get_stat('movement')
                 print(f"Movement Speed: {move_speed}")
+                # Squares reachable around units and Heavy Cover (Flying ignores them)
+                reachable = self.board.reachable_squares(unit)
+                if not reachable:
+                    print("No squares reachable.")
+                    continue
+                destinations = sorted(reachable, key=lambda pos: (reachable[pos], pos[1], pos[0]))
+                print("Choose destination:")
+                for i, pos in enumerate(destinations):
+                    print(f"  {i}: {pos} ({reachable[pos]} squares)")
                 try:
-                    target_x = int(input("Enter target X coordinate: "))
-                    target_y = int(input("Enter target Y coordinate: "))
-                    target_pos = (target_x, target_y)
-
-                    if not self.board.is_valid_pos(target_pos):
-                        print("Invalid coordinates.")
-                        continue
-
-                    distance = get_distance(unit.position, target_pos)
-                    if distance == 0:
-                        print("Already at target position.")
-                        continue
-                    if distance > move_speed:
-                        print(f"Target out of range ({distance} > {move_speed}).")
-                        continue
-
-                    # Pathfinding needed for complex movement (blocking terrain/units)
-                    # Simplified: Check direct path for blockers (Heavy Cover or Units)
-                    # TODO: Implement Flying logic (ignore terrain/units)
-                    can_move = True
-                    line_points = get_points_on_line(unit.position, target_pos)
-                    points_between = line_points - {unit.position, target_pos}
-                    for point in points_between:
-                        obj = self.board.get_at_pos(point)
-                        if isinstance(obj, Unit) or obj == '3': # Blocked by unit or heavy cover
-                            print(f"Movement path blocked by object at {point}.")
-                            can_move = False
-                            break
-                    if not can_move: continue
-
-                    # Final check: is destination square empty?
-                    if self.board.get_at_pos(target_pos) is not None:
-                        print("Destination square is occupied.")
+                    choice = int(input("Enter destination number: "))
+                    if not 0 <= choice < len(destinations):
+                        print("Invalid choice.")
                         continue
+                    target_pos = destinations[choice]
+                    squares = reachable[target_pos]
 
                     # Execute move
                     if self.board.move_unit(unit, target_pos):
                         print(f"{unit.base_data['name']} moved to {target_pos}.")
+                        unit.squares_moved += squares
                         unit.ap -= 1
                     else:
                         print("Move failed.")
 
                 except ValueError:
-                    print("Invalid coordinate input.")
+                    print("Invalid input.")
 
             elif action_choice == '2': # Attack
                 if unit.ap < 1: print("Not enough AP."); continue
                 if not unit.can_attack_this_activation: print("Cannot attack again this activation."); continue
 
                 attack_range = unit.get_stat('range')
-                potential_targets = []
                 opponent_id = 3 - unit.owner_id
-                for target_unit in self.board.get_units_for_player(opponent_id):
-                    dist = get_distance(unit.position, target_unit.position)
-                    # Check range and LoS
-                    if dist <= attack_range and self.board.has_line_of_sight(unit.position, target_unit.position):
-                        potential_targets.append(target_unit)
+                # Enemies in range and line of sight
+                potential_targets = self.board.visible_targets(unit.position, opponent_id, attack_range)
 
                 if not potential_targets:
                     print("No valid targets in range/LoS.")
@@ -701,30 +1234,21 @@ class Game:
                     print("Invalid input.")
 
             elif action_choice == '3': # Use Ability
-                 abilities = unit.base_data.get('abilities', [])
-                 active_abilities = [ab for ab in abilities if ab.get('cost', '').endswith('AP')] # Find abilities costing AP
+                 active_abilities = unit.base_data.active_abilities
                  if not active_abilities:
                      print("This unit has no activatable abilities.")
                      continue
 
                  print("Select ability to use:")
                  for i, ab in enumerate(active_abilities):
-                     print(f"  {i}: {ab['name']} ({ab['cost']}) - {ab['description']}")
+                     print(f"  {i}: {ab.name} ({ab.cost}) - {ab.description}")
 
                  try:
                      choice = int(input("Enter ability number: "))
                      if 0 <= choice < len(active_abilities):
-                         selected_ability = active_abilities[choice]
-                         ability_cost_str = selected_ability.get('cost', '1 AP').split(' ')[0]
-                         ability_cost = int(ability_cost_str) if ability_cost_str.isdigit() else 1
-
-                         if unit.ap >= ability_cost:
-                             if self.execute_ability(unit, selected_ability['name']):
-                                 unit.ap -= ability_cost
-                             else:
-                                 print("Ability execution failed or was cancelled.")
-                         else:
-                             print(f"Not enough AP (Needs {ability_cost}, Has {unit.ap}).")
+                         # execute_ability checks and spends the handler's AP cost
+                         if not self.execute_ability(unit, active_abilities[choice].name):
+                             print("Ability execution failed or was cancelled.")
                      else:
                          print("Invalid choice.")
                  except ValueError:
@@ -733,11 +1257,11 @@ class Game:
 
             elif action_choice == '4': # Consume Food Cache
                 if unit.ap < 1: print("Not enough AP."); continue
-                obj_at_pos = self.board.get_at_pos(unit.position)
+                obj_at_pos = self.board.terrain_at(unit.position)
                 if obj_at_pos == '4':
                     food_bonus = card_data.RESOURCE_EFFECTS['4']['food_bonus']
                     player.gain_food(food_bonus)
-                    self.board.remove_object(unit.position) # Remove the cache
+                    self.board.remove_cache(unit.position) # Remove the cache
                     print(f"Consumed Food Cache for +{food_bonus} Food.")
                     unit.ap -= 1
                 else:
@@ -750,7 +1274,7 @@ class Game:
                      # Determine food gain (e.g., base cost or fixed amount)
                      food_gain = unit.base_data.get('cost', 1) # Gain food equal to cost? Or fixed? Let's use cost.
                      # Check for Sacrifice Fodder ability
-                     if any(ab['name'] == "Sacrifice Fodder" for ab in unit.base_data.get('abilities',[])):
+                     if unit.base_data.has_ability("Sacrifice Fodder"):
                          food_gain += 1
                          print("(+1 Food from Sacrifice Fodder)")
 
@@ -759,13 +1283,7 @@ class Game:
 
                      # Remove unit
                      self.board.remove_object(unit.position)
-                     unit_id_to_remove = None
-                     for uid, unit_obj in player.units_on_board.items():
-                         if unit_obj == unit:
-                             unit_id_to_remove = uid
-                             break
-                     if unit_id_to_remove:
-                         player.remove_unit(unit_id_to_remove) # Adds to discard automatically
+                     player.remove_unit(unit.unit_id) # Adds to discard automatically
 
                      unit.ap = 0 # End activation immediately
                      # Check win condition if a champion was somehow sacrificed (shouldn't happen)
@@ -833,24 +1351,23 @@ class Game:
             # Options only available on your main turn (not opponent's activation slot)
             if is_current_players_main_turn:
                 # Option to play a unit card
-                playable_unit_cards = [c for c in current_actor.hand if card_data.get_card_data(c)['type'] == 'Unit']
+                playable_unit_cards = [c for c in current_actor.hand if card_data.CARDS[c].type == 'Unit']
                 if playable_unit_cards:
                     print("  Play Unit Card from Hand:")
                     for i, card_code in enumerate(playable_unit_cards):
-                        card_info = card_data.get_card_data(card_code)
+                        card_info = card_data.CARDS[card_code]
                         action_key = str(next_action_idx + i)
-                        print(f"    {action_key}: {card_info['name']} ({card_code}) - Cost: {card_info['cost']} Food")
+                        print(f"    {action_key}: {card_info.name} ({card_code}) - Cost: {card_info.cost} Food")
                         action_options[action_key] = ('play_unit', card_code)
                     next_action_idx += len(playable_unit_cards)
 
                 # Option to play a resource card (5-10)
-                playable_resource_cards = [c for c in current_actor.hand if card_data.get_card_data(c)['rank'] in ['5','6','7','8','9','T']]
+                playable_resource_cards = [c for c in current_actor.hand if card_data.CARDS[c].type == 'Resource']
                 if playable_resource_cards:
                     print("  Play Resource Card (Gain +1 Food):")
                     for i, card_code in enumerate(playable_resource_cards):
-                        card_info = card_data.get_card_data(card_code)
                         action_key = str(next_action_idx + i)
-                        print(f"    {action_key}: {card_info['name']} ({card_code})")
+                        print(f"    {action_key}: {card_data.CARDS[card_code].name} ({card_code})")
                         action_options[action_key] = ('play_resource', card_code)
                     next_action_idx += len(playable_resource_cards)
 
@@ -878,8 +1395,8 @@ class Game:
                         continue # Don't switch player yet, let them choose again
 
                     card_code = data
-                    card_info = card_data.get_card_data(card_code)
-                    cost = card_info['cost']
+                    card_info = card_data.CARDS[card_code]
+                    cost = card_info.cost
 
                     if current_actor.food >= cost:
                         # Find valid placement squares (adjacent to friendly units)
@@ -907,11 +1424,10 @@ class Game:
                                 place_pos = valid_list[sq_choice]
                                 if current_actor.spend_food(cost):
                                     current_actor.discard_from_hand(card_code) # Discard after successful payment
-                                    new_unit = Unit(card_code, activating_player_id, place_pos)
+                                    new_unit = Unit(card_code, activating_player_id, place_pos, self._get_next_unit_id())
                                     new_unit.activated_this_turn = True # Cannot act turn it's played
-                                    unit_id = self._get_next_unit_id()
                                     if self.board.place_object(new_unit, place_pos):
-                                         current_actor.add_unit(new_unit, unit_id)
+                                         current_actor.add_unit(new_unit, new_unit.unit_id)
                                          print(f"Played {card_info['name']} at {place_pos}.")
                                          # Reset pass status
                                          player_passed = False
@@ -935,10 +1451,10 @@ class Game:
                         continue # Don't switch player yet, let them choose again
 
                     card_code = data
-                    card_info = card_data.get_card_data(card_code)
+                    card_info = card_data.CARDS[card_code]
                     current_actor.discard_from_hand(card_code)
-                    current_actor.gain_food(card_data.SUIT_RESOURCE_VALUE) # Simplified: +1 generic food
-                    print(f"Played {card_info['name']} for +{card_data.SUIT_RESOURCE_VALUE} Food.")
+                    current_actor.gain_food(card_info.food)
+                    print(f"Played {card_info.name} for +{card_info.food} Food.")
                     # Reset pass status
                     player_passed = False
                     opponent_passed = False
@@ -971,6 +1487,11 @@ class Game:
 
         # 1. Start Phase
         print("\n-- Start Phase --")
+        # Effects lasting "until the start of your next turn" end
+        for unit in self.board.get_units_for_player(self.current_player_id):
+            unit.expire_modifiers()
+        self.abilities_used.clear()
+        self.lift_mists()
         # Base Income
         player.gain_food(card_data.BASE_FOOD_INCOME)
         # Gatherer Income (Spades)
@@ -978,20 +1499,16 @@ class Game:
         spade_food = 0
         for unit in spade_units:
              # Check for specific passive abilities like "Generates Food" or "Hardy Worker"
-             if any(ab['name'] == "Generates Food" for ab in unit.base_data.get('abilities',[])):
+             if unit.base_data.has_ability("Generates Food"):
                  spade_food += 1
-             if any(ab['name'] == "Hardy Worker" for ab in unit.base_data.get('abilities',[])):
+             if unit.base_data.has_ability("Hardy Worker"):
                  spade_food += 1 # Hardy worker might grant extra on top of base spade gen? Rule unclear, assume yes.
         if spade_food > 0:
              player.gain_food(spade_food)
 
         # Champion Passives (Resourceful Leader)
-        champion = None
-        for unit in self.board.get_units_for_player(self.current_player_id):
-            if unit.base_data['type'] == 'Champion':
-                champion = unit
-                break
-        if champion and any(ab['name'] == "Resourceful Leader" for ab in champion.base_data.get('abilities',[])):
+        champion = player.champion
+        if champion and champion.base_data.has_ability("Resourceful Leader"):
              print(f"({champion.base_data['name']} passive)")
              player.gain_food(1)
 
@@ -1007,18 +1524,22 @@ class Game:
 
         # 3. End Phase
         print("\n-- End Phase --")
+        # Center control
+        held = self.board.center_control(self.current_player_id)
+        if held:
+            player.gain_vp(held * card_data.VP_PER_CENTER_SQUARE, f"holding {held} center square(s)")
         # Discard down to max hand size
         while len(player.hand) > card_data.MAX_HAND_SIZE:
             self.display_game_state() # Show hand before discard prompt
             print(f"Hand size ({len(player.hand)}) exceeds maximum ({card_data.MAX_HAND_SIZE}). Choose card to discard:")
             for i, card_code in enumerate(player.hand):
-                print(f"  {i}: {card_data.get_card_data(card_code)['name']} ({card_code})")
+                print(f"  {i}: {card_data.CARDS[card_code].name} ({card_code})")
             try:
                 choice = int(input("Enter card number to discard: "))
                 if 0 <= choice < len(player.hand):
                     card_to_discard = player.hand[choice]
                     player.discard_from_hand(card_to_discard)
-                    print(f"Discarded {card_data.get_card_data(card_to_discard)['name']}.")
+                    print(f"Discarded {card_data.CARDS[card_to_discard].name}.")
                 else:
                     print("Invalid choice.")
             except ValueError:
@@ -1028,8 +1549,8 @@ class Game:
         input("Press Enter to continue...")
 
 
-    def run_game(self):
-        self.setup_game()
+    def run_game(self, layout=None):
+        self.setup_game(layout)
 
         while not self.game_over:
             self.run_turn() # Player 1's turn
@@ -0,0 +1,131 @@
+"""Terrain and Food Cache layouts for the start of a game.
+
+A layout is a tuple of (position, code) placements ('2' Low Cover, '3' Heavy
+Cover, '4' Food Cache). Placement rules:
+
+- Nothing goes on either player's start row (the top and bottom rows).
+- Heavy Cover is never next to (8 neighbours) other cover, Low or Heavy.
+
+Pieces are drawn straight from pools of the squares that are still legal, so
+every draw succeeds. A layout that can't satisfy the rules raises ValueError
+instead of quietly coming up short. Pass a seed or a random.Random for
+reproducible maps. Libraries of pre-generated maps can be saved to and loaded
+from JSON.
+
+Run from src/: python -m BirdsOfPray.map_generator [count] [seed] [path]
+"""
+import json
+import random
+import sys
+
+import BirdsOfPray.card_data as card_data
+
+# Pieces placed at setup: half of each terrain/resource rank's 4 cards
+PIECE_COUNTS = {'2': 2, '3': 2, '4': 2}
+
+
+class _CellPool:
+    """Flat cell indexes with O(1) random draw and removal (swap with the last)."""
+    __slots__ = ('cells', 'index')
+
+    def __init__(self, cells, index):
+        self.cells = cells
+        self.index = index
+
+    def copy(self):
+        return _CellPool(self.cells[:], self.index.copy())
+
+    def __len__(self):
+        return len(self.cells)
+
+    def discard(self, cell):
+        i = self.index.pop(cell, None)
+        if i is None:
+            return
+        last = self.cells.pop()
+        if i < len(self.cells):
+            self.cells[i] = last
+            self.index[last] = i
+
+    def draw(self, rng):
+        cell = self.cells[rng.randrange(len(self.cells))]
+        self.discard(cell)
+        return cell
+
+
+_BOARDS = {} # (width, height) -> (pool of placeable cells, cover footprint per cell)
+
+
+def _board_tables(width, height):
+    """Every square but the start rows, and each square's 3x3 block (itself and
+    its neighbours), built once per board size."""
+    tables = _BOARDS.get((width, height))
+    if tables is None:
+        cells = list(range(width, width * (height - 1)))
+        footprints = []
+        for cell in range(width * height):
+            x, y = cell % width, cell // width
+            footprints.append(tuple(ny * width + nx
+                                    for ny in range(max(0, y - 1), min(height, y + 2))
+                                    for nx in range(max(0, x - 1), min(width, x + 2))))
+        tables = _BOARDS[(width, height)] = (_CellPool(cells, {cell: i for i, cell in enumerate(cells)}),
+                                             footprints)
+    return tables
+
+
+def generate_map(rng=None, size=card_data.GRID_SIZE, counts=None):
+    """One random layout. `rng` is a seed, a random.Random, or None for the
+    `random` module (so it follows random.seed)."""
+    if rng is None:
+        rng = random
+    elif not isinstance(rng, random.Random):
+        rng = random.Random(rng)
+    counts = PIECE_COUNTS if counts is None else counts
+    width, height = size
+    inner, footprints = _board_tables(width, height)
+    free = inner.copy() # Every row but the two start rows
+    heavy_ok = inner.copy() # Free and not next to any cover
+
+    placements = []
+    for code, pool in (('2', free), ('3', heavy_ok), ('4', free)):
+        for _ in range(counts.get(code, 0)):
+            if not len(pool):
+                raise ValueError(f"No legal square left for '{code}' on a {width}x{height} board "
+                                 f"with counts {counts}")
+            cell = pool.draw(rng)
+            free.discard(cell)
+            for blocked in (footprints[cell] if code != '4' else (cell,)):
+                heavy_ok.discard(blocked)
+            placements.append(((cell % width, cell // width), code))
+    return tuple(placements)
+
+
+def generate_library(count, seed=0, size=card_data.GRID_SIZE, counts=None):
+    """`count` layouts from one seed: the same seed always gives the same library."""
+    rng = random.Random(seed)
+    return [generate_map(rng, size, counts) for _ in range(count)]
+
+
+def apply_map(board, layout):
+    """Place a layout's pieces on a board."""
+    for pos, code in layout:
+        if not board.place_object(code, pos):
+            raise ValueError(f"Cannot place '{code}' at {pos}")
+
+
+def save_library(path, layouts):
+    with open(path, 'w') as f:
+        json.dump([[[x, y, code] for (x, y), code in layout] for layout in layouts], f)
+
+
+def load_library(path):
+    with open(path) as f:
+        return [tuple(((x, y), code) for x, y, code in layout) for layout in json.load(f)]
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    path = sys.argv[3] if len(sys.argv) > 3 else "maps.json"
+    save_library(path, generate_library(count, seed))
+    print(f"Saved {count} maps (seed {seed}) to {path}")
@@ -7,7 +7,7 @@ game_rules_markdown = """
 
 ## 2. Objective
 
-The primary objective is to defeat the opponent's **Champion** unit. Alternatively, if after 8 full rounds neither Champion is defeated, the player with the most Victory Points (earned through controlling objectives, defeating units, etc. - *specific scoring TBD*) wins.
+The primary objective is to defeat the opponent's **Champion** unit. Alternatively, if after 8 full rounds neither Champion is defeated, the player with the most Victory Points (earned by defeating enemy units, holding the center of the board and saving Food - see section 12) wins.
 
 ## 3. Components
 
@@ -104,5 +104,8 @@ Units (especially Face Cards and Champions) have unique abilities:
 ## 12. End of Game & Winning
 
 *   The game ends immediately if a player's **Champion** is defeated. The opposing player wins.
-*   If 8 full rounds are completed and neither Champion is defeated, the player with the most Victory Points wins. (Victory Point system needs further definition - e.g., points for defeated enemy units, controlling center squares, remaining Food, etc.).
+*   If 8 full rounds are completed and neither Champion is defeated, the player with the most Victory Points wins; equal VP is a draw. Victory Points are scored as follows:
+    *   **2 VP** for each enemy unit defeated in combat (sacrifices don't count).
+    *   **1 VP** for each of the 9 center squares (the middle 3x3) your units occupy at the end of your turn.
+    *   **1 VP** for every 3 unspent Food at the end of the game.
 """
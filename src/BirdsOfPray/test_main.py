@@ -1,7 +1,8 @@
 import pytest
 import random
-from main import Game, Player, Unit, Board  # Import classes from your main file
+from main import ABILITIES, Game, Player, Unit, Board, Modifier, ThreatMap, get_points_on_line, hit_chance  # Import classes from your main file
 import BirdsOfPray.card_data as card_data  # Import constants and card data
+import BirdsOfPray.map_generator as map_generator
 
 # --- Fixtures ---
 
@@ -164,4 +165,317 @@ def test_initial_unit_ids(game_instance):
     assert len(p2_units) == 1
     assert p1_units[0].startswith('u') # Check prefix convention
     assert p2_units[0].startswith('u')
-    assert p1_units[0] != p2_units[0] # Ensure they are different
\ No newline at end of file
+    assert p1_units[0] != p2_units[0] # Ensure they are different
+
+def test_board_layers():
+    """Units stand on Low Cover and caches but not Heavy Cover; queries see every layer."""
+    board = Board()
+    champion = Unit('AC', 1, (4, 8))
+    assert board.place_object(champion, (4, 8))
+    assert board.place_object('2', (1, 1))
+    assert board.place_object('3', (3, 3))
+    assert board.place_object('4', (2, 2))
+    assert not board.place_object('2', (4, 8)) # Occupied by a unit
+
+    assert board.get_units_for_player(1) == [champion]
+    assert board.positions_of('4') == [(2, 2)]
+    assert dict(board.grid.items()) == {(1, 1): '2', (3, 3): '3', (2, 2): '4', (4, 8): champion}
+    assert len(board.empty_positions()) == board.width * board.height - 4
+
+    assert not board.move_unit(champion, (3, 3)) # Heavy Cover
+    assert board.move_unit(champion, (1, 1))
+    assert board.get_at_pos((1, 1)) is champion
+    assert board.get_cover_bonus((1, 1)) == card_data.TERRAIN_EFFECTS['2']['defense_bonus']
+    assert board.move_unit(champion, (2, 2))
+    assert board.remove_cache((2, 2))
+    assert board.terrain_at((2, 2)) is None
+    assert board.terrain_at((1, 1)) == '2' # Left behind when the unit moved on
+
+
+def test_line_of_sight_table():
+    """Precomputed LoS agrees with walking the line, and tracks Heavy Cover changes."""
+    board = Board()
+    rng = random.Random(3)
+    cover = rng.sample([(x, y) for x in range(board.width) for y in range(board.height)], 12)
+    for pos in cover:
+        board.place_object('3', pos)
+    squares = [(x, y) for x in range(board.width) for y in range(board.height)]
+    for _ in range(500):
+        pos1, pos2 = rng.choice(squares), rng.choice(squares)
+        between = get_points_on_line(pos1, pos2) - {pos1, pos2}
+        assert board.has_line_of_sight(pos1, pos2) == all(board.get_at_pos(p) != '3' for p in between)
+
+    board = Board()
+    board.place_object('3', (4, 4))
+    assert not board.has_line_of_sight((4, 2), (4, 6))
+    archer, target = Unit('AD', 1, (4, 2)), Unit('AC', 2, (4, 6))
+    board.place_object(archer, (4, 2))
+    board.place_object(target, (4, 6))
+    assert board.visible_targets((4, 2), 2) == []
+    assert not board.visible_cells((4, 2)) >> board.cell((4, 6)) & 1
+    board.remove_object((4, 4))
+    assert board.visible_targets((4, 2), 2) == [target]
+    assert board.visible_targets((4, 2), 2, max_range=3) == []
+
+
+def test_unit_registry():
+    """Units are found by id, owner and square, and stay registered through moves."""
+    board = Board()
+    champion = Unit('AC', 1, (4, 8), 'u1')
+    squire = Unit('JC', 1, (4, 7)) # Id assigned by the board
+    enemy = Unit('AH', 2, (4, 0), 'u7')
+    for unit in (champion, squire, enemy):
+        assert board.place_object(unit, unit.position)
+    assert squire.unit_id not in ('u1', 'u7', None)
+    assert not board.place_object(champion, (0, 0)) # Already placed
+
+    assert board.get_unit_by_id('u1') is champion
+    assert board.get_units_for_player(1) == [champion, squire]
+    assert board.get_units_for_player(2) == [enemy]
+    assert board.move_unit(squire, (3, 6))
+    assert board.unit_positions[squire.unit_id] == (3, 6)
+    assert board.unit_id_at((3, 6)) == squire.unit_id
+    assert board.get_at_pos((4, 7)) is None
+
+    assert board.remove_object((3, 6)) is squire
+    assert board.get_unit_by_id(squire.unit_id) is None
+    assert board.get_units_for_player(1) == [champion]
+    assert squire.unit_id not in board.unit_positions
+
+
+def test_reachable_squares():
+    """Movement goes around blockers, Flying goes over them, and results are cached."""
+    board = Board()
+    walker = Unit('JC', 1, (4, 6)) # Movement 3
+    board.place_object(walker, (4, 6))
+    for x in range(3, 6):
+        board.place_object('3', (x, 5)) # Wall in front
+    reachable = board.reachable_squares(walker)
+    assert (4, 4) not in reachable # Straight through the wall
+    assert reachable[(2, 5)] == 3 # Around it
+    assert all(steps <= 3 for steps in reachable.values())
+    assert board.reachable_squares(walker) is reachable
+
+    blocker = Unit('JH', 2, (2, 6))
+    board.place_object(blocker, (2, 6))
+    reachable = board.reachable_squares(walker)
+    assert (2, 6) not in reachable and (2, 5) not in reachable
+
+    flyer = Unit('KC', 1, (4, 7)) # Movement 4, Flying
+    board.place_object(flyer, (4, 7))
+    flight = board.reachable_squares(flyer)
+    assert flight[(4, 4)] == 3
+    assert (4, 5) not in flight and (4, 6) not in flight # Can't land on cover or units
+
+
+def test_threat_map_updates_incrementally():
+    """Threat maps kept up to date through moves, spawns, deaths and cover changes match a rebuild."""
+    board = Board()
+    rng = random.Random(5)
+    threats = board.threat_map(2)
+    units = []
+    for code, pos in (('AD', (4, 0)), ('KD', (2, 1)), ('QC', (6, 1))):
+        unit = Unit(code, 2, pos)
+        board.place_object(unit, pos)
+        units.append(unit)
+    for step in range(30):
+        unit = rng.choice(units)
+        destinations = list(board.reachable_squares(unit))
+        if destinations:
+            board.move_unit(unit, rng.choice(destinations))
+        if step == 10:
+            board.place_object('3', (4, 4))
+        if step == 20:
+            board.remove_object(units.pop().position)
+        fresh = ThreatMap(board, 2)
+        assert threats.coverage == fresh.coverage
+        assert threats.damage == fresh.damage
+
+    archer = units[0]
+    target = next(pos for pos in board.empty_positions() if threats.attackers[board.cell(pos)] == {archer.unit_id})
+    attack, damage = archer.get_stat('attack'), archer.get_stat(archer.base_data.damage_stat)
+    assert threats.expected_damage(target, 10) == hit_chance(attack, 10 + board.get_cover_bonus(target)) * damage
+    assert hit_chance(0, 1) == 1 and hit_chance(0, 7) == 0
+
+
+def test_unit_templates_and_modifiers():
+    """Units share one immutable template; auras and modifiers layer on top and invalidate cached stats."""
+    board = Board()
+    commander = Unit('AC', 1, (0, 0))
+    knight = Unit('QC', 1, (0, 1))
+    other = Unit('QC', 2, (6, 6))
+    assert knight.base_data is other.base_data is card_data.get_template('QC')
+    with pytest.raises(AttributeError):
+        knight.base_data.attack = 99
+
+    base_attack = knight.base_data['attack']
+    board.place_object(knight, (0, 1))
+    board.place_object(commander, (0, 0))
+    assert knight.get_stat('attack') == base_attack + 1 # Commander's Presence
+    board.move_unit(knight, (4, 4))
+    assert knight.get_stat('attack') == base_attack
+
+    base_defense = knight.base_data['defense']
+    knight.add_modifier(Modifier('defense', 2, "Sanctuary", until_next_turn=True))
+    knight.add_modifier(Modifier('attack', 1, "Blessing"))
+    assert knight.get_stat('defense') == base_defense + 2
+    copy = knight.clone()
+    knight.expire_modifiers()
+    assert knight.get_stat('defense') == base_defense
+    assert knight.get_stat('attack') == base_attack + 1
+    assert copy.get_stat('defense') == base_defense + 2
+    assert copy.unit_id == knight.unit_id and copy.board is None
+
+
+def test_compiled_card_database():
+    """Every deck card has a frozen record; indexes, parsed AP costs and stat validation."""
+    for suit in card_data.SUITS:
+        for rank in 'A56789TJQK':
+            assert rank + suit in card_data.CARDS
+    assert set(card_data.BY_TYPE['Resource']) == {c for c in card_data.CARDS if c[0] in '56789T'}
+    assert card_data.BY_TYPE['Champion'] == ('AC', 'AH', 'AD', 'AS')
+    assert set(card_data.BY_ABILITY['Generates Food']) == {'QS', 'JS'}
+    assert set(card_data.BY_SUIT['Hearts']) >= {'AH', 'KH', '7H'}
+
+    oracle = card_data.CARDS['AD']
+    assert [(ab.name, ab.ap_cost) for ab in oracle.active_abilities] == [("Arcane Bolt", 1), ("Focused Blast", 2)]
+    assert oracle.damage_stat == 'attack' and oracle.has_ability("Precognitive Dodge")
+    assert card_data.get_card_data('5C').food == card_data.SUIT_RESOURCE_VALUE
+    assert card_data.get_template('5C') is None
+
+    with pytest.raises(ValueError, match="missing stats: hp"):
+        card_data._compile_card('XX', {'name': "Broken", 'suit': 'Clubs', 'rank': 'Jack', 'type': 'Unit',
+                                       'cost': 1, 'attack': 1, 'defense': 1, 'movement': 1, 'range': 1})
+    with pytest.raises(ValueError):
+        card_data.parse_ap_cost('Free')
+
+
+def test_ability_registry(monkeypatch):
+    """Abilities dispatch through ABILITIES with compiled costs; targets come from the board."""
+    assert ABILITIES["Focused Blast"].cost == 2 and ABILITIES["Focused Blast"].range == 5
+    assert ABILITIES["Obscuring Mist"].cost == 2 and ABILITIES["Sanctuary"].effect is not None
+
+    game = Game()
+    game.players = {1: Player(1, 'AD'), 2: Player(2, 'AH')}
+    shadowcaster = Unit('QD', 1, (4, 4))
+    necromancer = Unit('KD', 1, (0, 8))
+    enemy = Unit('JC', 2, (4, 1))
+    for unit in (shadowcaster, necromancer, enemy):
+        game.board.place_object(unit, unit.position)
+    answers = []
+    monkeypatch.setattr('builtins.input', lambda _: answers.pop(0))
+
+    # Obscuring Mist: heavy cover on a chosen empty square, lifted after the next round
+    mist_squares = ABILITIES["Obscuring Mist"].targets(game, shadowcaster, ABILITIES["Obscuring Mist"])
+    assert not game.execute_ability(shadowcaster, "Obscuring Mist") # No AP yet
+    shadowcaster.ap = 2
+    answers.append(str(mist_squares.index((4, 2))))
+    assert game.execute_ability(shadowcaster, "Obscuring Mist")
+    assert shadowcaster.ap == 0
+    assert game.board.terrain_at((4, 2)) == '3'
+    assert not game.board.has_line_of_sight((4, 4), (4, 1))
+    game.current_round += 1
+    game.lift_mists()
+    assert game.board.terrain_at((4, 2)) == '3'
+    game.current_round += 1
+    game.lift_mists()
+    assert game.board.terrain_at((4, 2)) is None
+
+    # Raise Dead: a cheap unit card from the discard comes back adjacent with 1 HP
+    game.players[1].discard.extend(['KC', 'JS'])
+    answers.extend(['0', '0'])
+    necromancer.ap = 2
+    assert game.execute_ability(necromancer, "Raise Dead")
+    raised = [unit for unit in game.board.get_units_for_player(1) if unit.card_code == 'JS']
+    assert len(raised) == 1 and raised[0].current_hp == 1
+    assert game.players[1].discard == ['KC']
+
+    # Devastating Charge: +2 Attack after moving 3 squares this activation
+    rolls = []
+    monkeypatch.setattr(random, 'randint', lambda a, b: 1)
+    monkeypatch.setattr('builtins.print', lambda *args: rolls.append(" ".join(map(str, args))))
+    knight = Unit('KC', 2, (4, 5))
+    game.board.place_object(knight, knight.position)
+    knight.squares_moved = 3
+    game.resolve_combat(knight, shadowcaster)
+    assert "Attacker rolls 1 + 7 (Attack) = 8" in rolls
+
+    # Ability range is checked by combat: Focused Blast reaches 5 squares, past the Oracle's Range of 4
+    oracle = Unit('AD', 1, (8, 8))
+    target = Unit('JC', 2, (8, 3))
+    for unit in (oracle, target):
+        game.board.place_object(unit, unit.position)
+    oracle.ap = 2
+    monkeypatch.setattr(random, 'randint', lambda a, b: 6) # 6 + 3 Attack hits Defense 9
+    answers.append('0')
+    assert game.execute_ability(oracle, "Focused Blast")
+    assert oracle.ap == 0 and target.current_hp < target.base_data.hp
+    assert "Attack failed" not in " ".join(rolls)
+
+    # Passives and unknown names don't dispatch
+    assert not game.execute_ability(shadowcaster, "Fierce Strike")
+    assert not game.execute_ability(knight, "Flying")
+
+
+def test_champion_handles_and_victory_points(game_instance, monkeypatch):
+    """Champions are tracked by handle; VP accrue on defeats and center control and decide the round limit."""
+    p1, p2 = game_instance.players[1], game_instance.players[2]
+    assert p1.champion is game_instance.board.get_at_pos((4, 8))
+    assert p2.champion is game_instance.board.get_at_pos((4, 0))
+    assert not game_instance.check_win_condition()
+
+    board = game_instance.board
+    for pos in [(4, 4), (4, 5)]:
+        if board.get_at_pos(pos) is not None:
+            board.remove_object(pos)
+    raider = Unit('JC', 1, (4, 4), game_instance._get_next_unit_id())
+    board.place_object(raider, (4, 4))
+    p1.add_unit(raider, raider.unit_id)
+    victim = Unit('JS', 2, (4, 5), game_instance._get_next_unit_id())
+    board.place_object(victim, (4, 5))
+    p2.add_unit(victim, victim.unit_id)
+    assert board.center_control(1) == 1 and board.center_control(2) == 1
+
+    monkeypatch.setattr(random, 'randint', lambda a, b: 6)
+    victim.current_hp = 1
+    game_instance.resolve_combat(raider, victim)
+    assert p1.vp == card_data.VP_PER_UNIT_DEFEATED and p2.vp == 0
+
+    p1.food = p2.food = 0
+    game_instance.current_round = card_data.MAX_ROUNDS + 1
+    assert game_instance.check_win_condition()
+    assert game_instance.winner == 1
+
+    game_instance.game_over = False
+    board.remove_object(p2.champion.position)
+    p2.remove_unit(p2.champion.unit_id)
+    assert p2.champion is None
+    assert game_instance.check_win_condition() and game_instance.winner == 1
+
+
+def test_map_generator(tmp_path):
+    """Generated layouts are seeded, complete, and respect the start-row and heavy-cover rules."""
+    width, height = card_data.GRID_SIZE
+    assert map_generator.generate_map(7) == map_generator.generate_map(7)
+    for layout in map_generator.generate_library(300, seed=1):
+        codes = [code for _, code in layout]
+        assert {code: codes.count(code) for code in codes} == map_generator.PIECE_COUNTS
+        cover = {pos for pos, code in layout if code in ('2', '3')}
+        assert len({pos for pos, _ in layout}) == len(layout)
+        for (x, y), code in layout:
+            assert 0 < y < height - 1 and 0 <= x < width
+            if code == '3':
+                assert not any((x + dx, y + dy) in cover for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy)
+
+    with pytest.raises(ValueError):
+        map_generator.generate_map(0, size=(3, 3), counts={'3': 2})
+
+    library = map_generator.generate_library(5, seed=2)
+    path = tmp_path / "maps.json"
+    map_generator.save_library(path, library)
+    assert map_generator.load_library(path) == library
+
+    game = Game()
+    board = game.board
+    map_generator.apply_map(board, library[0])
+    assert sorted(board.positions_of('4')) == sorted(pos for pos, code in library[0] if code == '4')
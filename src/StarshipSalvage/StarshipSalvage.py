@@ -1,3 +1,4 @@
+import random
 from typing import Optional
 from game_logger import GameLogger
 from ai_agent import AIAgent
@@ -320,7 +321,7 @@ def main():
     if p2_name == "AI":
         try:
             ai_agent = AIAgent()
-            print("AI agent initialized successfully.")
+            print(f"AI agent initialized successfully ({ai_agent.backend_name} backend).")
         except Exception as e:
             print(f"Failed to initialize AI agent: {e}")
             print("Player 1 will play for both players.")
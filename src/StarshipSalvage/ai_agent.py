@@ -1,10 +1,18 @@
 import os
 import json
+import importlib
 from typing import List, Optional, Dict, Any
-import openai
 from dataclasses import dataclass
 from game_logger import GameState
 
+# LLM backends are plugins: name -> "module:attribute". They are only imported
+# when selected, so the heavy SDKs stay out of human-only games and sim workers.
+BACKENDS: Dict[str, str] = {
+    'openai': 'ai_agent:OpenAIBackend',
+    'stub': 'ai_agent:StubBackend',
+}
+DEFAULT_BACKEND_ENV = 'STARSHIP_AI_BACKEND'
+
 @dataclass
 class GameAction:
     card_index: Optional[int] = None
@@ -12,13 +20,58 @@ class GameAction:
     tech_bay_index: Optional[int] = None
     purchase: bool = False
 
-class AIAgent:
+class StubBackend:
+    """Local backend that never calls out; the agent falls back to its heuristics."""
+    def __init__(self, api_key: Optional[str] = None):
+        self.api_key = api_key
+
+    def complete(self, prompt: str) -> Optional[Dict[str, Any]]:
+        return None
+
+class OpenAIBackend:
+    """Chat-completion backend; the openai package is imported on construction."""
     def __init__(self, api_key: Optional[str] = None):
-        # Initialize OpenAI API key
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
         if not self.api_key:
             raise ValueError("OpenAI API key not found. Please set OPENAI_API_KEY environment variable.")
-        openai.api_key = self.api_key
+        self.openai = importlib.import_module('openai')
+        self.openai.api_key = self.api_key
+
+    def complete(self, prompt: str) -> Optional[Dict[str, Any]]:
+        response = self.openai.ChatCompletion.create(
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": "You are a strategic card game AI. Respond only with valid JSON."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            max_tokens=150
+        )
+        return json.loads(response.choices[0].message.content)
+
+def register_backend(name: str, target: str) -> None:
+    """Register an LLM backend plugin as "module:attribute"."""
+    BACKENDS[name] = target
+
+def default_backend_name() -> str:
+    """Backend from the environment, else OpenAI when a key is set, else the local stub."""
+    return os.getenv(DEFAULT_BACKEND_ENV) or ('openai' if os.getenv('OPENAI_API_KEY') else 'stub')
+
+def load_backend(name: str, api_key: Optional[str] = None):
+    """Import and construct the named backend."""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown AI backend '{name}'. Available: {', '.join(sorted(BACKENDS))}")
+    module_name, attr = BACKENDS[name].split(':')
+    if module_name == __name__:
+        backend_cls = globals()[attr]
+    else:
+        backend_cls = getattr(importlib.import_module(module_name), attr)
+    return backend_cls(api_key=api_key)
+
+class AIAgent:
+    def __init__(self, api_key: Optional[str] = None, backend: Optional[str] = None):
+        self.backend_name = backend or default_backend_name()
+        self.backend = load_backend(self.backend_name, api_key)
         
         # Load game rules
         with open('rules.md', 'r') as f:
@@ -100,16 +153,7 @@ Derelict Cache Size: {state.derelict_cache_size}
 
     def call_llm(self, prompt: str) -> Dict[str, Any]:
         try:
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a strategic card game AI. Respond only with valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=150
-            )
-            return json.loads(response.choices[0].message.content)
+            return self.backend.complete(prompt)
         except Exception as e:
             print(f"Error calling LLM: {e}")
             return None
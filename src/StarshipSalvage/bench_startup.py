@@ -0,0 +1,72 @@
+"""Startup-time benchmark for Starship Salvage.
+
+Measures how long a fresh interpreter takes to import the game module and how
+long a process pool takes to spawn workers that import it, and checks that no
+LLM SDK is pulled in unless a backend asks for it.
+
+Usage: python bench_startup.py [runs]
+"""
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.dirname(HERE)
+ROOT = os.path.dirname(SRC)
+# StarshipSalvage.py mixes "common.card", "src.common.player" and bare "card" imports.
+SEARCH_PATH = [HERE, SRC, ROOT, os.path.join(SRC, 'common')]
+
+IMPORT_SNIPPET = (
+    "import sys, time; t = time.perf_counter(); import StarshipSalvage; "
+    "print(time.perf_counter() - t, 'openai' in sys.modules)"
+)
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(SEARCH_PATH + [env.get('PYTHONPATH', '')])
+    return env
+
+
+def time_cold_import(runs: int = 10):
+    """Return (best import seconds, best process seconds, openai_loaded) over fresh interpreters."""
+    best_import = best_process = float('inf')
+    openai_loaded = False
+    for _ in range(runs):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, '-c', IMPORT_SNIPPET], env=_env(), cwd=HERE,
+                             capture_output=True, text=True, check=True).stdout.split()
+        best_process = min(best_process, time.perf_counter() - start)
+        best_import = min(best_import, float(out[0]))
+        openai_loaded = openai_loaded or out[1] == 'True'
+    return best_import, best_process, openai_loaded
+
+
+def _worker_init() -> None:
+    sys.path[:0] = SEARCH_PATH
+    import StarshipSalvage  # noqa: F401
+
+
+def _ping(_: int) -> bool:
+    return 'openai' in sys.modules
+
+
+def time_pool_spawn(workers: int = 4):
+    """Return (seconds until every spawned worker has imported the game, openai_loaded)."""
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_worker_init,
+                             mp_context=multiprocessing.get_context('spawn')) as pool:
+        loaded = any(pool.map(_ping, range(workers)))
+    return time.perf_counter() - start, loaded
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    import_s, process_s, openai_loaded = time_cold_import(runs)
+    print(f"Cold import of StarshipSalvage: {import_s * 1000:.1f} ms (interpreter + import: {process_s * 1000:.1f} ms)")
+    print(f"openai imported at startup: {openai_loaded}")
+    spawn_s, worker_openai = time_pool_spawn()
+    print(f"Process pool spawn (4 workers): {spawn_s * 1000:.1f} ms (openai in workers: {worker_openai})")